@@ -0,0 +1,57 @@
+"""
+Large module export: page-by-page export_records vs the Bulk Read API.
+
+    python -m benchmarks.bench_bulk_read [--records 100000] [--latency-ms 20] [--job-seconds 3]
+
+export_records walks page/per_page (200 records per call); bulk_read_records
+submits one job per 200,000 records, waits for it and streams the ZIP. The
+mock job takes `--job-seconds` to complete, standing in for Zoho's queue time.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--job-seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with MockZohoServer(latency=args.latency_ms / 1000, records_per_module=args.records,
+                        bulk_job_seconds=args.job_seconds) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        os.environ["ZOHO_BULK_POLL_INTERVAL"] = "0.5"
+        os.environ["ZOHO_EXPORT_DIR"] = tempfile.mkdtemp()
+        from zoho_mcp.client import close_client
+        from zoho_mcp.main import bulk_read_records, export_records
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        results = {}
+        for name, call in (
+            ("export_records (pages)", lambda: export_records(None, "Leads", format="csv")),
+            ("bulk_read_records", lambda: bulk_read_records(None, "Leads", format="csv")),
+        ):
+            before = server.stats["requests"]
+            started = time.perf_counter()
+            result = await call()
+            results[name] = (time.perf_counter() - started, server.stats["requests"] - before, result)
+        await close_client()
+
+    print(f"export of {args.records} Leads, upstream latency {args.latency_ms:.0f} ms, bulk job time {args.job_seconds:.1f} s")
+    print(f"{'':>24} {'seconds':>8} {'API calls':>10} {'rows':>8}")
+    for name, (elapsed, calls, result) in results.items():
+        rows = result.get("row_count")
+        print(f"{name:>24} {elapsed:8.1f} {calls:10} {rows!s:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
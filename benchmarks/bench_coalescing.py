@@ -0,0 +1,92 @@
+"""
+Concurrent identical reads with and without request coalescing.
+
+    python -m benchmarks.bench_coalescing [--callers 20] [--rounds 10] [--latency-ms 100]
+
+Each round, `--callers` tool calls with the same arguments start at once, as
+when several agents ask for the same layout, search or record. Caches are
+cleared between rounds so every round starts cold. Reports the upstream
+requests per round, p50 / p99 call latency and the requests saved, first with
+ZOHO_COALESCE_REQUESTS=0, then with coalescing on.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def scenarios():
+    from zoho_mcp.main import get_module_fields, get_record_by_id, search_records
+    return [
+        ("get_module_fields", lambda: get_module_fields(None, "Leads")),
+        ("search_records", lambda: search_records(None, "Contacts", search_criteria="(Email:equals:mock42@example.com)")),
+        ("get_record_by_id", lambda: get_record_by_id(None, "Deals", "4000000000042")),
+    ]
+
+
+async def run(server: MockZohoServer, callers: int, rounds: int) -> list[tuple]:
+    from zoho_mcp.cache import reset_caches
+    from zoho_mcp.client import get_client
+
+    rows = []
+    for name, call in scenarios():
+        latencies, before = [], server.stats["requests"]
+        saved_before = get_client().resilience_status()["coalescing"] or {}
+
+        async def timed():
+            started = time.perf_counter()
+            result = await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert result["status"] == "success", result
+
+        for _ in range(rounds):
+            reset_caches()
+            await asyncio.gather(*(timed() for _ in range(callers)))
+        saved = (get_client().resilience_status()["coalescing"] or {}).get("requests_saved", 0) - saved_before.get("requests_saved", 0)
+        rows.append((name, (server.stats["requests"] - before) / rounds, percentile(latencies, 50), percentile(latencies, 99), saved))
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--callers", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    results = {}
+    with MockZohoServer(latency=args.latency_ms / 1000) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        os.environ["ZOHO_MAX_CONCURRENT_REQUESTS"] = str(args.callers)
+        os.environ["ZOHO_HTTP_POOL_SIZE"] = str(args.callers)
+        from zoho_mcp.client import close_client, get_client
+        from zoho_mcp.config import reload_zoho_config
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        for name, enabled in (("no coalescing", "0"), ("coalescing", "1")):
+            await close_client()
+            os.environ["ZOHO_COALESCE_REQUESTS"] = enabled
+            reload_zoho_config()
+            await get_client().tokens.get_token()
+            results[name] = await run(server, args.callers, args.rounds)
+        await close_client()
+
+    print(f"{args.callers} identical concurrent calls x {args.rounds} cold rounds, upstream latency {args.latency_ms:.0f} ms")
+    print(f"{'':>14} {'tool':>18} {'API/round':>10} {'p50 ms':>8} {'p99 ms':>8} {'saved':>6}")
+    for name, rows in results.items():
+        for tool, requests, p50, p99, saved in rows:
+            print(f"{name:>14} {tool:>18} {requests:10.1f} {p50:8.1f} {p99:8.1f} {saved:6}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""
+Wall-clock time of N concurrent tool calls against a slow upstream.
+
+    python -m benchmarks.bench_concurrency [--calls 20] [--latency-ms 100]
+
+Calls go through FastMCP's tool manager, the same path a client request takes.
+With async handlers N in-flight calls should cost roughly one upstream latency.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    with MockZohoServer(latency=args.latency_ms / 1000) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_HTTP_POOL_SIZE"] = str(args.calls)
+        from zoho_mcp.main import mcp
+        from zoho_mcp.client import close_client
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        # Warm up: token refresh + first connection.
+        await mcp.call_tool("get_record_by_id", {"module_name": "Leads", "record_id": "1"})
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            mcp.call_tool("get_record_by_id", {"module_name": "Leads", "record_id": str(i)})
+            for i in range(args.calls)
+        ))
+        elapsed = time.perf_counter() - started
+        await close_client()
+
+    serial = args.calls * args.latency_ms / 1000
+    print(f"{args.calls} concurrent get_record_by_id calls, upstream latency {args.latency_ms:.0f} ms")
+    print(f"wall clock {elapsed * 1000:.1f} ms (serial would be >= {serial * 1000:.0f} ms, {serial / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
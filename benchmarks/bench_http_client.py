@@ -0,0 +1,79 @@
+"""
+Per-call latency of a fresh client per request vs the pooled ZohoClient.
+
+    python -m benchmarks.bench_http_client [--calls 200] [--handshake-ms 20]
+
+The mock server sleeps `--handshake-ms` once per new TCP connection, which
+stands in for the TCP + TLS setup to zohoapis.eu that the pool avoids.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.mock_zoho import MockZohoServer
+from zoho_mcp.client import ZohoClient
+from zoho_mcp.config import ZohoConfig, update_access_token
+
+
+async def timed(fn, calls: int) -> list[float]:
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        response = await fn()
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+    return samples
+
+
+def report(name: str, samples: list[float]):
+    ms = sorted(s * 1000 for s in samples)
+    print(f"{name:<22} mean {statistics.mean(ms):7.2f} ms   p50 {ms[len(ms) // 2]:7.2f} ms   "
+          f"p99 {ms[int(len(ms) * 0.99) - 1]:7.2f} ms")
+
+
+async def fresh_get(url: str, headers: dict, params: dict) -> httpx.Response:
+    async with httpx.AsyncClient() as http:
+        return await http.get(url, headers=headers, params=params)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with MockZohoServer(handshake_delay=args.handshake_ms / 1000) as server:
+        config = ZohoConfig(
+            base_url=server.base_url,
+            refresh_token="mock",
+            client_id="mock",
+            client_secret="mock",
+            modules=["Leads"],
+            accounts_url=server.root_url,
+        )
+        update_access_token("mock-token")
+        headers = {"Authorization": "Zoho-oauthtoken mock-token", "Content-Type": "application/json"}
+
+        url = f"{server.base_url}/Leads"
+        before = server.stats["connections"]
+        fresh = await timed(lambda: fresh_get(url, headers, {"per_page": 10}), args.calls)
+        fresh_conns = server.stats["connections"] - before
+
+        client = ZohoClient(config)
+        before = server.stats["connections"]
+        pooled = await timed(lambda: client.get("/Leads", params={"per_page": 10}), args.calls)
+        pooled_conns = server.stats["connections"] - before
+        await client.aclose()
+
+    print(f"{args.calls} calls, emulated handshake {args.handshake_ms:.0f} ms")
+    report(f"fresh client ({fresh_conns} conns)", fresh)
+    report(f"ZohoClient ({pooled_conns} conns)", pooled)
+    saved = statistics.mean(fresh) - statistics.mean(pooled)
+    print(f"saved per call: {saved * 1000:.2f} ms ({saved / statistics.mean(fresh):.0%})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+search_records latency: local mirror index vs the remote /search endpoint.
+
+    python -m benchmarks.bench_local_search [--records 5000] [--lookups 200] [--latency-ms 150]
+
+Syncs the mock's Leads into a temporary mirror, then looks up random emails
+with source="remote" and source="local" and reports p50 / p99 per mode, plus
+a phone prefix query and a full-text word search that only run locally.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def timed(lookups: int, call) -> tuple[list[float], int]:
+    latencies, misses = [], 0
+    for i in range(lookups):
+        started = time.perf_counter()
+        result = await call(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        misses += result["status"] != "success" or result["count"] == 0
+    return latencies, misses
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    with MockZohoServer(latency=args.latency_ms / 1000, records_per_module=args.records, record_width=40) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        os.environ["ZOHO_MIRROR_DB"] = os.path.join(tempfile.mkdtemp(), "mirror.db")
+        from zoho_mcp.client import close_client, get_client
+        from zoho_mcp.main import search_records
+        from zoho_mcp.mirror import get_mirror
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        started = time.perf_counter()
+        print(await get_mirror().sync_module(get_client(), "Leads"))
+        print(f"initial sync of {args.records} Leads: {time.perf_counter() - started:.1f} s")
+
+        numbers = [random.randrange(args.records) for _ in range(args.lookups)]
+
+        def by_email(source: str):
+            return lambda i: search_records(None, "Leads", f"(Email:equals:mock{numbers[i]}@example.com)", source=source)
+
+        before = server.stats["requests"]
+        remote, remote_misses = await timed(args.lookups, by_email("remote"))
+        remote_calls = server.stats["requests"] - before
+        before = server.stats["requests"]
+        local, local_misses = await timed(args.lookups, by_email("local"))
+        local_calls = server.stats["requests"] - before
+        phone, _ = await timed(args.lookups, lambda i: search_records(
+            None, "Leads", f"(Phone:starts_with:+1555{numbers[i]:07d})", source="local"))
+        word, _ = await timed(args.lookups, lambda i: search_records(
+            None, "Leads", word=f"Leads {numbers[i]}", source="local"))
+        await close_client()
+
+    print(f"{args.lookups} lookups over {args.records} Leads, remote latency {args.latency_ms:.0f} ms")
+    print(f"{'':>26} {'p50 ms':>8} {'p99 ms':>8} {'API calls':>10} {'misses':>7}")
+    for name, samples, calls, misses in (
+        ("remote Email:equals", remote, remote_calls, remote_misses),
+        ("local Email:equals", local, local_calls, local_misses),
+        ("local Phone:starts_with", phone, 0, 0),
+        ("local word (FTS5)", word, 0, 0),
+    ):
+        print(f"{name:>26} {percentile(samples, 50):8.2f} {percentile(samples, 99):8.2f} {calls:10} {misses:7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Payload size and encode time of read tools with and without field projection / slim mode.
+
+    python -m benchmarks.bench_payload [--limit 200] [--width 250] [--rounds 20]
+
+Records from the mock server carry `--width` extra keys, mostly null custom
+fields and `$`-prefixed internals, like a real Leads layout. For each mode we
+report the upstream response bytes, the bytes of the tool result as the model
+receives it, and the time to JSON-encode that result.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+FIELDS = ["Last_Name", "First_Name", "Email", "Phone", "Owner"]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--width", type=int, default=250)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with MockZohoServer(record_width=args.width) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        from zoho_mcp import main as tools
+        from zoho_mcp.client import get_client, close_client
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        upstream_bytes = []
+
+        async def count_bytes(response):
+            upstream_bytes.append(int(response.headers.get("Content-Length", 0)))
+
+        get_client().http.event_hooks["response"].append(count_bytes)
+
+        modes = {
+            "full": {},
+            "slim": {"slim": True},
+            "fields": {"fields": FIELDS},
+            "fields + slim": {"fields": FIELDS, "slim": True},
+        }
+        rows = []
+        for name, options in modes.items():
+            upstream_bytes.clear()
+            result = await tools.get_module_data(None, "Leads", limit=args.limit, inline=True, **options)
+            assert result["status"] == "success", result
+            started = time.perf_counter()
+            for _ in range(args.rounds):
+                encoded = json.dumps(result)
+            encode_ms = (time.perf_counter() - started) * 1000 / args.rounds
+            rows.append((name, upstream_bytes[-1], len(encoded), encode_ms))
+        await close_client()
+
+    base_up, base_out, base_ms = rows[0][1:]
+    print(f"get_module_data Leads, {args.limit} records, {args.width} extra keys per record")
+    print(f"{'mode':<15}{'upstream B':>12}{'result B':>12}{'encode ms':>11}{'saved B':>10}{'saved ms':>10}")
+    for name, up, out, ms in rows:
+        print(f"{name:<15}{up:>12,}{out:>12,}{ms:>11.2f}{1 - out / base_out:>10.0%}{base_ms - ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Large reads returned inline vs as a server-side result handle.
+
+    python -m benchmarks.bench_result_store [--records 200] [--width 250] [--slices 4] [--latency-ms 150]
+
+An agent reads a page of `--records` wide Leads, then looks at `--slices`
+parts of it again. Inline: the whole page goes into the tool result and each
+revisit is another get_module_data call to Zoho. Handle: the tool returns a
+summary and a result_handle, and revisits are get_result_slice reads from the
+store, first from memory, then after the result was spilled to disk. Reports
+bytes handed to the model, Zoho calls and wall time per scenario.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+def size(result: dict) -> int:
+    return len(json.dumps(result, ensure_ascii=False).encode())
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200)
+    parser.add_argument("--width", type=int, default=250)
+    parser.add_argument("--slices", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+    step = max(1, args.records // args.slices)
+
+    rows = []
+    with MockZohoServer(latency=args.latency_ms / 1000, record_width=args.width) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        os.environ["ZOHO_RESULT_SPILL_DIR"] = tempfile.mkdtemp()
+        # 0 MB: every result but the newest is spilled, so the third scenario reads from disk.
+        os.environ["ZOHO_RESULT_MEMORY_MB"] = "0"
+        from zoho_mcp.client import close_client, get_client
+        from zoho_mcp.main import get_module_data, get_result_slice
+        from zoho_mcp.result_store import get_result_store
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        await get_client().tokens.get_token()
+
+        async def scenario(name: str, first, revisit):
+            before = server.stats["requests"]
+            started = time.perf_counter()
+            result = await first()
+            first_bytes, revisit_bytes = size(result), 0
+            for i in range(args.slices):
+                revisit_bytes += size(await revisit(result, i))
+            rows.append((name, first_bytes, revisit_bytes, server.stats["requests"] - before, time.perf_counter() - started))
+
+        await scenario(
+            "inline",
+            lambda: get_module_data(None, "Leads", limit=args.records, inline=True),
+            lambda result, i: get_module_data(None, "Leads", limit=step, offset=i * step, inline=True),
+        )
+        await scenario(
+            "handle, memory",
+            lambda: get_module_data(None, "Leads", limit=args.records, inline=False),
+            lambda result, i: get_result_slice(None, result["result_handle"], offset=i * step, limit=step),
+        )
+
+        async def spilled_first():
+            result = await get_module_data(None, "Leads", limit=args.records, inline=False)
+            # A newer result pushes this one out of memory.
+            await get_module_data(None, "Contacts", limit=args.records, inline=False)
+            return result
+
+        await scenario(
+            "handle, disk",
+            spilled_first,
+            lambda result, i: get_result_slice(None, result["result_handle"], offset=i * step, limit=step),
+        )
+        stats = get_result_store().stats_dict()
+        get_result_store().clear()
+        await close_client()
+
+    print(f"{args.records} records x {args.width} extra keys, {args.slices} revisits of {step}, upstream latency {args.latency_ms:.0f} ms")
+    print(f"{'':>15} {'first KiB':>10} {'revisit KiB':>12} {'API calls':>10} {'time s':>8}")
+    for name, first_bytes, revisit_bytes, calls, elapsed in rows:
+        print(f"{name:>15} {first_bytes / 1024:10.1f} {revisit_bytes / 1024:12.1f} {calls:10} {elapsed:8.2f}")
+    print(f"store: {stats['spilled']} spilled, {stats['served']} slices served")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
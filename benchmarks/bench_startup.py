@@ -0,0 +1,126 @@
+"""
+Server startup time and fixed per-call overhead.
+
+    python -m benchmarks.bench_startup [--runs 7] [--calls 2000] [--width 250]
+
+Startup: median over `--runs` fresh interpreters of the time to import
+zoho_mcp.main (plus the mcp SDK alone, and zoho_mcp with its dependencies
+already imported, for reference) and of the time from spawning
+`python -m zoho_mcp.main` to its answer to an MCP initialize request on
+stdio. Per call: config lookup, a tool with no Zoho call (direct and through
+an in-process MCP session), a get_record_by_id round trip to the mock server
+with zero latency, and JSON encode / decode of a 200-record page with the
+standard library vs zoho_mcp.jsonlib (orjson when installed).
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.mock_zoho import MockZohoServer, make_record
+
+IMPORT_SNIPPET = "{preload}import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {"protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "bench", "version": "0"}},
+}
+
+
+def import_seconds(module: str, runs: int, preload: str = "") -> float:
+    """Median import time of `module` in fresh interpreters, after importing `preload` untimed"""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET.format(module=module, preload=f"import {preload}; " if preload else "")],
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output))
+    return statistics.median(samples)
+
+
+def initialize_seconds(runs: int) -> float:
+    """Spawn to first initialize response of the stdio server"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-m", "zoho_mcp.main"], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        process.stdin.write(json.dumps(INITIALIZE) + "\n")
+        process.stdin.flush()
+        process.stdout.readline()
+        samples.append(time.perf_counter() - started)
+        process.kill()
+        process.wait()
+    return statistics.median(samples)
+
+
+def per_call_us(call, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def per_call_async_us(call, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=250)
+    args = parser.parse_args()
+
+    rows = [
+        ("import mcp SDK", import_seconds("mcp.server.fastmcp", args.runs) * 1000, "ms"),
+        ("import zoho_mcp.main", import_seconds("zoho_mcp.main", args.runs) * 1000, "ms"),
+        ("  of which zoho_mcp itself", import_seconds("zoho_mcp.main", args.runs, "mcp.server.fastmcp, httpx, dotenv") * 1000, "ms"),
+        ("spawn -> initialize reply", initialize_seconds(args.runs) * 1000, "ms"),
+    ]
+
+    with MockZohoServer(latency=0.0, records_per_module=1000) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from zoho_mcp import jsonlib
+        from zoho_mcp.client import close_client, get_client
+        from zoho_mcp.config import get_zoho_config, load_zoho_config
+        from zoho_mcp.main import get_cache_stats, get_record_by_id, mcp
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        logging.getLogger("mcp").setLevel(logging.WARNING)
+
+        rows.append(("config: load from env", per_call_us(load_zoho_config, args.calls), "us"))
+        rows.append(("config: cached", per_call_us(get_zoho_config, args.calls), "us"))
+        rows.append(("tool, direct", await per_call_async_us(lambda: get_cache_stats(None), args.calls), "us"))
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            rows.append(("tool, MCP session", await per_call_async_us(lambda: session.call_tool("get_cache_stats", {}), args.calls // 4), "us"))
+        await get_client().tokens.get_token()
+        rows.append(("get_record_by_id, 0 ms Zoho", await per_call_async_us(
+            lambda: get_record_by_id(None, "Leads", "4000000000001", bypass_cache=True), args.calls // 4), "us"))
+        await close_client()
+
+    page = {"data": [make_record("Leads", n, args.width) for n in range(200)], "info": {"more_records": True}}
+    encoded = json.dumps(page).encode()
+    rows.append(("encode page, json", per_call_us(lambda: json.dumps(page).encode(), 50), "us"))
+    rows.append((f"encode page, {jsonlib.BACKEND}", per_call_us(lambda: jsonlib.dumps(page), 50), "us"))
+    rows.append(("decode page, json", per_call_us(lambda: json.loads(encoded), 50), "us"))
+    rows.append((f"decode page, {jsonlib.BACKEND}", per_call_us(lambda: jsonlib.loads(encoded), 50), "us"))
+
+    print(f"median of {args.runs} runs for startup, page of 200 records x {args.width} extra keys ({len(encoded) / 1024:.0f} KiB)")
+    for name, value, unit in rows:
+        print(f"{name:>30} {value:10.1f} {unit}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+"""
+Tail latency of get_record_by_id against a fault-injecting upstream.
+
+    python -m benchmarks.bench_tail_latency [--calls 2000] [--concurrency 10]
+        [--latency-ms 10] [--slow-rate 0.02] [--slow-ms 500] [--hedge-ms 100]
+
+Part 1 runs the same load with and without hedged reads while a share of
+upstream calls stalls, and reports p50 / p99 / p99.9 plus the extra upstream
+requests the hedges cost. Part 2 takes the upstream down (every call 500s)
+and compares how long failing calls take, and how many of them still reach
+Zoho, with the circuit breaker on and off.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_load(calls: int, concurrency: int) -> tuple[list[float], int]:
+    from zoho_mcp.main import get_record_by_id
+
+    latencies = []
+    failures = 0
+    counter = iter(range(calls))
+
+    async def worker():
+        nonlocal failures
+        for i in counter:
+            started = time.perf_counter()
+            result = await get_record_by_id(None, "Leads", str(i), bypass_cache=True)
+            latencies.append((time.perf_counter() - started) * 1000)
+            failures += result["status"] != "success"
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures
+
+
+async def scenario(server: MockZohoServer, args, **env) -> dict:
+    from zoho_mcp.client import close_client, get_client
+    from zoho_mcp.config import reload_zoho_config
+
+    await close_client()
+    os.environ.update({key: str(value) for key, value in env.items()})
+    reload_zoho_config()
+    client = get_client()
+    await client.tokens.get_token()
+    before = server.stats["requests"]
+    latencies, failures = await run_load(args.calls, args.concurrency)
+    result = {
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "p99.9": percentile(latencies, 99.9),
+        "upstream": server.stats["requests"] - before,
+        "failures": failures,
+        "hedges": client.hedges,
+        "breaker": client.breaker.status(),
+    }
+    await close_client()
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--slow-rate", type=float, default=0.02)
+    parser.add_argument("--slow-ms", type=float, default=500.0)
+    parser.add_argument("--hedge-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    os.environ["ZOHO_RATE_LIMIT"] = "0"
+    os.environ["ZOHO_MAX_CONCURRENT_REQUESTS"] = str(args.concurrency * 2)
+    os.environ["ZOHO_HTTP_POOL_SIZE"] = str(args.concurrency * 2)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("zoho_mcp").setLevel(logging.CRITICAL)
+
+    with MockZohoServer(latency=args.latency_ms / 1000, slow_rate=args.slow_rate,
+                        slow_latency=args.slow_ms / 1000) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        plain = await scenario(server, args, ZOHO_HEDGE_DELAY_MS=0)
+        hedged = await scenario(server, args, ZOHO_HEDGE_DELAY_MS=args.hedge_ms)
+
+    print(f"{args.calls} get_record_by_id calls, {args.concurrency} concurrent, upstream {args.latency_ms:.0f} ms, "
+          f"{args.slow_rate:.1%} of calls stall {args.slow_ms:.0f} ms")
+    print(f"{'':>16} {'p50 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'upstream':>9}")
+    for name, result in (("no hedging", plain), (f"hedge @{args.hedge_ms:.0f} ms", hedged)):
+        print(f"{name:>16} {result['p50']:8.1f} {result['p99']:8.1f} {result['p99.9']:9.1f} {result['upstream']:9}")
+    print(f"hedges sent: {hedged['hedges']} (+{hedged['upstream'] / plain['upstream'] - 1:.1%} upstream calls)")
+
+    outage_calls = args.concurrency * 10
+    with MockZohoServer(latency=args.latency_ms / 1000, error_rate=1.0) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        args.calls = outage_calls
+        without = await scenario(server, args, ZOHO_HEDGE_DELAY_MS=0, ZOHO_BREAKER_THRESHOLD=0)
+        with_breaker = await scenario(server, args, ZOHO_BREAKER_THRESHOLD=5)
+
+    print()
+    print(f"upstream outage (every call 500s), {outage_calls} calls")
+    print(f"{'':>16} {'p50 ms':>8} {'p99 ms':>8} {'upstream':>9}")
+    for name, result in (("no breaker", without), ("breaker", with_breaker)):
+        print(f"{name:>16} {result['p50']:8.2f} {result['p99']:8.2f} {result['upstream']:9}")
+    print(f"breaker: {with_breaker['breaker']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
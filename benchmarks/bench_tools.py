@@ -0,0 +1,194 @@
+"""
+End-to-end benchmark of every MCP tool against the mock Zoho server.
+
+    python -m benchmarks.bench_tools [--calls 40] [--concurrency 4] [--latency-ms 50]
+                                     [--error-rate 0] [--rate-429 0] [--slow-rate 0] [--tools a,b]
+
+Tools are called through an in-process MCP client session connected to the
+FastMCP server in zoho_mcp.main, so argument validation, the lifespan and
+result serialization are measured too. Per tool it reports throughput,
+p50 / p99 latency, tool errors, upstream requests and upstream body bytes per
+call, and the size of the result handed back to the agent. Keep the output of
+a run as the baseline to compare performance changes against.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+RECORDS = 2000
+FIRST_ID = 4_000_000_000_000
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def record_id(n: int) -> str:
+    return str(FIRST_ID + n)
+
+
+def scenarios(work_dir: str, state: dict) -> list[tuple]:
+    """(label, arguments(i), calls cap or None, result hook or None) in run order; label is tool[variant]"""
+    import_file = os.path.join(work_dir, "import.csv")
+    with open(import_file, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["Last_Name", "Email"])
+        writer.writerows([f"Import {n}", f"import{n}@example.com"] for n in range(1000))
+
+    def some_ids(count: int) -> list[str]:
+        return [record_id(random.randrange(RECORDS)) for _ in range(count)]
+
+    def keep(key: str, get):
+        def hook(result: dict):
+            value = get(result)
+            if value:
+                state.setdefault(key, []).append(value)
+        return hook
+
+    def pick(key: str, i: int):
+        values = state.get(key) or ["missing"]
+        return values[i % len(values)]
+
+    return [
+        ("get_available_modules", lambda i: {}, None, None),
+        ("get_module_fields", lambda i: {"module_name": "Leads"}, None, None),
+        ("get_module_data", lambda i: {"module_name": "Leads", "limit": 50, "offset": 50 * (i % 10)}, None, None),
+        ("get_module_data[all]", lambda i: {"limit": 20, "slim": True}, None, None),
+        ("get_module_data[handle]", lambda i: {"module_name": "Leads", "limit": 200, "offset": 200 * (i % 10), "inline": False}, None, keep("results", lambda result: result.get("result_handle"))),
+        ("get_result_slice", lambda i: {"result_handle": pick("results", i), "offset": 20 * (i % 10), "limit": 20}, None, None),
+        ("get_record_by_id", lambda i: {"module_name": "Contacts", "record_id": some_ids(1)[0]}, None, None),
+        ("get_records_by_ids", lambda i: {"module_name": "Accounts", "record_ids": some_ids(150)}, None, None),
+        ("search_records", lambda i: {"module_name": "Leads", "search_criteria": f"(Email:equals:mock{random.randrange(RECORDS)}@example.com)"}, None, None),
+        ("sync_local_mirror", lambda i: {"module_name": "Leads"}, 5, None),
+        ("search_records[local]", lambda i: {"module_name": "Leads", "search_criteria": f"(Email:equals:mock{random.randrange(RECORDS)}@example.com)", "source": "local"}, None, None),
+        ("query_records", lambda i: {"module_name": "Leads", "select": ["Last_Name", "Email"], "where": "Last_Name is not null", "limit": 400}, None, None),
+        ("create_record", lambda i: {"module_name": "Leads", "record_data": {"Last_Name": f"Bench {i}"}}, None, None),
+        ("update_record", lambda i: {"module_name": "Leads", "record_id": some_ids(1)[0], "record_data": {"Phone": "+15550000000"}}, None, None),
+        ("delete_record", lambda i: {"module_name": "Leads", "record_id": some_ids(1)[0]}, None, None),
+        ("create_lead_from_form", lambda i: {"last_name": f"Form {i}", "mobile": "+15550000000", "client_description": "bench"}, None, keep("tickets", lambda result: result.get("ticket_id"))),
+        ("get_lead_ticket", lambda i: {"ticket_id": pick("tickets", i)}, None, None),
+        ("bulk_create_records", lambda i: {"module_name": "Leads", "records_data": [{"Last_Name": f"Bulk {i}-{n}"} for n in range(250)]}, 10, None),
+        ("bulk_update_records", lambda i: {"module_name": "Leads", "records_data": [{"id": item, "Phone": "1"} for item in some_ids(250)]}, 10, None),
+        ("bulk_upsert_records", lambda i: {"module_name": "Leads", "records_data": [{"Email": f"u{i}-{n}@example.com", "Last_Name": "Upsert"} for n in range(250)], "duplicate_check_fields": ["Email"]}, 10, None),
+        ("bulk_delete_records", lambda i: {"module_name": "Leads", "record_ids": some_ids(250)}, 10, None),
+        ("export_records", lambda i: {"module_name": "Deals", "file_path": os.path.join(work_dir, f"export-{i}.ndjson")}, 5, None),
+        ("bulk_read_records", lambda i: {"module_name": "Deals", "file_path": os.path.join(work_dir, f"bulk-{i}.csv")}, 3, keep("jobs", lambda result: (result.get("jobs") or [{}])[0].get("job_id"))),
+        ("get_bulk_read_job", lambda i: {"job_id": pick("jobs", i)}, 5, None),
+        ("import_records", lambda i: {"module_name": "Leads", "file_path": import_file}, 3, None),
+        ("get_rate_limit_status", lambda i: {}, None, None),
+        ("get_cache_stats", lambda i: {}, None, None),
+        ("reload_config", lambda i: {}, 5, None),
+    ]
+
+
+async def run_tool(session, server, label: str, arguments, calls: int, concurrency: int, hook) -> dict:
+    tool = label.split("[")[0]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors, result_bytes = [], 0, 0
+
+    async def call(i: int):
+        nonlocal errors, result_bytes
+        args = arguments(i)
+        async with semaphore:
+            started = time.perf_counter()
+            result = await session.call_tool(tool, args)
+            latencies.append((time.perf_counter() - started) * 1000)
+        text = "".join(item.text for item in result.content if getattr(item, "type", None) == "text")
+        result_bytes += len(text.encode())
+        try:
+            payload = json.loads(text)
+        except ValueError:
+            payload = {}
+        if result.isError or payload.get("status") == "error":
+            errors += 1
+        elif hook is not None:
+            hook(payload)
+
+    before = dict(server.stats)
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+    delta = {key: server.stats[key] - before[key] for key in ("requests", "bytes_in", "bytes_out")}
+    return {
+        "tool": label,
+        "calls": calls,
+        "per_second": calls / elapsed,
+        "p50": percentile(latencies, 50),
+        "p99": percentile(latencies, 99),
+        "errors": errors,
+        "upstream": delta["requests"] / calls,
+        "upstream_kb": (delta["bytes_in"] + delta["bytes_out"]) / calls / 1024,
+        "result_kb": result_bytes / calls / 1024,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--tools", default="", help="comma-separated tool names to run (default: all)")
+    args = parser.parse_args()
+    only = {name.strip() for name in args.tools.split(",") if name.strip()}
+
+    work_dir = tempfile.mkdtemp(prefix="bench_tools_")
+    with MockZohoServer(latency=args.latency_ms / 1000, records_per_module=RECORDS, record_width=40,
+                        error_rate=args.error_rate, rate_429=args.rate_429, retry_after=0.1,
+                        slow_rate=args.slow_rate, slow_latency=1.0, bulk_job_seconds=0.2) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        os.environ["ZOHO_EXPORT_DIR"] = work_dir
+        os.environ["ZOHO_ORG_ID"] = "1"
+        os.environ["ZOHO_MIRROR_DB"] = os.path.join(work_dir, "mirror.db")
+        os.environ["ZOHO_MIRROR_INTERVAL"] = "0"
+        os.environ["ZOHO_WRITE_QUEUE_DB"] = os.path.join(work_dir, "queue.db")
+        os.environ["ZOHO_WRITE_QUEUE_INTERVAL"] = "0.2"
+        os.environ["ZOHO_BULK_POLL_INTERVAL"] = "0.1"
+        os.environ["ZOHO_RESULT_SPILL_DIR"] = os.path.join(work_dir, "results")
+        from mcp.shared.memory import create_connected_server_and_client_session
+        from zoho_mcp.client import close_client
+        from zoho_mcp.main import mcp
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        logging.getLogger("mcp").setLevel(logging.WARNING)
+
+        rows, state = [], {}
+        async with create_connected_server_and_client_session(mcp._mcp_server) as session:
+            listed = {tool.name for tool in (await session.list_tools()).tools}
+            plan = scenarios(work_dir, state)
+            missing = listed - {label.split("[")[0] for label, *_ in plan}
+            if missing:
+                print(f"not covered: {', '.join(sorted(missing))}")
+            for label, arguments, cap, hook in plan:
+                if only and label.split("[")[0] not in only:
+                    continue
+                calls = min(args.calls, cap) if cap else args.calls
+                rows.append(await run_tool(session, server, label, arguments, calls, args.concurrency, hook))
+        await close_client()
+
+    print(f"latency {args.latency_ms:.0f} ms, error rate {args.error_rate:.0%}, 429 rate {args.rate_429:.0%}, "
+          f"slow rate {args.slow_rate:.0%}, concurrency {args.concurrency}")
+    print(f"{'tool':>24} {'calls':>5} {'calls/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>6} "
+          f"{'API/call':>8} {'KiB up/call':>11} {'KiB out/call':>12}")
+    for row in rows:
+        print(f"{row['tool']:>24} {row['calls']:5} {row['per_second']:8.1f} {row['p50']:8.1f} {row['p99']:8.1f} "
+              f"{row['errors']:6} {row['upstream']:8.1f} {row['upstream_kb']:11.1f} {row['result_kb']:12.1f}")
+    print(f"upstream total: {server.stats['requests']} requests, "
+          f"{(server.stats['bytes_in'] + server.stats['bytes_out']) / 1024 / 1024:.1f} MiB, "
+          f"{server.stats['throttled']} throttled, {server.stats['errors']} injected errors")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+create_lead_from_form under a burst of submissions: direct vs write-behind.
+
+    python -m benchmarks.bench_write_behind [--submissions 500] [--concurrency 50] [--latency-ms 150]
+
+Fires the submissions (half of them with a Note) at the given concurrency,
+first with direct writes, then with ZOHO_WRITE_QUEUE_DB set, and reports the
+p50 / p99 acknowledgement latency, the time until every Lead exists in the
+mock and the number of API calls.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.mock_zoho import MockZohoServer
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+async def burst(submissions: int, concurrency: int) -> tuple[list[float], list[dict]]:
+    from zoho_mcp.main import create_lead_from_form
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            result = await create_lead_from_form(
+                None, first_name="Bench", last_name=f"Lead {i}", mobile=f"+1555{i:07d}",
+                client_description="Submitted by bench_write_behind" if i % 2 else None,
+            )
+            return (time.perf_counter() - started) * 1000, result
+
+    outcomes = await asyncio.gather(*(submit(i) for i in range(submissions)))
+    return [latency for latency, _ in outcomes], [result for _, result in outcomes]
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    rows = []
+    with MockZohoServer(latency=args.latency_ms / 1000) as server:
+        os.environ["ZOHO_BASE_API_URL"] = server.base_url
+        os.environ["ZOHO_ACCOUNTS_URL"] = server.root_url
+        os.environ["ZOHO_RATE_LIMIT"] = "0"
+        from zoho_mcp.client import close_client, get_client
+        from zoho_mcp.config import reload_zoho_config
+        from zoho_mcp.write_queue import get_write_queue
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        await get_client().tokens.get_token()
+
+        before = server.stats["requests"]
+        started = time.perf_counter()
+        latencies, _ = await burst(args.submissions, args.concurrency)
+        rows.append(("direct", latencies, time.perf_counter() - started, server.stats["requests"] - before))
+
+        os.environ["ZOHO_WRITE_QUEUE_DB"] = os.path.join(tempfile.mkdtemp(), "queue.db")
+        os.environ["ZOHO_WRITE_QUEUE_INTERVAL"] = "0.5"
+        reload_zoho_config()
+        queue = get_write_queue()
+        before = server.stats["requests"]
+        started = time.perf_counter()
+        latencies, _ = await burst(args.submissions, args.concurrency)
+        while (await asyncio.to_thread(queue.stats))["done"] < args.submissions:
+            await asyncio.sleep(0.05)
+        rows.append(("write-behind", latencies, time.perf_counter() - started, server.stats["requests"] - before))
+        await queue.stop()
+        await close_client()
+
+    print(f"{args.submissions} submissions, concurrency {args.concurrency}, upstream latency {args.latency_ms:.0f} ms")
+    print(f"{'':>14} {'ack p50 ms':>11} {'ack p99 ms':>11} {'all in Zoho s':>14} {'API calls':>10}")
+    for name, samples, elapsed, calls in rows:
+        print(f"{name:>14} {percentile(samples, 50):11.1f} {percentile(samples, 99):11.1f} {elapsed:14.2f} {calls:10}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,581 @@
+"""
+Local stand-in for the Zoho CRM v2, Bulk API and OAuth endpoints used by zoho_mcp.
+
+Runs a threaded HTTP/1.1 server on 127.0.0.1 so benchmarks can exercise the
+real client code without a Zoho org. `handshake_delay` is slept once per new
+TCP connection to emulate the TCP + TLS handshake round trips to zohoapis.eu;
+`latency` is slept on every request. Faults can be injected into CRM calls:
+random 429s (`rate_429`, `concurrency_limit`), latency spikes of `slow_latency`
+on a `slow_rate` share of calls and 500 errors on an `error_rate` share.
+`stats` counts requests and request / response body bytes among others.
+Bulk Read and Bulk Write jobs finish `bulk_job_seconds` after they are submitted.
+"""
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import csv
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+import zipfile
+
+
+def make_record(module: str, n: int, width: int = 0) -> dict:
+    """
+    A record with a few real values. `width` adds the long tail a real Leads
+    record has: mostly-null custom fields and `$`-prefixed internal keys.
+    """
+    record = {
+        "id": str(4_000_000_000_000 + n),
+        "Last_Name": f"{module} {n}",
+        "First_Name": "Mock",
+        "Email": f"mock{n}@example.com",
+        "Phone": f"+1555{n:07d}",
+        "Owner": {"name": "Mock Owner", "id": "4000000000999", "email": "owner@example.com"},
+    }
+    for i in range(width):
+        if i % 4 == 0:
+            record[f"${'state' if i % 8 == 0 else 'field_states'}_{i}"] = {"editable": True, "approval": None}
+        elif i % 10 == 1:
+            record[f"Custom_Field_{i}"] = f"value {i}"
+        else:
+            record[f"Custom_Field_{i}"] = None
+    return record
+
+
+def iso_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds")
+
+
+def select_fields(record: dict, fields: str | None) -> dict:
+    if not fields:
+        return record
+    wanted = {"id", *fields.split(",")}
+    return {key: value for key, value in record.items() if key in wanted}
+
+
+class MockZohoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Buffer header + body into one segment; split writes hit delayed ACKs on keep-alive.
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+    server: "MockZohoServer"
+
+    def setup(self):
+        super().setup()
+        self.server.bump("connections")
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None):
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self._send_credit_headers()
+        self.end_headers()
+        self._write_body(raw)
+
+    def _write_body(self, raw: bytes):
+        self.server.bump("bytes_out", len(raw))
+        self.wfile.write(raw)
+
+    def _send_empty(self, status: int):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self._send_credit_headers()
+        self.end_headers()
+
+    def _send_credit_headers(self):
+        """Zoho reports the org's daily API credits on CRM responses"""
+        if self.path.startswith("/crm/v2/"):
+            self.send_header("X-RATELIMIT-DAY-LIMIT", str(self.server.credit_limit))
+            self.send_header("X-RATELIMIT-DAY-REMAINING", str(self.server.credit_limit - self.server.stats["credits"]))
+
+    def _send_metadata(self, body: dict):
+        """Metadata endpoints honour If-None-Match / If-Modified-Since like Zoho's settings API"""
+        etag = f'"{hashlib.md5(json.dumps(body, sort_keys=True).encode()).hexdigest()}"'
+        since = self.headers.get("If-Modified-Since")
+        not_modified = self.headers.get("If-None-Match") == etag
+        if since and not not_modified:
+            try:
+                not_modified = parsedate_to_datetime(since).timestamp() >= int(self.server.metadata_modified_at)
+            except (TypeError, ValueError):
+                pass
+        if not_modified:
+            self.server.bump("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        raw = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self._write_body(raw)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, method: str):
+        self.server.bump("requests")
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body = self._read_body()
+        self.server.bump("bytes_in", len(body))
+
+        in_flight = self.server.enter()
+        try:
+            crm_call = url.path.startswith("/crm/v2/")
+            if crm_call:
+                self.server.bump("credits")
+            if crm_call and self.server.should_throttle(in_flight):
+                self.server.bump("throttled")
+                headers = {}
+                if self.server.retry_after is not None:
+                    headers["Retry-After"] = str(self.server.retry_after)
+                return self._send_json(429, {"code": "TOO_MANY_REQUESTS", "message": "too many requests", "status": "error"}, headers)
+            if crm_call and self.server.slow_rate > 0 and random.random() < self.server.slow_rate:
+                self.server.bump("slow")
+                time.sleep(self.server.slow_latency)
+            if crm_call and self.server.error_rate > 0 and random.random() < self.server.error_rate:
+                self.server.bump("errors")
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                return self._send_json(500, {"code": "INTERNAL_ERROR", "message": "injected failure", "status": "error"})
+            if self.server.latency:
+                time.sleep(self.server.latency)
+            self._route(method, url, query, body)
+        finally:
+            self.server.leave()
+
+    def _route(self, method: str, url, query: dict, body: bytes):
+        if url.path == "/oauth/v2/token" and method == "POST":
+            n = self.server.bump("token_refreshes")
+            token = f"mock-token-{n}"
+            self.server.issued_tokens.add(token)
+            return self._send_json(200, {
+                "access_token": token,
+                "api_domain": "http://127.0.0.1",
+                "token_type": "Bearer",
+                "expires_in": self.server.token_ttl,
+            })
+
+        if url.path.startswith("/crm/bulk/v2/"):
+            return self._bulk(method, url.path[len("/crm/bulk/v2/"):].strip("/").split("/"), body)
+
+        if not url.path.startswith("/crm/v2/"):
+            return self._send_json(404, {"code": "INVALID_URL_PATTERN"})
+        if self.server.check_auth and not self.server.token_is_valid(self.headers.get("Authorization", "")):
+            return self._send_json(401, {"code": "INVALID_TOKEN", "details": {}, "message": "invalid oauth token", "status": "error"})
+        parts = url.path[len("/crm/v2/"):].strip("/").split("/")
+
+        if parts == ["settings", "modules"]:
+            return self._send_metadata({"modules": [{"api_name": m} for m in self.server.modules]})
+
+        if parts == ["settings", "fields"]:
+            return self._send_metadata({"fields": [
+                {"api_name": "Last_Name", "field_label": "Last Name", "data_type": "text", "system_mandatory": True},
+                {"api_name": "First_Name", "field_label": "First Name", "data_type": "text", "system_mandatory": False},
+                {"api_name": "Email", "field_label": "Email", "data_type": "email", "system_mandatory": False},
+                {"api_name": "Phone", "field_label": "Phone", "data_type": "phone", "system_mandatory": False},
+                {"api_name": "Owner", "field_label": "Owner", "data_type": "ownerlookup", "system_mandatory": False},
+                {"api_name": "Modified_Time", "field_label": "Modified Time", "data_type": "datetime", "system_mandatory": False},
+            ]})
+
+        if parts == ["upload"] and method == "POST":
+            return self._upload(body)
+
+        if parts == ["coql"] and method == "POST":
+            return self._coql(json.loads(body or b"{}").get("select_query", ""))
+
+        module = parts[0]
+        since = self.headers.get("If-Modified-Since")
+        if len(parts) == 1 and method == "GET" and "ids" in query:
+            ids = [i for i in query["ids"].split(",") if i]
+            if not ids or len(ids) > 100:
+                return self._send_json(400, {"code": "LIMIT_EXCEEDED", "message": "1-100 ids required", "status": "error"})
+            existing = set(self.server.record_numbers(module, None))
+            numbers = [int(i) - 4_000_000_000_000 for i in ids if i.isdigit()]
+            records = [select_fields(self.server.record(module, n), query.get("fields")) for n in numbers if n in existing]
+            if not records:
+                return self._send_empty(204)
+            return self._send_json(200, {"data": records, "info": {"count": len(records), "more_records": False}})
+
+        if len(parts) == 1 and method == "GET":
+            numbers = self.server.record_numbers(module, since)
+            if since and not numbers:
+                return self._send_empty(304)
+            page = int(query.get("page", 1))
+            per_page = int(query.get("per_page", 200))
+            start = (page - 1) * per_page
+            records = [select_fields(self.server.record(module, n), query.get("fields"))
+                       for n in numbers[start:start + per_page]]
+            return self._send_json(200, {
+                "data": records,
+                "info": {"page": page, "per_page": per_page, "count": len(records),
+                         "more_records": start + per_page < len(numbers)},
+            })
+
+        if parts[1:] == ["deleted"] and method == "GET":
+            entries = self.server.deleted_since(module, since)
+            if since and not entries:
+                return self._send_empty(304)
+            return self._send_json(200, {
+                "data": [{"id": record_id, "type": "recycle", "display_name": record_id, "deleted_time": deleted_time}
+                         for record_id, deleted_time in entries],
+                "info": {"page": 1, "per_page": len(entries), "count": len(entries), "more_records": False},
+            })
+
+        if len(parts) == 1 and method in ("POST", "PUT"):
+            items = json.loads(body or b"{}").get("data", [])
+            if len(items) > 100:
+                return self._send_json(400, {"code": "LIMIT_EXCEEDED", "message": "max 100 records", "status": "error"})
+            if any(item.get("_mock_fail") for item in items):
+                return self._send_json(500, {"code": "INTERNAL_ERROR", "message": "injected failure", "status": "error"})
+            status = 201 if method == "POST" else 200
+            return self._send_json(status, {"data": [
+                {"code": "SUCCESS", "status": "success",
+                 "details": {"id": item.get("id") or str(5_000_000_000_000 + self.server.bump("created"))}}
+                for item in items
+            ]})
+
+        if len(parts) == 1 and method == "DELETE":
+            ids = [i for i in query.get("ids", "").split(",") if i]
+            if not ids or len(ids) > 100:
+                return self._send_json(400, {"code": "LIMIT_EXCEEDED", "message": "1-100 ids required", "status": "error"})
+            return self._send_json(200, {"data": [
+                {"code": "SUCCESS", "status": "success", "details": {"id": record_id}} for record_id in ids
+            ]})
+
+        if len(parts) == 2 and parts[1] == "upsert" and method == "POST":
+            items = json.loads(body or b"{}").get("data", [])
+            if len(items) > 100:
+                return self._send_json(400, {"code": "LIMIT_EXCEEDED", "message": "max 100 records", "status": "error"})
+            return self._send_json(200, {"data": [
+                {"code": "SUCCESS", "status": "success", "action": "insert",
+                 "details": {"id": str(5_000_000_000_000 + self.server.bump("created"))},
+                 "duplicate_field": None}
+                for _ in items
+            ]})
+
+        if len(parts) == 2 and parts[1] == "search":
+            match = re.fullmatch(r"\((\w+):equals:(.*)\)", query.get("criteria", ""))
+            if match:
+                # Scans like an unindexed store would; other criteria get record 1.
+                field, value = match.groups()
+                records = [record for record in (self.server.record(module, n) for n in self.server.record_numbers(module, None))
+                           if str(record.get(field, "")).lower() == value.lower()]
+            else:
+                records = [self.server.record(module, 1)]
+            if not records:
+                return self._send_empty(204)
+            return self._send_json(200, {
+                "data": [select_fields(record, query.get("fields")) for record in records],
+                "info": {"page": 1, "per_page": len(records), "count": len(records), "more_records": False},
+            })
+
+        if len(parts) == 2 and method == "GET":
+            return self._send_json(200, {"data": [self.server.record(module, int(parts[1]) % 1_000_000)]})
+
+        if len(parts) == 2 and method in ("PUT", "DELETE"):
+            return self._send_json(200, {"data": [
+                {"code": "SUCCESS", "status": "success", "details": {"id": parts[1]}}
+            ]})
+
+        return self._send_json(404, {"code": "INVALID_URL_PATTERN"})
+
+    def _send_zip(self, name: str, content: str):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(name, content)
+        raw = archive.getvalue()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self._write_body(raw)
+
+    def _upload(self, body: bytes):
+        """Content-domain upload for Bulk Write: keeps the zip and returns its file_id"""
+        if self.headers.get("feature") != "bulk-write":
+            return self._send_json(400, {"code": "INVALID_REQUEST", "message": "feature header missing", "status": "error"})
+        message = BytesParser().parsebytes(b"Content-Type: " + self.headers.get("Content-Type", "").encode() + b"\r\n\r\n" + body)
+        files = [part.get_payload(decode=True) for part in message.get_payload() if part.get_filename()]
+        if not files:
+            return self._send_json(400, {"code": "INVALID_DATA", "message": "no file", "status": "error"})
+        file_id = str(8_000_000_000_000 + self.server.bump("uploads"))
+        self.server.uploads[file_id] = files[0]
+        return self._send_json(200, {"status": "success", "code": "FILE_UPLOAD_SUCCESS", "message": "file uploaded.",
+                                     "details": {"file_id": file_id, "created_time": iso_time(time.time())}})
+
+    def _bulk(self, method: str, parts: list[str], body: bytes):
+        """Bulk Read and Bulk Write APIs: jobs complete `bulk_job_seconds` after submission"""
+        if parts[0] == "write":
+            return self._bulk_write(method, parts, body)
+        if parts == ["read"] and method == "POST":
+            request = json.loads(body or b"{}")
+            job_id = str(7_000_000_000_000 + self.server.bump("bulk_jobs"))
+            self.server.bulk_read_jobs[job_id] = {"query": request.get("query", {}), "created": time.monotonic()}
+            return self._send_json(201, {"data": [{"status": "success", "code": "ADDED_SUCCESSFULLY",
+                                                    "details": {"id": job_id, "operation": "read", "state": "ADDED"}}]})
+
+        job = self.server.bulk_read_jobs.get(parts[1]) if len(parts) >= 2 and parts[0] == "read" else None
+        if job is None:
+            return self._send_json(404, {"code": "RESOURCE_NOT_FOUND", "message": "no such job", "status": "error"})
+        query = job["query"]
+        module, page = query.get("module", "Leads"), int(query.get("page", 1))
+        numbers = self.server.record_numbers(module, None)
+        start = (page - 1) * self.server.bulk_per_page
+        chosen = numbers[start:start + self.server.bulk_per_page]
+
+        if len(parts) == 2:
+            elapsed = time.monotonic() - job["created"]
+            state = "COMPLETED" if elapsed >= self.server.bulk_job_seconds else ("IN PROGRESS" if elapsed > 0.05 else "ADDED")
+            details = {"id": parts[1], "operation": "read", "state": state, "query": query}
+            if state == "COMPLETED":
+                details["result"] = {"page": page, "count": len(chosen), "per_page": self.server.bulk_per_page,
+                                     "download_url": f"/crm/bulk/v2/read/{parts[1]}/result",
+                                     "more_records": start + len(chosen) < len(numbers)}
+            return self._send_json(200, {"data": [details]})
+
+        # /read/{id}/result: a ZIP holding {id}.csv, lookups flattened to their id
+        records = (self.server.record(module, n) for n in chosen)
+        columns = query.get("fields") or list(make_record(module, 0, self.server.record_width))
+        text = io.StringIO()
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        for record in records:
+            writer.writerow([value.get("id") if isinstance(value := record.get(column), dict) else value
+                             for column in columns])
+        self._send_zip(f"{parts[1]}.csv", text.getvalue())
+
+    def _bulk_write(self, method: str, parts: list[str], body: bytes):
+        """
+        Rows without Last_Name are SKIPPED like Zoho's mandatory field check;
+        rows with an id are UPDATED by update / upsert jobs, the rest ADDED
+        """
+        if parts == ["write"] and method == "POST":
+            request = json.loads(body or b"{}")
+            resource = (request.get("resource") or [{}])[0]
+            if resource.get("file_id") not in self.server.uploads:
+                return self._send_json(400, {"code": "INVALID_DATA", "message": "unknown file_id", "status": "error"})
+            job_id = str(9_000_000_000_000 + self.server.bump("bulk_jobs"))
+            self.server.bulk_write_jobs[job_id] = {"request": request, "created": time.monotonic()}
+            return self._send_json(201, {"status": "success", "code": "SUCCESS", "message": "success",
+                                         "details": {"id": job_id}})
+
+        job = self.server.bulk_write_jobs.get(parts[1]) if len(parts) >= 2 else None
+        if job is None:
+            return self._send_json(404, {"code": "RESOURCE_NOT_FOUND", "message": "no such job", "status": "error"})
+        resource = job["request"]["resource"][0]
+        with zipfile.ZipFile(io.BytesIO(self.server.uploads[resource["file_id"]])) as zf:
+            rows = list(csv.DictReader(io.TextIOWrapper(zf.open(zf.namelist()[0]), encoding="utf-8")))
+        skipped = [not row.get("Last_Name") for row in rows]
+
+        if len(parts) == 2:
+            done = time.monotonic() - job["created"] >= self.server.bulk_job_seconds
+            state = "COMPLETED" if done else "IN PROGRESS"
+            answer = {"status": state, "id": parts[1], "operation": job["request"].get("operation"),
+                      "resource": [{"status": state, "type": "data", "module": resource.get("module"),
+                                    "file": {"added_count": skipped.count(False), "skipped_count": skipped.count(True),
+                                             "total_count": len(rows)}}]}
+            if done:
+                answer["result"] = {"download_url": f"/crm/bulk/v2/write/{parts[1]}/result"}
+            return self._send_json(200, answer)
+
+        text = io.StringIO()
+        columns = list(rows[0]) if rows else []
+        writer = csv.writer(text)
+        writer.writerow(columns + ["ID", "STATUS", "ERRORS"])
+        updates = job["request"].get("operation") in ("update", "upsert")
+        for row, skip in zip(rows, skipped):
+            if skip:
+                record_id, status = "", "SKIPPED"
+            elif updates and row.get("id"):
+                record_id, status = row["id"], "UPDATED"
+            else:
+                record_id, status = str(5_000_000_000_000 + self.server.bump("created")), "ADDED"
+            writer.writerow([row[column] for column in columns] + [
+                record_id, status, "MANDATORY_NOT_FOUND - Last_Name" if skip else ""])
+        self._send_zip(f"{parts[1]}.csv", text.getvalue())
+
+    def _coql(self, query: str):
+        """Enough of COQL for paging and COUNT: `where` is ignored, other aggregates are 0"""
+        match = re.fullmatch(r"select (.+?) from (\w+) where .+? limit (\d+)(?:, (\d+))?", query.strip(), re.IGNORECASE | re.DOTALL)
+        if not match:
+            return self._send_json(400, {"code": "SYNTAX_ERROR", "message": "unsupported query", "status": "error"})
+        select, module, first, second = match.groups()
+        offset, limit = (int(first), int(second)) if second else (0, int(first))
+        if limit > 200:
+            return self._send_json(400, {"code": "LIMIT_EXCEEDED", "message": "limit must be at most 200", "status": "error"})
+        items = [item.strip() for item in select.split(",")]
+        numbers = self.server.record_numbers(module, None)
+        if any("(" in item for item in items):
+            row = {item: (len(numbers) if item.upper().startswith("COUNT") else 0) for item in items}
+            return self._send_json(200, {"data": [row], "info": {"count": 1, "more_records": False}})
+        chosen = numbers[offset:offset + limit]
+        if not chosen:
+            return self._send_empty(204)
+        rows = [select_fields(self.server.record(module, n), ",".join(item.split(".")[0] for item in items)) for n in chosen]
+        return self._send_json(200, {"data": rows, "info": {"count": len(rows), "more_records": offset + limit < len(numbers)}})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class MockZohoServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs when a fresh pool opens many connections at once.
+    request_queue_size = 128
+
+    def __init__(self, latency: float = 0.0, handshake_delay: float = 0.0, records_per_module: int = 500,
+                 check_auth: bool = False, token_ttl: int = 3600, record_width: int = 0,
+                 rate_429: float = 0.0, concurrency_limit: int = 0, retry_after: float | None = None,
+                 slow_rate: float = 0.0, slow_latency: float = 1.0, error_rate: float = 0.0,
+                 bulk_job_seconds: float = 0.5, bulk_per_page: int = 200_000, credit_limit: int = 50_000):
+        super().__init__(("127.0.0.1", 0), MockZohoHandler)
+        self.latency = latency
+        self.handshake_delay = handshake_delay
+        self.records_per_module = records_per_module
+        self.record_width = record_width
+        # 429 injection: a random share of CRM calls, plus every call above concurrency_limit in flight.
+        self.rate_429 = rate_429
+        self.concurrency_limit = concurrency_limit
+        self.retry_after = retry_after
+        # Tail latency and failure injection for CRM calls.
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Daily API credits reported in X-RATELIMIT-DAY-* headers; every CRM call costs one.
+        self.credit_limit = credit_limit
+        # With check_auth only tokens issued by the mock OAuth endpoint are accepted.
+        self.check_auth = check_auth
+        self.token_ttl = token_ttl
+        self.issued_tokens = set()
+        self.modules = ["Leads", "Accounts", "Contacts", "Deals"]
+        self.metadata_modified_at = time.time() - 60
+        # Record history for incremental sync: every record was last modified at
+        # records_modified_at unless touch()ed later; delete() moves it to the recycle bin.
+        self.records_modified_at = int(time.time()) - 3600
+        self.modified = {}
+        self.deleted = {}
+        # Bulk API jobs
+        self.bulk_job_seconds = bulk_job_seconds
+        self.bulk_per_page = bulk_per_page
+        self.bulk_read_jobs = {}
+        self.bulk_write_jobs = {}
+        self.uploads = {}
+        self.stats = {"connections": 0, "requests": 0, "token_refreshes": 0, "not_modified": 0,
+                      "created": 0, "throttled": 0, "slow": 0, "errors": 0, "bulk_jobs": 0, "uploads": 0,
+                      "bytes_in": 0, "bytes_out": 0, "credits": 0}
+        self._thread = None
+        self._stats_lock = threading.Lock()
+
+    def bump(self, name: str, amount: int = 1) -> int:
+        with self._stats_lock:
+            self.stats[name] += amount
+            return self.stats[name]
+
+    def enter(self) -> int:
+        with self._stats_lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.in_flight
+
+    def leave(self):
+        with self._stats_lock:
+            self.in_flight -= 1
+
+    def should_throttle(self, in_flight: int) -> bool:
+        if self.concurrency_limit and in_flight > self.concurrency_limit:
+            return True
+        return self.rate_429 > 0 and random.random() < self.rate_429
+
+    def record(self, module: str, n: int) -> dict:
+        record = make_record(module, n, self.record_width)
+        modified_at = self.modified.get(module, {}).get(n, self.records_modified_at)
+        record["Modified_Time"] = iso_time(modified_at)
+        return record
+
+    def record_numbers(self, module: str, since: str | None) -> list[int]:
+        """Record numbers in Modified_Time order, optionally only those modified after `since`"""
+        with self._stats_lock:
+            modified = dict(self.modified.get(module, {}))
+            deleted = set(self.deleted.get(module, {}))
+        changed = sorted((n for n in modified if n not in deleted), key=lambda n: (modified[n], n))
+        if since:
+            threshold = datetime.fromisoformat(since).timestamp()
+            return [n for n in changed if modified[n] > threshold]
+        return [n for n in range(self.records_per_module) if n not in modified and n not in deleted] + changed
+
+    def deleted_since(self, module: str, since: str | None) -> list[tuple[str, str]]:
+        with self._stats_lock:
+            deleted = dict(self.deleted.get(module, {}))
+        threshold = datetime.fromisoformat(since).timestamp() if since else 0
+        return [(make_record(module, n)["id"], iso_time(at)) for n, at in sorted(deleted.items()) if at > threshold]
+
+    def touch(self, module: str, n: int):
+        """Marks record n (new if n >= records_per_module) as modified now"""
+        with self._stats_lock:
+            self.modified.setdefault(module, {})[n] = int(time.time())
+
+    def delete(self, module: str, n: int):
+        with self._stats_lock:
+            self.deleted.setdefault(module, {})[n] = int(time.time())
+
+    def token_is_valid(self, authorization: str) -> bool:
+        return authorization.removeprefix("Zoho-oauthtoken ") in self.issued_tokens
+
+    def revoke_tokens(self):
+        self.issued_tokens.clear()
+
+    @property
+    def root_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def base_url(self) -> str:
+        return f"{self.root_url}/crm/v2"
+
+    def start(self) -> "MockZohoServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
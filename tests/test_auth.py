@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+
+import httpx
+
+from zoho_mcp.auth import TokenManager
+from zoho_mcp.config import ZohoConfig, expire_access_token, get_access_token, update_access_token
+
+
+def make_config(**overrides) -> ZohoConfig:
+    return ZohoConfig(
+        base_url="https://zoho.test/crm/v2", refresh_token="refresh", client_id="client", client_secret="secret",
+        modules=["Leads"], accounts_url="https://accounts.zoho.test", **overrides,
+    )
+
+
+class TokenManagerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.issued = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.issued += 1
+            await asyncio.sleep(0.02)
+            return httpx.Response(200, json={"access_token": f"token-{self.issued}", "expires_in": 3600})
+
+        self.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.manager = TokenManager(make_config(), self.http)
+        expire_access_token()
+
+    async def asyncTearDown(self):
+        self.manager.close()
+        await self.http.aclose()
+        expire_access_token()
+
+    async def test_concurrent_callers_share_one_refresh(self):
+        tokens = await asyncio.gather(*(self.manager.get_token() for _ in range(20)))
+        self.assertEqual(set(tokens), {"token-1"})
+        self.assertEqual(self.issued, 1)
+
+    async def test_stale_token_is_refreshed_once(self):
+        await self.manager.get_token()
+        # Several requests got 401 with the same token at once.
+        tokens = await asyncio.gather(*(self.manager.refresh(stale_token="token-1") for _ in range(5)))
+        self.assertEqual(set(tokens), {"token-2"})
+        self.assertEqual(self.issued, 2)
+
+    async def test_refresh_is_scheduled_before_expiry(self):
+        await self.manager.get_token()
+        self.assertIsNotNone(self.manager._refresh_task)
+        self.assertFalse(self.manager._refresh_task.done())
+
+    async def test_resume_schedules_refresh_for_a_valid_token(self):
+        update_access_token("adopted", 3600)
+        self.manager.resume()
+        self.assertIsNotNone(self.manager._refresh_task)
+        self.assertEqual(self.issued, 0)
+
+    async def test_retired_manager_keeps_its_token_to_itself(self):
+        update_access_token("current", 3600)
+        self.manager.retire()
+        self.assertIsNone(self.manager._refresh_task)
+        self.assertEqual(await self.manager.refresh(stale_token="current"), "token-1")
+        self.assertEqual(get_access_token(), "current")
+
+
+if __name__ == "__main__":
+    unittest.main()
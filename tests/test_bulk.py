@@ -0,0 +1,53 @@
+import unittest
+
+from zoho_mcp.bulk import ChunkedResult
+from zoho_mcp.main import bulk_input_error, bulk_response
+
+OK = {"status": "success", "code": "SUCCESS", "details": {"id": "1"}}
+DUPLICATE = {"status": "error", "code": "DUPLICATE_DATA", "message": "duplicate data", "details": {"api_name": "Email"}}
+
+
+class BulkResponseTest(unittest.TestCase):
+    def test_all_records_succeeded(self):
+        answer = bulk_response("Leads", "created", 2, ChunkedResult(data=[OK, OK], chunks=1))
+        self.assertEqual(answer["status"], "success")
+
+    def test_record_errors_in_a_207_are_a_partial_success(self):
+        answer = bulk_response("Leads", "created", 3, ChunkedResult(data=[OK, DUPLICATE, OK], chunks=1))
+        self.assertEqual(answer["status"], "partial_success")
+        self.assertEqual(answer["message"], "2 of 3 records created; 1 failed")
+        self.assertEqual(answer["record_errors"], [{"index": 1, "code": "DUPLICATE_DATA", "message": "duplicate data",
+                                                    "details": {"api_name": "Email"}}])
+        self.assertNotIn("errors", answer)
+
+    def test_every_record_failed(self):
+        answer = bulk_response("Leads", "updated", 1, ChunkedResult(data=[DUPLICATE], chunks=1))
+        self.assertEqual(answer["status"], "error")
+        self.assertEqual(len(answer["record_errors"]), 1)
+
+    def test_failed_chunk(self):
+        chunk_error = {"chunk": 1, "offset": 100, "count": 1, "code": 500, "message": "boom"}
+        failed = {"status": "error", "code": 500, "message": "Chunk 1 failed", "details": {}}
+        answer = bulk_response("Leads", "deleted", 101, ChunkedResult(data=[OK] * 100 + [failed], errors=[chunk_error], chunks=2))
+        self.assertEqual(answer["status"], "partial_success")
+        self.assertEqual(answer["message"], "100 of 101 records deleted; 1 failed (1 of 2 chunks failed)")
+        self.assertEqual(answer["errors"], [chunk_error])
+
+
+class BulkInputErrorTest(unittest.TestCase):
+    def test_valid_records(self):
+        self.assertIsNone(bulk_input_error("Leads", [{"id": "1"}, {"id": 2}], require_id=True))
+        self.assertIsNone(bulk_input_error("Leads", [{"Last_Name": "a"}]))
+
+    def test_items_that_are_not_objects(self):
+        error = bulk_input_error("Leads", [{"id": "1"}, "2", None], require_id=True)
+        self.assertEqual(error["message"], "Every record must be an object; not an object at positions [1, 2]")
+        self.assertEqual(error["code"], 400)
+
+    def test_missing_id(self):
+        error = bulk_input_error("Leads", [{"id": "1"}, {"Last_Name": "a"}], require_id=True)
+        self.assertEqual(error["message"], "Every record needs an 'id'; missing at positions [1]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from zoho_mcp.bulk_write import ImportFileError, read_columns, write_parts
+
+
+class ImportFileTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.dir.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_ndjson_columns(self):
+        path = self.write("leads.ndjson", b'{"Last_Name": "a"}\n\n{"Email": "b@example.com", "Last_Name": "b"}\n')
+        self.assertEqual(read_columns(path, "ndjson"), ["Last_Name", "Email"])
+
+    def test_malformed_ndjson_line(self):
+        path = self.write("leads.ndjson", b'{"Last_Name": "a"}\n{"Last_Name": \n')
+        with self.assertRaisesRegex(ImportFileError, "^Line 2 is not valid JSON"):
+            read_columns(path, "ndjson")
+
+    def test_ndjson_line_that_is_not_an_object(self):
+        path = self.write("leads.ndjson", b'{"Last_Name": "a"}\n["b"]\n')
+        with self.assertRaisesRegex(ImportFileError, "^Line 2 is not a JSON object"):
+            read_columns(path, "ndjson")
+
+    def test_csv_that_is_not_utf8(self):
+        path = self.write("leads.csv", b"\xef\xbb\xbfLast_Name,City\na,Berlin\nb,K\xf6ln\n")
+        self.assertEqual(read_columns(path, "csv"), ["Last_Name", "City"])
+        with self.assertRaisesRegex(ImportFileError, "^Line 3 is not valid UTF-8"):
+            write_parts(path, "csv", ["Last_Name", "City"], os.path.join(self.dir.name, "parts"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from zoho_mcp.cache import RecordCache
+
+
+class RecordCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = RecordCache(max_entries=10, ttl=60)
+
+    def test_put_and_get(self):
+        self.cache.put("Leads", "1", {"id": "1"}, self.cache.generation("Leads", "1"))
+        self.assertEqual(self.cache.get("Leads", "1"), {"id": "1"})
+
+    def test_read_that_raced_a_write_is_not_cached(self):
+        generation = self.cache.generation("Leads", "1")
+        # A write lands while the GET is in flight.
+        self.cache.invalidate("Leads", ["1"])
+        self.cache.put("Leads", "1", {"id": "1", "Last_Name": "before the write"}, generation)
+        self.assertIsNone(self.cache.get("Leads", "1"))
+
+    def test_module_invalidation(self):
+        generation = self.cache.generation("Leads", "2")
+        self.cache.put("Leads", "1", {"id": "1"}, self.cache.generation("Leads", "1"))
+        self.cache.put("Contacts", "1", {"id": "1"}, self.cache.generation("Contacts", "1"))
+        self.cache.invalidate_module("Leads")
+        self.cache.put("Leads", "2", {"id": "2"}, generation)
+        self.assertIsNone(self.cache.get("Leads", "1"))
+        self.assertIsNone(self.cache.get("Leads", "2"))
+        self.assertEqual(self.cache.get("Contacts", "1"), {"id": "1"})
+
+    def test_new_epoch_when_counters_are_dropped(self):
+        generation = self.cache.generation("Leads", "1")
+        self.cache.invalidate("Leads", [str(n) for n in range(5000)])
+        self.assertFalse(self.cache.generations.get(("Leads", "1")))
+        self.cache.put("Leads", "1", {"id": "1"}, generation)
+        self.assertIsNone(self.cache.get("Leads", "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+
+import httpx
+
+from tests.test_auth import make_config
+from zoho_mcp.client import ZohoClient
+from zoho_mcp.coalesce import RequestCoalescer, request_key
+from zoho_mcp.config import expire_access_token, update_access_token
+
+
+class RequestCoalescerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_call(self):
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(coalescer.run("key", call) for _ in range(5)))
+        self.assertEqual([result for result, _ in results], [1] * 5)
+        self.assertEqual([joined for _, joined in results], [False, True, True, True, True])
+        # Nothing is cached once the call finished.
+        self.assertEqual(await coalescer.run("key", call), (2, False))
+
+    async def test_cancelled_caller_does_not_cancel_the_shared_call(self):
+        coalescer = RequestCoalescer()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return "answer"
+
+        first = asyncio.create_task(coalescer.run("key", call))
+        second = asyncio.create_task(coalescer.run("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, ("answer", True))
+
+    def test_key_ignores_param_order(self):
+        self.assertEqual(
+            request_key("GET", "/Leads", {"page": 1, "per_page": 5}, {}, "org"),
+            request_key("GET", "/Leads", {"per_page": 5, "page": 1}, {}, "org"),
+        )
+        self.assertNotEqual(request_key("GET", "/Leads", None, {}, "org", (0, 1)), request_key("GET", "/Leads", None, {}, "org", (0, 2)))
+
+
+class WriteEpochTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Built outside the loop: creating its SSL context trips the slow-callback warning of debug mode.
+        self.client = ZohoClient(make_config())
+        self.default_http = self.client.http
+
+    async def asyncSetUp(self):
+        self.sent = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            self.sent.append(request.method)
+            if request.method == "GET":
+                await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"data": []})
+
+        self.client.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        update_access_token("token", 3600)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        await self.default_http.aclose()
+        expire_access_token()
+
+    async def test_identical_gets_share_one_request(self):
+        await asyncio.gather(*(self.client.get("/Leads/1") for _ in range(5)))
+        self.assertEqual(self.sent, ["GET"])
+
+    async def test_get_after_a_write_does_not_join_one_sent_before_it(self):
+        before = asyncio.create_task(self.client.get("/Leads/1"))
+        await asyncio.sleep(0.01)
+        await self.client.put("/Leads", json={"data": [{"id": "1"}]})
+        after = asyncio.create_task(self.client.get("/Leads/1"))
+        await asyncio.gather(before, after)
+        self.assertEqual(self.sent, ["GET", "PUT", "GET"])
+        self.assertEqual(self.client.write_epoch, 1)
+
+    async def test_coql_query_does_not_move_the_epoch(self):
+        await self.client.post("/coql", json={"select_query": "select id from Leads where id is not null"})
+        self.assertEqual(self.client.write_epoch, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+
+from zoho_mcp.coql import InvalidQuery, plan_query
+
+
+class PlanQueryTest(unittest.TestCase):
+    def test_limit_and_semicolon_inside_literals_are_allowed(self):
+        for where in ("Description like '%limit%'", "Last_Name = 'a;b'", r"Description = 'it\'s; limit'"):
+            with self.subTest(where=where):
+                self.assertEqual(plan_query("Leads", ("Last_Name",), where).where, where)
+
+    def test_limit_and_semicolon_outside_literals_are_rejected(self):
+        for where in ("Last_Name = 'x' limit 5", "Last_Name = 'x'; delete", "Description like '%limit%' limit 1"):
+            with self.subTest(where=where), self.assertRaises(InvalidQuery):
+                plan_query("Leads", ("Last_Name",), where)
+
+    def test_field_names_containing_limit(self):
+        self.assertEqual(plan_query("Accounts", ("id",), "Credit_Limit > 100").where, "Credit_Limit > 100")
+
+
+if __name__ == "__main__":
+    unittest.main()
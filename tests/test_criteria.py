@@ -0,0 +1,131 @@
+import unittest
+
+from zoho_mcp.criteria import UnsupportedCriteria, parse_criteria, to_sql
+from zoho_mcp.mirror import LocalMirror
+
+RECORDS = [
+    {"id": "1", "Last_Name": "Smith", "Email": "Smith@Example.com", "Converted": True, "Annual_Revenue": 1000.0,
+     "Account_Name": {"name": "Acme", "id": "9001"}, "Created_Time": "2024-01-01T10:00:00+05:30",
+     "Closing_Date": "2024-03-01", "Modified_Time": "2024-05-01T10:00:00+00:00"},
+    {"id": "2", "Last_Name": "Smyth", "Email": "smyth@example.com", "Converted": False, "Annual_Revenue": 2500,
+     "Account_Name": {"name": "Globex", "id": "9002"}, "Created_Time": "2024-01-01T06:00:00+00:00",
+     "Closing_Date": "2024-04-15", "Modified_Time": "2024-05-02T10:00:00+00:00"},
+    {"id": "3", "Last_Name": "Jones", "Email": None, "Converted": False, "Annual_Revenue": None,
+     "Account_Name": None, "Created_Time": "2023-12-31T23:00:00-05:00",
+     "Closing_Date": None, "Modified_Time": "2024-05-03T10:00:00+00:00", "Description": "50% off_limit"},
+]
+
+
+class ParseCriteriaTest(unittest.TestCase):
+    def test_single_condition(self):
+        self.assertEqual(parse_criteria("(Email:equals:a@b.com)"), ("cond", "Email", "equals", "a@b.com"))
+
+    def test_and_binds_tighter_than_or(self):
+        node = parse_criteria("(A:equals:1)or(B:equals:2)and(C:equals:3)")
+        self.assertEqual(node, ("or", [
+            ("cond", "A", "equals", "1"),
+            ("and", [("cond", "B", "equals", "2"), ("cond", "C", "equals", "3")]),
+        ]))
+
+    def test_nested_groups(self):
+        node = parse_criteria("((A:equals:1)or(B:equals:2))and(C:starts_with:x)")
+        self.assertEqual(node[0], "and")
+        self.assertEqual(node[1][0][0], "or")
+
+    def test_escaped_parenthesis_and_comma(self):
+        node = parse_criteria(r"(Last_Name:in:O\(Brien\),Smith\,Jr)")
+        self.assertEqual(node, ("cond", "Last_Name", "in", r"O\(Brien\),Smith\,Jr"))
+
+    def test_unsupported(self):
+        for text in ("(Email:contains:x)", "(Email:equals:x", "Email:equals:x", "(Bad-Field:equals:x)", "(A:equals:1)junk"):
+            with self.subTest(text=text), self.assertRaises(UnsupportedCriteria):
+                parse_criteria(text)
+
+
+class ToSqlTest(unittest.TestCase):
+    def setUp(self):
+        self.mirror = LocalMirror(":memory:")
+        self.mirror._store_page("Leads", RECORDS)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def ids(self, criteria: str) -> list[str]:
+        where, params = to_sql(parse_criteria(criteria))
+        return sorted(record["id"] for record in self.mirror.search("Leads", where, params, 100))
+
+    def test_text_is_case_insensitive(self):
+        self.assertEqual(self.ids("(Last_Name:equals:smith)"), ["1"])
+        self.assertEqual(self.ids("(Email:equals:SMITH@example.com)"), ["1"])
+
+    def test_booleans(self):
+        self.assertEqual(self.ids("(Converted:equals:true)"), ["1"])
+        self.assertEqual(self.ids("(Converted:equals:false)"), ["2", "3"])
+        self.assertEqual(self.ids("(Converted:not_equal:true)"), ["2", "3"])
+
+    def test_numbers_compare_numerically(self):
+        self.assertEqual(self.ids("(Annual_Revenue:equals:1000)"), ["1"])
+        self.assertEqual(self.ids("(Annual_Revenue:in:1000,2500)"), ["1", "2"])
+        self.assertEqual(self.ids("(Annual_Revenue:greater_than:999.5)"), ["1", "2"])
+        self.assertEqual(self.ids("(Annual_Revenue:between:1500,3000)"), ["2"])
+
+    def test_lookups_match_name_or_id(self):
+        self.assertEqual(self.ids("(Account_Name:equals:acme)"), ["1"])
+        self.assertEqual(self.ids("(Account_Name:equals:9002)"), ["2"])
+        self.assertEqual(self.ids("(Account_Name.id:equals:9001)"), ["1"])
+        self.assertEqual(self.ids("(Account_Name:starts_with:glo)"), ["2"])
+
+    def test_datetimes_compare_in_utc(self):
+        # Record 1 was created at 04:30 UTC, record 2 at 06:00 UTC, record 3 at 04:00 UTC.
+        self.assertEqual(self.ids("(Created_Time:greater_than:2024-01-01T05:00:00+00:00)"), ["2"])
+        self.assertEqual(self.ids("(Created_Time:equals:2024-01-01T04:30:00Z)"), ["1"])
+        self.assertEqual(self.ids("(Created_Time:between:2024-01-01T03:59:00+00:00,2024-01-01T04:31:00+00:00)"), ["1", "3"])
+
+    def test_dates(self):
+        self.assertEqual(self.ids("(Closing_Date:less_than:2024-04-01)"), ["1"])
+        self.assertEqual(self.ids("(Closing_Date:equals:2024-04-15)"), ["2"])
+
+    def test_starts_with_and_not_in(self):
+        self.assertEqual(self.ids("(Last_Name:starts_with:sm)"), ["1", "2"])
+        self.assertEqual(self.ids("(Email:starts_with:SMY)"), ["2"])
+        self.assertEqual(self.ids("(Last_Name:not_in:Smith,Jones)"), ["2"])
+        self.assertEqual(self.ids("(Email:not_equal:smyth@example.com)"), ["1", "3"])
+
+    def test_like_wildcards_are_literal(self):
+        self.assertEqual(self.ids("(Description:starts_with:50%)"), ["3"])
+        self.assertEqual(self.ids("(Description:starts_with:5_)"), [])
+
+    def test_and_or(self):
+        self.assertEqual(self.ids("((Converted:equals:false)and(Last_Name:starts_with:S))or(id:equals:1)"), ["1", "2"])
+
+    def test_untranslatable_criteria_raise(self):
+        for criteria in (
+            "(Created_Time:greater_than:2024-01-01T05:00:00)",  # no UTC offset
+            "(Last_Name:greater_than:Smith)",
+            "(Annual_Revenue:between:1,2024-01-01)",
+            "(Annual_Revenue:between:1)",
+            "(Email:greater_than:5)",
+        ):
+            with self.subTest(criteria=criteria), self.assertRaises(UnsupportedCriteria):
+                to_sql(parse_criteria(criteria))
+
+
+class SearchWordsTest(unittest.TestCase):
+    def setUp(self):
+        self.mirror = LocalMirror(":memory:")
+        self.mirror._store_page("Leads", RECORDS)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def test_terms_must_all_match(self):
+        if not self.mirror.fts:
+            self.skipTest("SQLite without FTS5")
+        self.assertEqual([record["id"] for record in self.mirror.search_words("Leads", "smyth globex", 10)], ["2"])
+
+    def test_blank_word_matches_nothing(self):
+        self.assertEqual(self.mirror.search_words("Leads", "  ", 10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
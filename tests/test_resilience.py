@@ -0,0 +1,71 @@
+import time
+import unittest
+
+from zoho_mcp.resilience import CircuitBreaker, CircuitOpenError, endpoint_kind
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05)
+
+    def open_circuit(self):
+        for _ in range(2):
+            self.breaker.check()
+            self.breaker.record(False)
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record(False)
+        self.breaker.record(True)
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError) as raised:
+            self.breaker.check()
+        self.assertGreater(raised.exception.retry_after, 0)
+        self.assertEqual(self.breaker.rejected, 1)
+
+    def test_one_trial_call_after_cooldown(self):
+        self.open_circuit()
+        time.sleep(0.06)
+        self.breaker.check()
+        self.assertEqual(self.breaker.state, "half_open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check()
+        self.breaker.record(True)
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.check()
+
+    def test_failed_trial_opens_again(self):
+        self.open_circuit()
+        time.sleep(0.06)
+        self.breaker.check()
+        self.breaker.record(False)
+        self.assertEqual(self.breaker.state, "open")
+        self.assertEqual(self.breaker.times_opened, 2)
+
+    def test_released_trial_lets_the_next_call_try(self):
+        self.open_circuit()
+        time.sleep(0.06)
+        self.breaker.check()
+        self.breaker.release()
+        self.breaker.check()
+
+    def test_disabled_with_zero_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=0)
+        for _ in range(10):
+            breaker.record(False)
+            breaker.check()
+
+
+class EndpointKindTest(unittest.TestCase):
+    def test_kinds(self):
+        self.assertEqual(endpoint_kind("GET", "/settings/fields"), "metadata")
+        self.assertEqual(endpoint_kind("POST", "/coql"), "coql")
+        self.assertEqual(endpoint_kind("GET", "/Leads/search"), "search")
+        self.assertEqual(endpoint_kind("GET", "/Leads"), "read")
+        self.assertEqual(endpoint_kind("PUT", "/Leads"), "write")
+
+
+if __name__ == "__main__":
+    unittest.main()
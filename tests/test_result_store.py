@@ -0,0 +1,82 @@
+import os
+import tempfile
+import time
+import unittest
+
+from zoho_mcp.jsonlib import dumps
+from zoho_mcp.result_store import ResultStore, estimate_size
+
+RECORDS = [{"id": str(n), "Last_Name": f"Lead {n}"} for n in range(10)]
+SIZE = len(dumps(RECORDS))
+
+
+class ResultStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def store(self, memory_bytes: int, disk_bytes: int, ttl: float = 3600.0) -> ResultStore:
+        store = ResultStore(memory_bytes=memory_bytes, disk_bytes=disk_bytes, spill_dir=self.dir.name, ttl=ttl)
+        self.addCleanup(store.clear)
+        return store
+
+    def test_slice_from_memory(self):
+        store = self.store(SIZE * 10, SIZE * 10)
+        entry = store.put(RECORDS, {"module": "Leads"})
+        self.assertEqual(entry.size, SIZE)
+        stored, data = store.slice(entry.handle, 2, 3)
+        self.assertEqual(data, RECORDS[2:5])
+        self.assertEqual(stored.meta, {"module": "Leads"})
+
+    def test_least_recently_used_result_spills_to_disk(self):
+        store = self.store(SIZE * 2, SIZE * 10)
+        first = store.put(RECORDS, {})
+        second = store.put(RECORDS, {})
+        store.get(first.handle)  # first is now the most recently used
+        store.put(RECORDS, {})
+        self.assertIsNone(second.records)
+        self.assertTrue(os.path.isfile(second.path))
+        self.assertEqual(store.slice(second.handle, 8, 5)[1], RECORDS[8:])
+        self.assertEqual(store.stats.spilled, 1)
+
+    def test_newest_result_stays_in_memory_even_over_budget(self):
+        store = self.store(1, SIZE * 10)
+        entry = store.put(RECORDS, {})
+        self.assertIsNotNone(entry.records)
+
+    def test_disk_budget_evicts_oldest_spill(self):
+        store = self.store(SIZE, SIZE)
+        first = store.put(RECORDS, {})
+        store.put(RECORDS, {})
+        path = first.path
+        store.put(RECORDS, {})
+        self.assertIsNone(store.slice(first.handle, 0, 1))
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(store.stats.evicted, 1)
+
+    def test_without_disk_budget_results_are_dropped(self):
+        store = self.store(SIZE, 0)
+        first = store.put(RECORDS, {})
+        store.put(RECORDS, {})
+        self.assertIsNone(store.get(first.handle))
+        self.assertEqual((store.stats.spilled, store.stats.evicted), (0, 1))
+
+    def test_handles_expire(self):
+        store = self.store(SIZE * 10, SIZE * 10, ttl=0.05)
+        entry = store.put(RECORDS, {})
+        time.sleep(0.06)
+        self.assertIsNone(store.get(entry.handle))
+        self.assertEqual(store.stats.expired, 1)
+
+
+class EstimateSizeTest(unittest.TestCase):
+    def test_extrapolates_from_a_sample(self):
+        records = [{"id": str(n).zfill(4)} for n in range(200)]
+        self.assertAlmostEqual(estimate_size(records), len(dumps(records)), delta=len(dumps(records)) * 0.05)
+        self.assertEqual(estimate_size([]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import unittest
+
+import httpx
+
+from zoho_mcp.scheduler import PRIORITY_BULK, PRIORITY_INTERACTIVE, RequestScheduler
+
+
+def response(status_code: int, **headers) -> httpx.Response:
+    return httpx.Response(status_code, headers=headers)
+
+
+class TokenBucketTest(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_then_rate(self):
+        scheduler = RequestScheduler(rate=20, burst=2, max_concurrency=10)
+        admitted = []
+
+        async def send():
+            admitted.append(time.monotonic())
+            return response(200)
+
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.run(send) for _ in range(6)))
+        # Two go out at once, the other four wait 1/20 s each for a token.
+        self.assertLess(admitted[1] - started, 0.03)
+        self.assertGreaterEqual(admitted[-1] - started, 0.18)
+        self.assertEqual(scheduler.stats["requests"], 6)
+
+    async def test_no_rate_limit_by_default(self):
+        scheduler = RequestScheduler()
+        started = time.monotonic()
+        await asyncio.gather(*(scheduler.run(lambda: asyncio.sleep(0, response(200))) for _ in range(50)))
+        self.assertLess(time.monotonic() - started, 0.1)
+
+
+class PriorityTest(unittest.IsolatedAsyncioTestCase):
+    async def test_interactive_overtakes_queued_bulk(self):
+        scheduler = RequestScheduler(max_concurrency=1)
+        await scheduler.acquire()  # holds the only slot
+        order = []
+
+        async def call(name: str, priority: int):
+            await scheduler.acquire(priority)
+            order.append(name)
+            scheduler.release()
+
+        tasks = [asyncio.create_task(call("bulk-1", PRIORITY_BULK)), asyncio.create_task(call("bulk-2", PRIORITY_BULK))]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(call("read-1", PRIORITY_INTERACTIVE)), asyncio.create_task(call("read-2", PRIORITY_INTERACTIVE))]
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        self.assertEqual(order, ["read-1", "read-2", "bulk-1", "bulk-2"])
+
+    async def test_concurrency_cap(self):
+        scheduler = RequestScheduler(max_concurrency=3)
+        in_flight = peak = 0
+
+        async def send():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return response(200)
+
+        await asyncio.gather(*(scheduler.run(send) for _ in range(10)))
+        self.assertEqual(peak, 3)
+
+
+class RetryAfterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_429_waits_for_retry_after_and_pauses_everyone(self):
+        scheduler = RequestScheduler(max_concurrency=10)
+        answers = [response(429, **{"Retry-After": "0.2"}), response(200)]
+        sent = []
+
+        async def throttled():
+            sent.append(("throttled", time.monotonic()))
+            return answers.pop(0)
+
+        async def other():
+            sent.append(("other", time.monotonic()))
+            return response(200)
+
+        started = time.monotonic()
+        first = asyncio.create_task(scheduler.run(throttled))
+        await asyncio.sleep(0.05)
+        result = await asyncio.gather(first, scheduler.run(other))
+        self.assertEqual([item.status_code for item in result], [200, 200])
+        # The retry and the call that arrived during the pause both wait for Retry-After.
+        self.assertTrue(all(at - started >= 0.19 for _, at in sent[1:]))
+        self.assertEqual((scheduler.stats["throttled"], scheduler.stats["retries"]), (1, 1))
+
+    async def test_gives_up_after_max_retries(self):
+        scheduler = RequestScheduler(max_retries=2)
+        calls = 0
+
+        async def send():
+            nonlocal calls
+            calls += 1
+            return response(429, **{"Retry-After": "0"})
+
+        self.assertEqual((await scheduler.run(send)).status_code, 429)
+        self.assertEqual(calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+
+import httpx
+
+from zoho_mcp.config import ZohoConfig, get_access_token, update_access_token, is_token_expired, access_token_config
+from zoho_mcp.jsonlib import loads
+from zoho_mcp.metrics import get_metrics
+from zoho_mcp.token_store import FileTokenStore
+
+logger = logging.getLogger(__name__)
+
+
+class TokenManager:
+    """
+    Owns the OAuth access token for the process.
+
+    - Refreshes are single-flight: concurrent callers that find the token
+      expired wait on one POST to /oauth/v2/token instead of each sending
+      their own.
+    - Expiry is taken from `expires_in` in the OAuth response.
+    - After each refresh a background task is scheduled to refresh again
+      `token_refresh_margin` seconds before expiry, so the request path
+      normally never waits for a refresh.
+    - With `token_cache_file` set, tokens are shared through a FileTokenStore:
+      a process that starts (or finds its token stale) first adopts a valid
+      token written by another process, and only refreshes if there is none.
+    - A manager retired by reload_config after a credentials change keeps
+      serving the calls still in progress on its client with a token of its
+      own; it never replaces the process token minted with the new credentials.
+    """
+
+    def __init__(self, config: ZohoConfig, http: httpx.AsyncClient):
+        self.config = config
+        self.http = http
+        self.refresh_count = 0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self.closed = False
+        self.retired = False
+        self._private: tuple[str, float] | None = None  # token and expiry of a retired manager
+        self.store = FileTokenStore(config.token_cache_file, config.client_id) if config.token_cache_file else None
+
+    async def get_token(self) -> str:
+        """Возвращает действующий токен, обновляя его при необходимости"""
+        if self.retired:
+            return await self._private_token()
+        token = get_access_token()
+        if is_token_expired():
+            token = await self.refresh(stale_token=token)
+        return token
+
+    async def refresh(self, stale_token: str | None = None) -> str:
+        """
+        Refresh the access token unless another caller already replaced
+        `stale_token` with a valid one while we were waiting for the lock.
+        """
+        if self.retired:
+            return await self._private_token(stale_token)
+        async with self._lock:
+            current = get_access_token()
+            if current != stale_token and not is_token_expired():
+                return current
+
+            if self.store is None:
+                return await self._fetch_token()
+
+            await self._acquire_store_lock()
+            try:
+                stored = self.store.load()
+                if stored is not None and stored[0] != stale_token:
+                    # Another process already refreshed; reuse its token.
+                    access_token, expires_at = stored
+                    update_access_token(access_token, expires_at - time.time())
+                    self._schedule_refresh()
+                    return access_token
+
+                access_token = await self._fetch_token()
+                self.store.save(access_token, access_token_config.expires_at)
+                return access_token
+            finally:
+                self.store.release()
+
+    async def _acquire_store_lock(self):
+        """
+        Waits for the cross-process lock in a worker thread. A cancelled
+        caller cannot stop that thread, so the lock it eventually takes is
+        released right away instead of being held forever.
+        """
+        acquiring = asyncio.ensure_future(asyncio.to_thread(self.store.acquire))
+        try:
+            await asyncio.shield(acquiring)
+        except asyncio.CancelledError:
+            acquiring.add_done_callback(self._release_abandoned_lock)
+            raise
+
+    def _release_abandoned_lock(self, acquiring: asyncio.Future):
+        if not acquiring.cancelled() and acquiring.exception() is None:
+            self.store.release()
+
+    async def _fetch_token(self) -> str:
+        """Запрашивает новый access token и делает его токеном процесса"""
+        access_token, expires_in = await self._request_token()
+        update_access_token(access_token, expires_in)
+        self._schedule_refresh()
+        return access_token
+
+    async def _private_token(self, stale_token: str | None = None) -> str:
+        """Токен выведенного из работы менеджера: старые учетные данные, общий токен не трогаем"""
+        async with self._lock:
+            if self._private is not None and self._private[0] != stale_token and time.time() < self._private[1]:
+                return self._private[0]
+            access_token, expires_in = await self._request_token()
+            self._private = (access_token, time.time() + expires_in)
+            return access_token
+
+    async def _request_token(self) -> tuple[str, float]:
+        """Запрашивает новый access token по refresh token; возвращает токен и expires_in"""
+        params = {
+            'grant_type': 'refresh_token',
+            'client_id': self.config.client_id,
+            'client_secret': self.config.client_secret,
+            'refresh_token': self.config.refresh_token
+        }
+        response = await self.http.post(self.config.accounts_url + '/oauth/v2/token', data=params)
+        try:
+            json_resp = loads(response.content)
+            access_token = json_resp['access_token']
+        except Exception as ex:
+            get_metrics().token_refreshed(False)
+            logger.warning(f"Ошибка обновления токена: {ex}")
+            raise RuntimeError("Не удалось обновить токен доступа") from ex
+
+        self.refresh_count += 1
+        get_metrics().token_refreshed(True)
+        return access_token, float(json_resp.get('expires_in', 3600))
+
+    def resume(self):
+        """Планирует фоновое обновление токена, полученного другим менеджером (например, до reload_config)"""
+        if not is_token_expired():
+            self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        """Планирует фоновое обновление токена незадолго до его истечения"""
+        if self.closed:
+            return
+        if self._refresh_task is not None and self._refresh_task is not asyncio.current_task():
+            self._refresh_task.cancel()
+        remaining = access_token_config.expires_at - time.time()
+        # For short-lived tokens (expires_in <= margin) refresh at half-life instead of immediately.
+        delay = max(remaining - self.config.token_refresh_margin, remaining / 2, 0.0)
+        self._refresh_task = asyncio.create_task(self._refresh_later(delay))
+
+    async def _refresh_later(self, delay: float):
+        await asyncio.sleep(delay)
+        try:
+            await self.refresh(stale_token=get_access_token())
+        except Exception as ex:
+            # The request path will still refresh lazily once the token expires.
+            logger.warning(f"Фоновое обновление токена не удалось: {ex}")
+
+    def close(self):
+        self.closed = True
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def retire(self):
+        """Stops background refreshes; later refreshes only serve this manager's own client"""
+        self.close()
+        self.retired = True
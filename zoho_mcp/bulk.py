@@ -0,0 +1,108 @@
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+import asyncio
+
+import httpx
+
+from zoho_mcp.jsonlib import loads
+
+# Zoho CRM allows up to 100 records per API call
+ZOHO_MAX_RECORDS = 100
+
+# Longest request URL we send; multi-ID reads are cut below it
+MAX_URL_LENGTH = 4096
+
+
+@dataclass
+class ChunkedResult:
+    """Per-record results in input order plus one error entry per failed chunk"""
+    data: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    chunks: int = 0
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for item in self.data if isinstance(item, dict) and item.get("status") == "success")
+
+    @property
+    def failed_records(self) -> list[dict]:
+        """Input position, code and message of every record Zoho did not accept"""
+        failed = []
+        for index, item in enumerate(self.data):
+            item = item if isinstance(item, dict) else {}
+            if item.get("status") != "success":
+                failed.append({"index": index, "code": item.get("code"), "message": item.get("message"), "details": item.get("details")})
+        return failed
+
+
+def chunked(items: list, size: int = ZOHO_MAX_RECORDS) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def chunk_ids(ids: list[str], budget: int, size: int = ZOHO_MAX_RECORDS) -> list[list[str]]:
+    """
+    Splits ids into chunks of at most `size` whose comma-joined, URL-encoded
+    form (a comma becomes %2C) fits in `budget` characters.
+    """
+    chunks, current, length = [], [], 0
+    for record_id in ids:
+        extra = len(record_id) + (3 if current else 0)
+        if current and (len(current) >= size or length + extra > budget):
+            chunks.append(current)
+            current, length, extra = [], 0, len(record_id)
+        current.append(record_id)
+        length += extra
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def run_chunks(
+    items: list,
+    send: Callable[[list], Awaitable[httpx.Response]],
+    ok_statuses: tuple[int, ...],
+    concurrency: int,
+    chunk_size: int = ZOHO_MAX_RECORDS,
+) -> ChunkedResult:
+    """
+    Split `items` into chunks, send them concurrently (at most `concurrency`
+    in flight) and merge the per-record `data` entries back in input order.
+
+    A chunk that fails as a whole (HTTP error or transport exception) only
+    marks its own records as failed; the other chunks are unaffected.
+    """
+    chunks = chunked(items, chunk_size)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(chunk: list):
+        async with semaphore:
+            try:
+                return await send(chunk), None
+            except Exception as ex:
+                return None, ex
+
+    outcomes = await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+    result = ChunkedResult(chunks=len(chunks))
+    for index, (chunk, (response, exc)) in enumerate(zip(chunks, outcomes)):
+        if exc is None and response.status_code in ok_statuses:
+            entries = loads(response.content).get("data") or []
+            # Zoho answers with one entry per record, in request order.
+            entries += [{"status": "error", "code": None, "message": "No result returned for record"}] * (len(chunk) - len(entries))
+            result.data.extend(entries[:len(chunk)])
+            continue
+
+        code = response.status_code if exc is None else None
+        message = response.text if exc is None else f"{type(exc).__name__}: {exc}"
+        result.errors.append({
+            "chunk": index,
+            "offset": index * chunk_size,
+            "count": len(chunk),
+            "code": code,
+            "message": message,
+        })
+        result.data.extend(
+            {"status": "error", "code": code, "message": f"Chunk {index} failed", "details": {}}
+            for _ in chunk
+        )
+    return result
@@ -0,0 +1,164 @@
+from typing import Awaitable, Callable
+import asyncio
+import csv
+import io
+import os
+import re
+import time
+import zipfile
+
+import httpx
+
+from zoho_mcp.config import ZohoConfig
+from zoho_mcp.jsonlib import dumps, loads
+from zoho_mcp.scheduler import PRIORITY_BULK
+
+# Job states of the Bulk Read / Bulk Write APIs
+JOB_DONE_STATES = ("COMPLETED", "FAILED")
+
+# Rows converted per batch when a CSV result is written as NDJSON
+ROW_BATCH = 1000
+
+
+def bulk_api_url(config: ZohoConfig) -> str:
+    """https://www.zohoapis.eu/crm/v2 -> https://www.zohoapis.eu/crm/bulk/v2"""
+    if config.bulk_api_url:
+        return config.bulk_api_url.rstrip("/")
+    return re.sub(r"/crm/v[\d.]+/?$", "", config.base_url.rstrip("/")) + "/crm/bulk/v2"
+
+
+def absolute_url(config: ZohoConfig, url: str) -> str:
+    """Bulk API download links are paths on the API domain"""
+    return str(httpx.URL(config.base_url).join(url))
+
+
+async def submit_read_job(
+    client,
+    module: str,
+    fields: list[str] | None = None,
+    criteria: dict | None = None,
+    page: int = 1,
+    file_type: str = "csv",
+) -> tuple[str | None, httpx.Response]:
+    """Creates a bulk read job; returns (job_id, response), job_id is None on failure"""
+    query = {"module": module, "page": page}
+    if fields:
+        query["fields"] = fields
+    if criteria:
+        query["criteria"] = criteria
+    response = await client.post(
+        bulk_api_url(client.config) + "/read",
+        json={"query": query, "file_type": file_type},
+        priority=PRIORITY_BULK,
+    )
+    if response.status_code not in (200, 201):
+        return None, response
+    entry = (loads(response.content).get("data") or [{}])[0]
+    return (entry.get("details") or {}).get("id"), response
+
+
+async def wait_for_job(
+    client,
+    job_url: str,
+    interval: float,
+    timeout: float,
+    on_poll: Callable[[dict, float], Awaitable] | None = None,
+    max_interval: float = 30.0,
+    state_key: str = "state",
+) -> tuple[dict | None, httpx.Response | str | None]:
+    """
+    Polls a bulk job until it is COMPLETED or FAILED. The poll interval
+    grows by 1.5x per poll up to `max_interval`, so long jobs cost few
+    API calls while short ones finish quickly.
+
+    Bulk Read wraps the job in `data` and calls the field `state`; Bulk
+    Write returns the job itself with a `status` field (state_key="status").
+
+    Returns (job, None) when the job is done, (None, response) when a poll
+    failed, or (job, "timeout") when it did not finish within `timeout`.
+    """
+    started = time.monotonic()
+    while True:
+        response = await client.get(job_url, priority=PRIORITY_BULK)
+        if response.status_code != 200:
+            return None, response
+        body = loads(response.content)
+        job = (body.get("data") or [{}])[0] if "data" in body else body
+        elapsed = time.monotonic() - started
+        if on_poll is not None:
+            await on_poll(job, elapsed)
+        if job.get(state_key) in JOB_DONE_STATES:
+            return job, None
+        if elapsed + interval > timeout:
+            return job, "timeout"
+        await asyncio.sleep(interval)
+        interval = min(max_interval, interval * 1.5)
+
+
+async def download_result(client, download_url: str, file_path: str, fmt: str, append: bool = False) -> tuple[int, httpx.Response | None]:
+    """
+    Streams a finished job's ZIP to disk next to `file_path`, then streams
+    its CSV into `file_path`. Returns (rows, None) or (0, failed_response).
+    """
+    zip_path = download_path(file_path)
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    try:
+        response = await client.get(absolute_url(client.config, download_url), stream_to=zip_path, priority=PRIORITY_BULK)
+        if response.status_code != 200:
+            return 0, response
+        return await asyncio.to_thread(extract_csv, zip_path, file_path, fmt, append), None
+    finally:
+        remove_quietly(zip_path)
+
+
+def extract_csv(zip_path: str, out_path: str, fmt: str, append: bool = False) -> int:
+    """
+    Streams the CSV inside a bulk result ZIP into `out_path` as CSV or
+    NDJSON and returns the number of rows. The archive is decompressed on
+    the fly, so memory use does not depend on the result size. With
+    `append` the CSV header is skipped (later pages of the same export).
+    """
+    rows = 0
+    with zipfile.ZipFile(zip_path) as archive:
+        name = next(item for item in archive.namelist() if item.lower().endswith(".csv"))
+        with archive.open(name) as raw, open(out_path, "a" if append else "w", encoding="utf-8", newline="") as out:
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+            if fmt == "csv":
+                header = text.readline()
+                if not append:
+                    out.write(header)
+                # Count records with the csv module so quoted newlines are not miscounted.
+                reader = csv.reader(_tee(text, out))
+                rows = sum(1 for _ in reader)
+                return rows
+
+            batch = []
+            for record in csv.DictReader(text):
+                batch.append(dumps(record).decode())
+                if len(batch) >= ROW_BATCH:
+                    out.write("\n".join(batch) + "\n")
+                    rows += len(batch)
+                    batch = []
+            if batch:
+                out.write("\n".join(batch) + "\n")
+                rows += len(batch)
+    return rows
+
+
+def _tee(lines, out):
+    """Yields the lines of `lines` while copying them to `out` unchanged"""
+    for line in lines:
+        out.write(line)
+        yield line
+
+
+def download_path(file_path: str) -> str:
+    """Temporary location of the downloaded ZIP next to the output file"""
+    return file_path + ".part.zip"
+
+
+def remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
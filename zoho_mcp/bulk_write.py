@@ -0,0 +1,215 @@
+from dataclasses import dataclass, field
+import csv
+import io
+import os
+import zipfile
+
+import httpx
+
+from zoho_mcp.bulk_read import bulk_api_url
+from zoho_mcp.config import ZohoConfig
+from zoho_mcp.jsonlib import dumps, loads
+from zoho_mcp.scheduler import PRIORITY_BULK
+
+IMPORT_FORMATS = ("csv", "ndjson")
+WRITE_OPERATIONS = ("insert", "update", "upsert")
+
+# Zoho accepts up to 25,000 records per Bulk Write file
+BULK_WRITE_MAX_ROWS = 25000
+
+# Failed rows echoed in the tool response; all of them go to the results file
+MAX_FAILURE_SAMPLES = 20
+
+
+def upload_url(config: ZohoConfig) -> str:
+    """https://www.zohoapis.eu/crm/v2 -> https://content.zohoapis.eu/crm/v2/upload"""
+    if config.upload_url:
+        return config.upload_url
+    url = httpx.URL(config.base_url)
+    host = url.host.replace("www.zohoapis.", "content.zohoapis.", 1)
+    return str(url.copy_with(host=host, path=url.path.rstrip("/") + "/upload"))
+
+
+@dataclass
+class ImportPart:
+    """One zipped CSV of at most BULK_WRITE_MAX_ROWS rows, cut from the input file"""
+    path: str
+    first_row: int  # 1-based row number of its first record in the input
+    rows: int = 0
+
+
+@dataclass
+class ImportSummary:
+    counts: dict = field(default_factory=dict)
+    failures: list = field(default_factory=list)
+    rows: int = 0
+
+    def add(self, row: int, status: str, record_id: str | None, errors: str | None, out: csv.writer):
+        self.rows += 1
+        self.counts[status.lower()] = self.counts.get(status.lower(), 0) + 1
+        out.writerow([row, status, record_id or "", errors or ""])
+        if status not in ("ADDED", "UPDATED") and len(self.failures) < MAX_FAILURE_SAMPLES:
+            self.failures.append({"row": row, "status": status, "errors": errors})
+
+    @property
+    def failed(self) -> int:
+        return self.rows - self.counts.get("added", 0) - self.counts.get("updated", 0)
+
+
+def csv_value(value) -> str:
+    """Lookups are written as their id, other nested values as JSON"""
+    if isinstance(value, dict):
+        return value.get("id") or dumps(value).decode()
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return "" if value is None else value
+
+
+class ImportFileError(ValueError):
+    """The input file cannot be read; the message names the offending line"""
+
+
+def text_lines(source):
+    """Decoded lines of a UTF-8 file opened in binary mode, so a bad byte is reported with its line number"""
+    for number, line in enumerate(source, 1):
+        try:
+            yield line.decode("utf-8-sig" if number == 1 else "utf-8")
+        except UnicodeDecodeError as ex:
+            raise ImportFileError(f"Line {number} is not valid UTF-8 ({ex.reason} at byte {ex.start + 1})") from None
+
+
+def parse_line(line: str, number: int) -> dict:
+    """One NDJSON record"""
+    try:
+        record = loads(line)
+    except ValueError as ex:
+        raise ImportFileError(f"Line {number} is not valid JSON: {ex}") from None
+    if not isinstance(record, dict):
+        raise ImportFileError(f"Line {number} is not a JSON object")
+    return record
+
+
+def read_columns(file_path: str, fmt: str) -> list[str]:
+    """CSV header, or every key seen in an NDJSON file (one streaming pass)"""
+    with open(file_path, "rb") as source:
+        lines = text_lines(source)
+        if fmt == "csv":
+            return next(csv.reader(lines), [])
+        columns = {}
+        for number, line in enumerate(lines, 1):
+            if line.strip():
+                columns.update(dict.fromkeys(parse_line(line, number)))
+        return list(columns)
+
+
+def iter_rows(file_path: str, fmt: str, columns: list[str]):
+    with open(file_path, "rb") as source:
+        lines = text_lines(source)
+        if fmt == "csv":
+            reader = csv.reader(lines)
+            next(reader, None)
+            yield from reader
+            return
+        for number, line in enumerate(lines, 1):
+            if line.strip():
+                record = parse_line(line, number)
+                yield [csv_value(record.get(column)) for column in columns]
+
+
+def write_parts(file_path: str, fmt: str, columns: list[str], work_dir: str, max_rows: int = BULK_WRITE_MAX_ROWS) -> list[ImportPart]:
+    """
+    Streams the input into zipped CSV parts of at most `max_rows` rows.
+    Rows go straight from the reader into the compressed archive, so only
+    one row is held in memory at a time. Raises ImportFileError on a line
+    that is not valid UTF-8 (or, in NDJSON, not a JSON object).
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    parts = []
+    archive = writer = entry = None
+    try:
+        for row in iter_rows(file_path, fmt, columns):
+            if writer is None or parts[-1].rows >= max_rows:
+                if archive is not None:
+                    entry.close()
+                    archive.close()
+                first_row = parts[-1].first_row + parts[-1].rows if parts else 1
+                part = ImportPart(path=os.path.join(work_dir, f"part-{len(parts) + 1}.zip"), first_row=first_row)
+                parts.append(part)
+                archive = zipfile.ZipFile(part.path, "w", zipfile.ZIP_DEFLATED)
+                entry = io.TextIOWrapper(archive.open(f"part-{len(parts)}.csv", "w"), encoding="utf-8", newline="")
+                writer = csv.writer(entry)
+                writer.writerow(columns)
+            writer.writerow(row)
+            parts[-1].rows += 1
+    finally:
+        if archive is not None:
+            entry.close()
+            archive.close()
+    return parts
+
+
+async def upload_part(client, part: ImportPart) -> tuple[str | None, httpx.Response]:
+    """Uploads a zipped part to the content domain; returns (file_id, response)"""
+    # A part is capped at BULK_WRITE_MAX_ROWS, and bytes (unlike a file object)
+    # can be sent again when the scheduler retries a 429.
+    with open(part.path, "rb") as file:
+        content = file.read()
+    headers = {"Content-Type": None, "feature": "bulk-write"}
+    if client.config.org_id:
+        headers["X-CRM-ORG"] = client.config.org_id
+    response = await client.post(
+        upload_url(client.config),
+        files={"file": (os.path.basename(part.path), content, "application/zip")},
+        headers=headers,
+        priority=PRIORITY_BULK,
+    )
+    if response.status_code not in (200, 201):
+        return None, response
+    return (loads(response.content).get("details") or {}).get("file_id"), response
+
+
+async def create_write_job(
+    client,
+    module: str,
+    file_id: str,
+    columns: list[str],
+    operation: str,
+    find_by: str | None = None,
+) -> tuple[str | None, httpx.Response]:
+    resource = {
+        "type": "data",
+        "module": module,
+        "file_id": file_id,
+        "field_mappings": [{"api_name": column, "index": index} for index, column in enumerate(columns)],
+    }
+    if find_by:
+        resource["find_by"] = find_by
+    response = await client.post(
+        bulk_api_url(client.config) + "/write",
+        json={"operation": operation, "resource": [resource]},
+        priority=PRIORITY_BULK,
+    )
+    if response.status_code not in (200, 201):
+        return None, response
+    return (loads(response.content).get("details") or {}).get("id"), response
+
+
+def summarize_results(zip_path: str, first_row: int, summary: ImportSummary, out: csv.writer) -> list[str]:
+    """
+    Streams the per-row result CSV of a finished job (the input columns
+    plus STATUS, ERRORS and the record id) into `summary` and the results
+    file writer. Row numbers refer to the original input file.
+    Returns the ids of the records the job updated.
+    """
+    updated = []
+    with zipfile.ZipFile(zip_path) as archive:
+        name = next(item for item in archive.namelist() if item.lower().endswith(".csv"))
+        with archive.open(name) as raw:
+            reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+            for offset, row in enumerate(reader):
+                status = row.get("STATUS") or "UNKNOWN"
+                record_id = row.get("RECORD_ID") or row.get("ID")
+                summary.add(first_row + offset, status, record_id, row.get("ERRORS"), out)
+                if status == "UPDATED" and record_id:
+                    updated.append(record_id)
+    return updated
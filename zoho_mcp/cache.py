@@ -0,0 +1,215 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from typing import Any, Callable
+import time
+
+import httpx
+
+from zoho_mcp.config import get_zoho_config
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0  # stale entries confirmed by a 304 Not Modified
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses + self.revalidated
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "hit_rate": round((self.hits + self.revalidated) / lookups, 3) if lookups else None,
+        }
+
+
+@dataclass
+class MetadataCache:
+    """
+    TTL cache for slow-changing metadata endpoints (/settings/modules,
+    /settings/fields).
+
+    Entries live for the TTL configured for their endpoint. Once stale they
+    are revalidated with If-None-Match / If-Modified-Since, so an unchanged
+    layout costs a 304 with an empty body instead of the full payload. When
+    Zoho sends no Last-Modified, the time of our own fetch is used instead.
+    Only the parsed value is kept, so a hit does no JSON decoding.
+    """
+
+    ttls: dict[str, float]
+    entries: dict[tuple, CacheEntry] = field(default_factory=dict)
+    stats: dict[str, CacheStats] = field(default_factory=dict)
+
+    async def fetch(
+        self,
+        client,
+        endpoint: str,
+        path: str,
+        parse: Callable[[httpx.Response], Any],
+        params: dict | None = None,
+    ) -> tuple[Any, httpx.Response | None]:
+        """
+        Returns (value, None) on success or (None, response) with the failed
+        upstream response, mirroring how tools report errors.
+        """
+        stats = self.stats.setdefault(endpoint, CacheStats())
+        key = (endpoint, path, tuple(sorted((params or {}).items())))
+        entry = self.entries.get(key)
+        now = time.time()
+
+        if entry is not None and now < entry.expires_at:
+            stats.hits += 1
+            return entry.value, None
+
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = await client.get(path, params=params, headers=headers)
+        ttl = self.ttls.get(endpoint, 0)
+
+        if response.status_code == 304 and entry is not None:
+            stats.revalidated += 1
+            entry.expires_at = time.time() + ttl
+            return entry.value, None
+
+        if response.status_code != 200:
+            return None, response
+
+        stats.misses += 1
+        value = parse(response)
+        self.entries[key] = CacheEntry(
+            value=value,
+            expires_at=time.time() + ttl,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified") or formatdate(now, usegmt=True),
+        )
+        return value, None
+
+    def invalidate(self, endpoint: str | None = None):
+        if endpoint is None:
+            self.entries.clear()
+        else:
+            self.entries = {k: v for k, v in self.entries.items() if k[0] != endpoint}
+
+    def stats_dict(self) -> dict:
+        return {
+            endpoint: {**stats.as_dict(), "ttl_seconds": self.ttls.get(endpoint, 0)}
+            for endpoint, stats in self.stats.items()
+        }
+
+
+@dataclass
+class RecordCache:
+    """
+    Bounded LRU cache of single records keyed by (module, record_id).
+
+    Entries expire after `ttl` seconds; when the cache is full the least
+    recently used record is evicted. Write tools invalidate the ids they
+    touch (or the whole module), so a read after a write always goes to
+    Zoho. A read takes generation() before its GET and passes it to put():
+    if a write invalidated the record in between, the pre-write record the
+    GET returned is not cached.
+    """
+
+    max_entries: int
+    ttl: float
+    entries: OrderedDict = field(default_factory=OrderedDict)
+    stats: CacheStats = field(default_factory=CacheStats)
+    # Invalidation counters per (module, record_id) and per module
+    generations: dict = field(default_factory=dict)
+    module_generations: dict = field(default_factory=dict)
+    epoch: int = 0
+
+    def get(self, module: str, record_id: str):
+        key = (module, str(record_id))
+        entry = self.entries.get(key)
+        if entry is None or time.time() >= entry.expires_at:
+            if entry is not None:
+                del self.entries[key]
+            self.stats.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def generation(self, module: str, record_id: str) -> tuple:
+        return self.epoch, self.module_generations.get(module, 0), self.generations.get((module, str(record_id)), 0)
+
+    def put(self, module: str, record_id: str, record: dict, generation: tuple):
+        """Caches `record` unless it was invalidated since `generation` was taken"""
+        if self.max_entries <= 0 or self.ttl <= 0 or generation != self.generation(module, record_id):
+            return
+        key = (module, str(record_id))
+        self.entries[key] = CacheEntry(value=record, expires_at=time.time() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, module: str, record_ids):
+        for record_id in record_ids:
+            key = (module, str(record_id))
+            self.entries.pop(key, None)
+            self.generations[key] = self.generations.get(key, 0) + 1
+        if len(self.generations) > max(self.max_entries, 1000) * 4:
+            # Forgetting the counters would let an older generation match again; a new
+            # epoch makes every generation taken so far stale instead.
+            self.generations.clear()
+            self.epoch += 1
+
+    def invalidate_module(self, module: str):
+        """Drops every cached record of `module` (writes whose ids are not known)"""
+        for key in [key for key in self.entries if key[0] == module]:
+            del self.entries[key]
+        self.module_generations[module] = self.module_generations.get(module, 0) + 1
+
+    def stats_dict(self) -> dict:
+        return {
+            **self.stats.as_dict(),
+            "size": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+        }
+
+
+_metadata_cache: MetadataCache | None = None
+
+def get_metadata_cache() -> MetadataCache:
+    global _metadata_cache
+    if _metadata_cache is None:
+        config = get_zoho_config()
+        _metadata_cache = MetadataCache(ttls={
+            "modules": config.modules_cache_ttl,
+            "fields": config.fields_cache_ttl,
+        })
+    return _metadata_cache
+
+
+_record_cache: RecordCache | None = None
+
+def get_record_cache() -> RecordCache:
+    global _record_cache
+    if _record_cache is None:
+        config = get_zoho_config()
+        _record_cache = RecordCache(max_entries=config.record_cache_size, ttl=config.record_cache_ttl)
+    return _record_cache
+
+
+def reset_caches():
+    """Drops both caches; they are rebuilt from the current config on next use"""
+    global _metadata_cache, _record_cache
+    _metadata_cache = None
+    _record_cache = None
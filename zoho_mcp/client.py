@@ -0,0 +1,296 @@
+import asyncio
+import time
+
+import httpx
+
+from zoho_mcp.auth import TokenManager
+from zoho_mcp.coalesce import RequestCoalescer, request_key
+from zoho_mcp.config import ZohoConfig, get_zoho_config
+from zoho_mcp.jsonlib import dumps, loads
+from zoho_mcp.metrics import get_metrics
+from zoho_mcp.resilience import CircuitBreaker, CircuitOpenError, endpoint_kind, error_response, hedged
+from zoho_mcp.scheduler import PRIORITY_INTERACTIVE, CreditBudgetExceeded, RequestScheduler
+
+# Chunk size for responses streamed to disk
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# POSTs that only read (they do not move the write epoch used for coalescing)
+READ_ONLY_PATHS = ("/coql",)
+
+# How long a client replaced by reload_config keeps serving calls already in progress (seconds)
+RETIRED_CLIENT_GRACE = 120.0
+
+
+def is_invalid_token(response: httpx.Response) -> bool:
+    """Zoho answers 401 with code INVALID_TOKEN when the access token was revoked or expired"""
+    if response.status_code != 401:
+        return False
+    try:
+        return loads(response.content).get("code") == "INVALID_TOKEN"
+    except ValueError:
+        return False
+
+
+class ZohoClient:
+    """
+    Shared async HTTP client for all Zoho CRM calls.
+
+    Keeps one httpx.AsyncClient with a keep-alive connection pool, so repeated
+    tool calls reuse the TCP/TLS connection instead of paying a new handshake
+    every time, and concurrent tool calls do not block the event loop.
+    The auth headers are only rebuilt when the access token changes.
+    """
+
+    def __init__(self, config: ZohoConfig):
+        self.config = config
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.http_pool_size,
+                max_keepalive_connections=config.http_pool_size,
+            ),
+            timeout=httpx.Timeout(config.read_timeout, connect=config.connect_timeout),
+        )
+        self.tokens = TokenManager(config, self.http)
+        self.scheduler = RequestScheduler(
+            rate=config.rate_limit,
+            burst=config.rate_burst,
+            max_concurrency=config.max_concurrent_requests,
+            max_retries=config.max_retries,
+            credit_budget=config.daily_credit_budget,
+        )
+        self.breaker = CircuitBreaker(config.breaker_threshold, config.breaker_cooldown)
+        self.timeouts = {
+            kind: httpx.Timeout(read, connect=connect)
+            for kind, (connect, read) in config.endpoint_timeouts.items()
+        }
+        self.hedges = 0
+        self.coalescer = RequestCoalescer() if config.coalesce_requests else None
+        # Answers depend on the org and the credentials they were fetched with.
+        self.scope = (config.base_url, config.client_id, config.org_id)
+        # Completed writes; GETs sent before and after a write never share an answer
+        self.write_epoch = 0
+        self._auth_token = None
+        self._headers = {}
+
+    def _auth_headers(self, access_token: str) -> dict:
+        """Заголовки авторизации пересобираются только при смене токена"""
+        if access_token != self._auth_token:
+            self._headers = {
+                "Authorization": f"Zoho-oauthtoken {access_token}",
+                "Content-Type": "application/json",
+            }
+            self._auth_token = access_token
+        return self._headers
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        priority: int = PRIORITY_INTERACTIVE,
+        hedge: bool = False,
+        stream_to: str | None = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request to the CRM API. `path` is relative to base_url
+        (e.g. '/Leads' or '/settings/fields'); absolute URLs are used as is
+        (Bulk API, file downloads).
+
+        With `stream_to` a 200 response body is written to that file in
+        chunks instead of being held in memory.
+
+        Every call is admitted by the scheduler (rate limit, concurrency cap,
+        priority, 429 retries). A 401 INVALID_TOKEN response is retried once
+        with a freshly refreshed token.
+
+        Timeouts come from the endpoint kind (see ZOHO_ENDPOINT_TIMEOUTS).
+        With `hedge=True` (idempotent GETs only) and ZOHO_HEDGE_DELAY_MS set,
+        a second copy is sent if the first is slower than the hedge delay.
+        Failures that never got an answer from Zoho - open circuit breaker,
+        exhausted credit budget, timeouts, connection errors - come back as
+        synthetic JSON error responses (503/429/504/502) instead of raising.
+        Latency, status code and API credit headers are recorded in metrics.
+        A `json=` body is encoded once with zoho_mcp.jsonlib (orjson when
+        installed) and the same bytes are reused by retries and hedges.
+
+        Concurrent identical GETs (same URL, params, headers, credentials,
+        priority, hedging and timeout) share one upstream call and its
+        response object, so parse it with jsonlib.parse_body() to decode it
+        once (see ZOHO_COALESCE_REQUESTS). Every completed write (any method
+        but GET, except COQL queries) bumps the write epoch that is part of
+        the key, so a GET sent after a write never joins one sent before it.
+        """
+        extra_headers = kwargs.pop("headers", None) or {}
+        if "json" in kwargs:
+            kwargs["content"] = dumps(kwargs.pop("json"))
+        url = path if path.startswith(("http://", "https://")) else self.config.base_url + path
+        kind = endpoint_kind(method, path)
+        timeout = self.timeouts.get(kind)
+        if timeout is not None:
+            kwargs.setdefault("timeout", timeout)
+
+        metrics = get_metrics()
+
+        async def send_once(access_token: str) -> httpx.Response:
+            headers = self._merge_headers(access_token, extra_headers)
+            metrics.upstream_in_flight += 1
+            try:
+                if stream_to is None:
+                    response = await self.http.request(method, url, headers=headers, **kwargs)
+                else:
+                    async with self.http.stream(method, url, headers=headers, **kwargs) as response:
+                        if response.status_code == 200:
+                            with open(stream_to, "wb") as file:
+                                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                                    file.write(chunk)
+                        else:
+                            await response.aread()
+            finally:
+                metrics.upstream_in_flight -= 1
+            metrics.observe_credits(response.headers)
+            return response
+
+        async def send() -> httpx.Response:
+            access_token = await self.tokens.get_token()
+            response = await send_once(access_token)
+
+            if is_invalid_token(response):
+                access_token = await self.tokens.refresh(stale_token=access_token)
+                response = await send_once(access_token)
+            return response
+
+        async def scheduled() -> httpx.Response:
+            return await self.scheduler.run(send, priority)
+
+        async def call() -> httpx.Response:
+            started = time.perf_counter()
+            response = await self._send(method, url, hedge, scheduled)
+            metrics.observe_upstream(kind, method, response.status_code, time.perf_counter() - started)
+            return response
+
+        if method != "GET" and path not in READ_ONLY_PATHS:
+            try:
+                return await call()
+            finally:
+                # Writes can touch other modules (notes, conversions), so one epoch covers all.
+                self.write_epoch += 1
+        if self.coalescer is None or method != "GET" or stream_to is not None:
+            return await call()
+        options = (priority, hedge, repr(kwargs.get("timeout")), self.write_epoch)
+        key = request_key(method, url, kwargs.get("params"), extra_headers, self.scope, options)
+        response, joined = await self.coalescer.run(key, call)
+        if joined:
+            metrics.observe_coalesced(kind)
+        return response
+
+    async def _send(self, method: str, url: str, hedge: bool, scheduled) -> httpx.Response:
+        """Circuit breaker, hedging and failure mapping around one scheduled call"""
+        try:
+            self.breaker.check()
+        except CircuitOpenError as ex:
+            return error_response(method, url, 503, "CIRCUIT_OPEN", str(ex), retry_after=round(ex.retry_after, 2))
+
+        try:
+            if hedge and method == "GET" and self.config.hedge_delay > 0:
+                response, hedge_sent = await hedged(scheduled, self.config.hedge_delay)
+                self.hedges += hedge_sent
+            else:
+                response = await scheduled()
+        except CreditBudgetExceeded as ex:
+            self.breaker.release()
+            return error_response(method, url, 429, "CREDIT_BUDGET_EXCEEDED", str(ex))
+        except httpx.TimeoutException as ex:
+            self.breaker.record(False)
+            return error_response(method, url, 504, "UPSTREAM_TIMEOUT", f"Zoho did not answer in time ({type(ex).__name__})")
+        except httpx.TransportError as ex:
+            self.breaker.record(False)
+            return error_response(method, url, 502, "UPSTREAM_UNAVAILABLE", f"{type(ex).__name__}: {ex}")
+        except BaseException:
+            self.breaker.release()
+            raise
+
+        self.breaker.record(response.status_code < 500)
+        return response
+
+    def resilience_status(self) -> dict:
+        return {
+            "circuit_breaker": self.breaker.status(),
+            "hedge_delay_ms": round(self.config.hedge_delay * 1000) or None,
+            "hedged_requests": self.hedges,
+            "coalescing": self.coalescer.status() if self.coalescer is not None else None,
+        }
+
+    def _merge_headers(self, access_token: str, extra_headers: dict) -> dict:
+        """A None value in extra_headers drops that default header (e.g. Content-Type for uploads)"""
+        headers = self._auth_headers(access_token)
+        if not extra_headers:
+            return headers
+        merged = {**headers, **extra_headers}
+        return {name: value for name, value in merged.items() if value is not None}
+
+    async def get(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", path, **kwargs)
+
+    async def aclose(self):
+        self.tokens.close()
+        await self.http.aclose()
+
+
+_client: ZohoClient | None = None
+
+def get_client() -> ZohoClient:
+    """Returns the process-wide client, creating it on first use"""
+    global _client
+    if _client is None:
+        _client = ZohoClient(get_zoho_config())
+    return _client
+
+_retired: set[asyncio.Task] = set()
+
+async def _close_later(client: ZohoClient, delay: float):
+    try:
+        await asyncio.sleep(delay)
+    finally:
+        await client.aclose()
+
+def replace_client(identity_changed: bool = False) -> ZohoClient:
+    """
+    Builds a new process-wide client from the current config. The old one
+    is closed after RETIRED_CLIENT_GRACE seconds so calls already holding
+    it can finish; new calls get the new client from get_client().
+
+    The proactive token refresh moves to the new client right away. With
+    `identity_changed` (other org or credentials) the old client refreshes
+    only for itself, so its calls cannot overwrite the new token.
+    """
+    global _client
+    old, _client = _client, ZohoClient(get_zoho_config())
+    if old is not None:
+        if identity_changed:
+            old.tokens.retire()
+        else:
+            old.tokens.close()
+        task = asyncio.create_task(_close_later(old, RETIRED_CLIENT_GRACE))
+        _retired.add(task)
+        task.add_done_callback(_retired.discard)
+    _client.tokens.resume()
+    return _client
+
+async def close_client():
+    global _client
+    retired = list(_retired)
+    for task in retired:
+        task.cancel()
+    await asyncio.gather(*retired, return_exceptions=True)
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -0,0 +1,61 @@
+from typing import Awaitable, Callable, Hashable, TypeVar
+import asyncio
+
+import httpx
+
+T = TypeVar("T")
+
+
+def request_key(method: str, url: str, params, headers: dict, scope: Hashable, options: Hashable = ()) -> tuple:
+    """
+    Identity of a request for coalescing: method, URL, query parameters in
+    canonical order, extra headers (conditional headers change the answer),
+    the credential scope the answer was fetched with and call options
+    (priority, hedging, timeout, write epoch) that change how or when it is sent.
+    """
+    query = tuple(sorted(httpx.QueryParams(params).multi_items())) if params else ()
+    return method, url, query, tuple(sorted(headers.items())), scope, options
+
+
+class RequestCoalescer:
+    """
+    Shares one in-flight call among concurrent identical requests.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it runs await the same task and get the same result (or
+    exception). The key is dropped as soon as the call finishes, so nothing
+    is cached: a request sent after the answer arrived goes upstream again.
+    A caller that is cancelled does not cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task] = {}
+        self._joined: set[Hashable] = set()
+        self.shared = 0
+        self.saved = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Returns (result, True if it was shared from another caller's call)"""
+        task = self._in_flight.get(key)
+        joined = task is not None
+        if joined:
+            self.saved += 1
+            if key not in self._joined:
+                self._joined.add(key)
+                self.shared += 1
+        else:
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task), joined
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+            self._joined.discard(key)
+        if not task.cancelled():
+            # Retrieved here so an error nobody awaited any more is not logged as lost.
+            task.exception()
+
+    def status(self) -> dict:
+        return {"in_flight": len(self._in_flight), "shared_calls": self.shared, "requests_saved": self.saved}
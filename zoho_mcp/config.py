@@ -1,9 +1,30 @@
-from dataclasses import dataclass
-from dotenv import load_dotenv
+from dataclasses import dataclass, field, fields
+from dotenv import dotenv_values, find_dotenv
 import os
+import tempfile
 import time
 
-load_dotenv()
+# Ключи, пришедшие из .env (а не из окружения процесса): только их обновляет reload
+_dotenv_keys: set[str] = set()
+
+def load_env_file() -> set[str]:
+    """Подгружает .env в os.environ, не перекрывая настоящие переменные окружения; возвращает измененные ключи"""
+    values = {key: value for key, value in dotenv_values(find_dotenv()).items() if value is not None}
+    changed = set()
+    for key in _dotenv_keys - values.keys():
+        os.environ.pop(key, None)
+        _dotenv_keys.discard(key)
+        changed.add(key)
+    for key, value in values.items():
+        if key in os.environ and key not in _dotenv_keys:
+            continue
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+            changed.add(key)
+        _dotenv_keys.add(key)
+    return changed
+
+load_env_file()
 
 @dataclass
 class ZohoConfig:
@@ -12,10 +33,130 @@ class ZohoConfig:
     client_id : str
     client_secret : str
     modules : list[str]
+    accounts_url : str = 'https://accounts.zoho.eu'
+    # Размер пула keep-alive соединений и таймауты HTTP клиента (в секундах)
+    http_pool_size : int = 10
+    connect_timeout : float = 5.0
+    read_timeout : float = 30.0
+    # Таймауты по типам запросов (metadata, search, coql, read, write): {тип: (connect, read)}
+    endpoint_timeouts : dict = field(default_factory=dict)
+    # Hedged GET: через сколько секунд без ответа отправить дублирующий запрос (0 - выключено)
+    hedge_delay : float = 0.0
+    # Circuit breaker: после скольких ошибок подряд перестать ходить в Zoho (0 - выключен) и на сколько секунд
+    breaker_threshold : int = 5
+    breaker_cooldown : float = 30.0
+    # Планировщик запросов: запросов в секунду (0 - без ограничения), размер всплеска,
+    # максимум одновременных запросов к org, повторы при 429, дневной бюджет API кредитов (0 - без учета)
+    rate_limit : float = 0.0
+    rate_burst : int = 20
+    max_concurrent_requests : int = 10
+    max_retries : int = 4
+    daily_credit_budget : int = 0
+    # Сколько модулей get_module_data запрашивает одновременно
+    module_concurrency : int = 4
+    # За сколько секунд до истечения токена обновлять его в фоне
+    token_refresh_margin : float = 300.0
+    # Файл для общего кеша токена между процессами (None - только в памяти)
+    token_cache_file : str | None = None
+    # Сколько чанков по 100 записей bulk-инструменты отправляют одновременно
+    bulk_concurrency : int = 4
+    # TTL (в секундах) кеша метаданных /settings/modules и /settings/fields
+    modules_cache_ttl : float = 3600.0
+    fields_cache_ttl : float = 600.0
+    # LRU кеш записей get_record_by_id: максимум записей и TTL в секундах (0 - выключен)
+    record_cache_size : int = 1000
+    record_cache_ttl : float = 60.0
+    # Каталог для файлов export_records по умолчанию
+    export_dir : str = os.path.join(tempfile.gettempdir(), 'zoho_mcp_exports')
+    # Прогревать кеш метаданных при старте сервера
+    warm_metadata : bool = False
+    # Bulk API (по умолчанию выводится из base_url) и начальный интервал опроса bulk-задач в секундах
+    bulk_api_url : str | None = None
+    bulk_poll_interval : float = 2.0
+    # Загрузка файлов для Bulk Write (по умолчанию content.zohoapis.* из base_url) и ID организации для X-CRM-ORG
+    upload_url : str | None = None
+    org_id : str | None = None
+    # Локальное SQLite зеркало модулей (None - выключено) и период фоновой синхронизации в секундах (0 - только вручную)
+    mirror_db : str | None = None
+    mirror_interval : float = 300.0
+    # Журнал отложенной записи create_lead_from_form (None - писать сразу) и максимальная задержка пакета в секундах
+    write_queue_db : str | None = None
+    write_queue_interval : float = 2.0
+    # HTTP endpoint с метриками в формате OpenMetrics (0 - выключен)
+    metrics_port : int = 0
+    metrics_host : str = '127.0.0.1'
+    # Одинаковые одновременные GET запросы делят один запрос к Zoho
+    coalesce_requests : bool = True
+    # Ответы get_module_data / search_records больше этого размера (КБ JSON) сохраняются на сервере
+    # и возвращаются сводкой с handle (0 - всегда целиком)
+    result_inline_kb : int = 64
+    # Хранилище результатов: бюджет памяти и диска (МБ), каталог для вытесненных результатов, время жизни handle (сек)
+    result_memory_mb : int = 64
+    result_disk_mb : int = 512
+    result_spill_dir : str = os.path.join(tempfile.gettempdir(), 'zoho_mcp_results')
+    result_ttl : float = 3600.0
+
+
+def parse_endpoint_timeouts(value: str | None) -> dict[str, tuple[float, float]]:
+    """Разбирает ZOHO_ENDPOINT_TIMEOUTS вида "search=3:15,metadata=3:10,write=5:60" (тип=connect:read)"""
+    timeouts = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        name, _, pair = item.partition('=')
+        connect, _, read = pair.partition(':')
+        timeouts[name.strip()] = (float(connect), float(read or connect))
+    return timeouts
+
+
+def env_value(name: str, parse, default=None):
+    """Значение переменной окружения, разобранное parse; пустая или отсутствующая - default"""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return parse(raw.strip())
+    except ValueError as ex:
+        raise ValueError(f"{name}={raw!r}: {ex}") from None
+
+
+def env_int(name: str, default: int) -> int:
+    return env_value(name, int, default)
+
+
+def env_float(name: str, default: float) -> float:
+    return env_value(name, float, default)
 
 
+# Числовые поля, которые должны быть больше нуля, и поля, где 0 означает "выключено"
+POSITIVE_FIELDS = (
+    "http_pool_size", "connect_timeout", "read_timeout", "rate_burst", "max_concurrent_requests",
+    "module_concurrency", "bulk_concurrency", "bulk_poll_interval", "write_queue_interval",
+)
+NON_NEGATIVE_FIELDS = (
+    "hedge_delay", "breaker_threshold", "breaker_cooldown", "rate_limit", "max_retries", "daily_credit_budget",
+    "token_refresh_margin", "modules_cache_ttl", "fields_cache_ttl", "record_cache_size", "record_cache_ttl",
+    "mirror_interval", "result_inline_kb", "result_memory_mb", "result_disk_mb", "result_ttl",
+)
 
-def get_zoho_config():
+
+def validate_config(config: ZohoConfig):
+    """Проверяет значения один раз при загрузке, чтобы ошибка была видна при старте, а не в первом запросе"""
+    errors = []
+    if not config.base_url.startswith(("http://", "https://")):
+        errors.append(f"base_url must be an http(s) URL, got {config.base_url!r}")
+    if not config.accounts_url.startswith(("http://", "https://")):
+        errors.append(f"accounts_url must be an http(s) URL, got {config.accounts_url!r}")
+    errors += [f"{name} must be > 0, got {getattr(config, name)}" for name in POSITIVE_FIELDS if getattr(config, name) <= 0]
+    errors += [f"{name} must be >= 0, got {getattr(config, name)}" for name in NON_NEGATIVE_FIELDS if getattr(config, name) < 0]
+    if not 0 <= config.metrics_port <= 65535:
+        errors.append(f"metrics_port must be 0-65535, got {config.metrics_port}")
+    if errors:
+        raise ValueError("Invalid Zoho MCP configuration: " + "; ".join(errors))
+
+
+def load_zoho_config() -> ZohoConfig:
+    """Читает конфигурацию из окружения и проверяет ее; ошибки - ValueError с именем переменной"""
     zoho_config = ZohoConfig(
         base_url=os.getenv('ZOHO_BASE_API_URL','https://www.zohoapis.eu/crm/v2'),
         refresh_token=os.getenv('ZOHO_REFRESH_TOKEN'),
@@ -26,16 +167,79 @@ def get_zoho_config():
             "Accounts", 
             "Contacts",
             "Deals"
-        ]
-
+        ],
+        accounts_url=os.getenv('ZOHO_ACCOUNTS_URL', 'https://accounts.zoho.eu'),
+        http_pool_size=env_int('ZOHO_HTTP_POOL_SIZE', 10),
+        connect_timeout=env_float('ZOHO_CONNECT_TIMEOUT', 5),
+        read_timeout=env_float('ZOHO_READ_TIMEOUT', 30),
+        endpoint_timeouts=env_value('ZOHO_ENDPOINT_TIMEOUTS', parse_endpoint_timeouts, {}),
+        hedge_delay=env_float('ZOHO_HEDGE_DELAY_MS', 0) / 1000,
+        breaker_threshold=env_int('ZOHO_BREAKER_THRESHOLD', 5),
+        breaker_cooldown=env_float('ZOHO_BREAKER_COOLDOWN', 30),
+        rate_limit=env_float('ZOHO_RATE_LIMIT', 0),
+        rate_burst=env_int('ZOHO_RATE_BURST', 20),
+        max_concurrent_requests=env_int('ZOHO_MAX_CONCURRENT_REQUESTS', 10),
+        max_retries=env_int('ZOHO_MAX_RETRIES', 4),
+        daily_credit_budget=env_int('ZOHO_DAILY_CREDIT_BUDGET', 0),
+        module_concurrency=env_int('ZOHO_MODULE_CONCURRENCY', 4),
+        token_refresh_margin=env_float('ZOHO_TOKEN_REFRESH_MARGIN', 300),
+        token_cache_file=os.getenv('ZOHO_TOKEN_CACHE_FILE') or None,
+        bulk_concurrency=env_int('ZOHO_BULK_CONCURRENCY', 4),
+        modules_cache_ttl=env_float('ZOHO_MODULES_CACHE_TTL', 3600),
+        fields_cache_ttl=env_float('ZOHO_FIELDS_CACHE_TTL', 600),
+        record_cache_size=env_int('ZOHO_RECORD_CACHE_SIZE', 1000),
+        record_cache_ttl=env_float('ZOHO_RECORD_CACHE_TTL', 60),
+        export_dir=os.getenv('ZOHO_EXPORT_DIR') or os.path.join(tempfile.gettempdir(), 'zoho_mcp_exports'),
+        warm_metadata=os.getenv('ZOHO_WARM_METADATA', '').lower() in ('1', 'true', 'yes'),
+        bulk_api_url=os.getenv('ZOHO_BULK_API_URL') or None,
+        bulk_poll_interval=env_float('ZOHO_BULK_POLL_INTERVAL', 2),
+        upload_url=os.getenv('ZOHO_UPLOAD_URL') or None,
+        org_id=os.getenv('ZOHO_ORG_ID') or None,
+        mirror_db=os.getenv('ZOHO_MIRROR_DB') or None,
+        mirror_interval=env_float('ZOHO_MIRROR_INTERVAL', 300),
+        write_queue_db=os.getenv('ZOHO_WRITE_QUEUE_DB') or None,
+        write_queue_interval=env_float('ZOHO_WRITE_QUEUE_INTERVAL', 2),
+        metrics_port=env_int('ZOHO_METRICS_PORT', 0),
+        metrics_host=os.getenv('ZOHO_METRICS_HOST', '127.0.0.1'),
+        coalesce_requests=os.getenv('ZOHO_COALESCE_REQUESTS', '1').lower() in ('1', 'true', 'yes'),
+        result_inline_kb=env_int('ZOHO_RESULT_INLINE_KB', 64),
+        result_memory_mb=env_int('ZOHO_RESULT_MEMORY_MB', 64),
+        result_disk_mb=env_int('ZOHO_RESULT_DISK_MB', 512),
+        result_spill_dir=os.getenv('ZOHO_RESULT_SPILL_DIR') or os.path.join(tempfile.gettempdir(), 'zoho_mcp_results'),
+        result_ttl=env_float('ZOHO_RESULT_TTL', 3600),
     )
+    validate_config(zoho_config)
     return zoho_config
 
 
+_config: ZohoConfig | None = None
+
+def get_zoho_config() -> ZohoConfig:
+    """Конфигурация процесса: читается и проверяется один раз, дальше из памяти"""
+    global _config
+    if _config is None:
+        _config = load_zoho_config()
+    return _config
+
+def reload_zoho_config() -> tuple[ZohoConfig | None, ZohoConfig]:
+    """Перечитывает .env и окружение; при ошибке текущая конфигурация остается. Возвращает (старая, новая)"""
+    global _config
+    load_env_file()
+    new_config = load_zoho_config()
+    old_config, _config = _config, new_config
+    return old_config, new_config
+
+def changed_fields(old: ZohoConfig | None, new: ZohoConfig) -> list[str]:
+    if old is None:
+        return [item.name for item in fields(new)]
+    return [item.name for item in fields(new) if getattr(old, item.name) != getattr(new, item.name)]
+
+
 @dataclass
 class AccessTokenConfig:
     access_token: str
     token_timestamp: float = 0.0  # Время получения токена в секундах
+    expires_at: float = 0.0  # Время истечения токена (из expires_in ответа OAuth)
 
 # We can specify the token here or leave the value as it is. 
 # Token will be automatically refreshed when needed.
@@ -44,17 +248,21 @@ access_token_config = AccessTokenConfig(access_token='AAA', token_timestamp=0.0)
 def get_access_token() -> str:
     return access_token_config.access_token
 
-def update_access_token(new_access_token: str) -> str:
-    """Обновляет токен и сохраняет время получения"""
+def update_access_token(new_access_token: str, expires_in: float = 3600) -> str:
+    """Обновляет токен и сохраняет время получения и истечения"""
     access_token_config.access_token = new_access_token
     access_token_config.token_timestamp = time.time()
+    access_token_config.expires_at = access_token_config.token_timestamp + expires_in
     return new_access_token
 
-def is_token_expired() -> bool:
-    """Проверяет, истек ли токен (3600 секунд = 1 час)"""
+def expire_access_token():
+    """Помечает токен истекшим, чтобы следующий запрос получил новый (например, после смены учетных данных)"""
+    access_token_config.token_timestamp = 0.0
+    access_token_config.expires_at = 0.0
+
+def is_token_expired(margin: float = 0.0) -> bool:
+    """Проверяет, истек ли токен (или истечет в ближайшие margin секунд)"""
     if access_token_config.token_timestamp == 0.0:
         return True  # Токен не был получен
     
-    current_time = time.time()
-    elapsed_time = current_time - access_token_config.token_timestamp
-    return elapsed_time >= 3600  # 1 час в секундах
\ No newline at end of file
+    return time.time() >= access_token_config.expires_at - margin
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+
+# Rows returned by one COQL call, and the deepest offset COQL serves.
+COQL_MAX_LIMIT = 200
+COQL_MAX_OFFSET = 10000
+
+AGGREGATES = ("COUNT", "SUM", "MAX", "MIN", "AVG")
+FIELD = r"[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)?"
+SELECT_ITEM = re.compile(rf"^(?:(?P<fn>{'|'.join(AGGREGATES)})\((?P<arg>{FIELD})\)|(?P<field>{FIELD}))$", re.IGNORECASE)
+ORDER_ITEM = re.compile(rf"^(?P<field>{FIELD})(?:\s+(?P<dir>asc|desc))?$", re.IGNORECASE)
+
+# Quoted string literals, with backslash escapes
+STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+
+
+class InvalidQuery(ValueError):
+    """The query is rejected before it is sent to Zoho"""
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """A validated COQL query without LIMIT; pages are produced by `page_query`"""
+    module: str
+    select: tuple[str, ...]
+    where: str
+    order_by: tuple[str, ...]
+    group_by: tuple[str, ...]
+    fields: frozenset[str]  # base field API names the query references
+    aggregate: bool
+
+    @property
+    def text(self) -> str:
+        query = f"select {', '.join(self.select)} from {self.module} where {self.where}"
+        if self.group_by:
+            query += f" group by {', '.join(self.group_by)}"
+        if self.order_by:
+            query += f" order by {', '.join(self.order_by)}"
+        return query
+
+    def page_query(self, offset: int, limit: int) -> str:
+        return f"{self.text} limit {offset}, {limit}"
+
+
+@lru_cache(maxsize=256)
+def plan_query(
+    module: str,
+    select: tuple[str, ...],
+    where: str | None = None,
+    order_by: tuple[str, ...] = (),
+    group_by: tuple[str, ...] = (),
+) -> QueryPlan:
+    """
+    Parses and normalizes the parts of a query. Plans are cached, so an
+    agent repeating a query (e.g. paging through it) does not re-parse it.
+    """
+    if not re.fullmatch(r"[A-Za-z0-9_]+", module or ""):
+        raise InvalidQuery(f"Invalid module name: {module!r}")
+    if not select:
+        raise InvalidQuery("select must list at least one field or aggregate")
+
+    fields = set()
+    items = []
+    aggregate = False
+    for item in select:
+        match = SELECT_ITEM.match(item.strip())
+        if not match:
+            raise InvalidQuery(f"Unsupported select item: {item!r}")
+        if match.group("fn"):
+            aggregate = True
+            fields.add(match.group("arg").split(".")[0])
+            items.append(f"{match.group('fn').upper()}({match.group('arg')})")
+        else:
+            fields.add(match.group("field").split(".")[0])
+            items.append(match.group("field"))
+
+    orders = []
+    for item in order_by:
+        match = ORDER_ITEM.match(item.strip())
+        if not match:
+            raise InvalidQuery(f"Unsupported order_by item: {item!r}")
+        fields.add(match.group("field").split(".")[0])
+        orders.append(f"{match.group('field')} {(match.group('dir') or 'asc').lower()}")
+
+    for item in group_by:
+        if not re.fullmatch(FIELD, item.strip()):
+            raise InvalidQuery(f"Unsupported group_by item: {item!r}")
+        fields.add(item.strip().split(".")[0])
+    if group_by and not aggregate:
+        raise InvalidQuery("group_by needs an aggregate in select")
+
+    # COQL requires a WHERE clause; match every record when none is given.
+    where = (where or "").strip() or "id is not null"
+    # Literals are skipped, so e.g. Description like '%limit%' is allowed.
+    if re.search(r"\blimit\b|;", STRING_LITERAL.sub("''", where), re.IGNORECASE):
+        raise InvalidQuery("Put paging in limit/offset, not in where")
+
+    fields.discard("id")
+    return QueryPlan(
+        module=module,
+        select=tuple(items),
+        where=where,
+        order_by=tuple(orders),
+        group_by=tuple(item.strip() for item in group_by),
+        fields=frozenset(fields),
+        aggregate=aggregate,
+    )
+
+
+def unknown_fields(plan: QueryPlan, module_fields: list[dict]) -> list[str]:
+    """Fields of the plan missing from the module layout (from get_module_fields metadata)"""
+    known = {field["api_name"] for field in module_fields}
+    return sorted(plan.fields - known)
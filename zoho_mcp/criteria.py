@@ -0,0 +1,252 @@
+import math
+import re
+
+from zoho_mcp.mirror import to_utc_iso
+
+# Operators of the Zoho search API that can be answered from the local mirror.
+LOCAL_OPERATORS = (
+    "equals", "not_equal", "starts_with", "in", "not_in",
+    "greater_than", "greater_equal", "less_than", "less_equal", "between",
+)
+
+# Fields with their own lower-cased, B-tree indexed column in the mirror.
+INDEXED_FIELDS = {"Email": "email", "Phone": "phone", "Mobile": "mobile"}
+
+FIELD_NAME = re.compile(r"^[A-Za-z0-9_]+(\.[A-Za-z0-9_]+)?$")
+COMPARISONS = {"greater_than": ">", "greater_equal": ">=", "less_than": "<", "less_equal": "<="}
+
+DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
+DATETIME_OFFSET = re.compile(r"(Z|[+-]\d{2}:?\d{2})$")
+
+
+class UnsupportedCriteria(ValueError):
+    """The criteria cannot be evaluated locally and must go to Zoho"""
+
+
+def split_unescaped(text: str, separator: str) -> list[str]:
+    """Splits on `separator` except where Zoho escapes it with a backslash, then unescapes"""
+    parts, current, escaped = [], [], False
+    for char in text:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == separator:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return parts
+
+
+def parse_criteria(text: str):
+    """
+    Parses a Zoho search criteria string such as
+    `((Email:equals:a@b.com)or(Last_Name:starts_with:Sm))` into a tree:
+    ("cond", field, operator, value) or ("and" | "or", [children]).
+    `and` binds tighter than `or`. Raises UnsupportedCriteria.
+    """
+    node, position = _parse_expression(text, 0)
+    if text[position:].strip():
+        raise UnsupportedCriteria(f"Unexpected text at position {position}")
+    return node
+
+
+def _skip_spaces(text: str, position: int) -> int:
+    while position < len(text) and text[position].isspace():
+        position += 1
+    return position
+
+
+def _parse_expression(text: str, position: int):
+    groups = [[]]
+    while True:
+        node, position = _parse_term(text, position)
+        groups[-1].append(node)
+        position = _skip_spaces(text, position)
+        match = re.match(r"(and|or)\b", text[position:], re.IGNORECASE)
+        if not match:
+            break
+        if match.group(0).lower() == "or":
+            groups.append([])
+        position = _skip_spaces(text, position + len(match.group(0)))
+
+    ands = [group[0] if len(group) == 1 else ("and", group) for group in groups]
+    return (ands[0] if len(ands) == 1 else ("or", ands)), position
+
+
+def _parse_term(text: str, position: int):
+    position = _skip_spaces(text, position)
+    if position >= len(text) or text[position] != "(":
+        raise UnsupportedCriteria(f"Expected '(' at position {position}")
+    inner = _skip_spaces(text, position + 1)
+    if inner < len(text) and text[inner] == "(":
+        node, position = _parse_expression(text, inner)
+        position = _skip_spaces(text, position)
+        if position >= len(text) or text[position] != ")":
+            raise UnsupportedCriteria(f"Expected ')' at position {position}")
+        return node, position + 1
+
+    # A single condition runs to the first unescaped ')'.
+    end, escaped = inner, False
+    while end < len(text):
+        if escaped:
+            escaped = False
+        elif text[end] == "\\":
+            escaped = True
+        elif text[end] == ")":
+            break
+        end += 1
+    if end >= len(text):
+        raise UnsupportedCriteria("Unbalanced parentheses")
+    field, operator, value = (text[inner:end].split(":", 2) + ["", ""])[:3]
+    field, operator = field.strip(), operator.strip().lower()
+    if not FIELD_NAME.match(field):
+        raise UnsupportedCriteria(f"Unsupported field name: {field!r}")
+    if operator not in LOCAL_OPERATORS:
+        raise UnsupportedCriteria(f"Operator {operator!r} is not evaluated locally")
+    return ("cond", field, operator, value), end + 1
+
+
+def _number(value: str) -> float | None:
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _utc(value: str) -> str:
+    try:
+        return to_utc_iso(value)
+    except ValueError:
+        raise UnsupportedCriteria(f"Invalid datetime: {value!r}")
+
+
+def _like(value: str) -> str:
+    """LIKE pattern for values starting with `value`, escaping % and _"""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _kind(value: str) -> str:
+    """What a criteria value compares as: bool, number, datetime (with offset), date or text"""
+    if value.lower() in ("true", "false"):
+        return "bool"
+    if _number(value) is not None:
+        return "number"
+    if DATETIME.match(value):
+        if not DATETIME_OFFSET.search(value):
+            raise UnsupportedCriteria(f"Datetime without a UTC offset: {value!r}")
+        return "datetime"
+    if DATE.match(value):
+        return "date"
+    return "text"
+
+
+def _equals(field: str, value: str) -> tuple[str, list]:
+    """
+    One value against a field whose type is unknown here: the stored JSON
+    type decides which comparison applies. Text is compared case-insensitively
+    (datetimes in UTC), booleans by JSON type, numbers numerically and
+    lookups by name or id.
+    """
+    path = "$." + field
+    kind = _kind(value)
+    if kind == "datetime":
+        parts = [("utc_iso(json_extract(data, ?)) = ?", [path, _utc(value)])]
+    else:
+        parts = [("json_type(data, ?) = 'text' AND lower(json_extract(data, ?)) = lower(?)", [path, path, value])]
+    if kind == "bool":
+        parts.append(("json_type(data, ?) = ?", [path, value.lower()]))
+    if kind == "number":
+        parts.append(("json_type(data, ?) IN ('integer', 'real') AND json_extract(data, ?) = ?", [path, path, _number(value)]))
+    if "." not in field:
+        parts.append(("lower(json_extract(data, ?)) = lower(?)", [path + ".name", value]))
+        parts.append(("json_extract(data, ?) = ?", [path + ".id", value]))
+    return " OR ".join(f"({sql})" for sql, _ in parts), [param for _, params in parts for param in params]
+
+
+def _starts_with(field: str, value: str) -> tuple[str, list]:
+    path = "$." + field
+    sql = "(json_type(data, ?) = 'text' AND lower(json_extract(data, ?)) LIKE lower(?) ESCAPE '\\')"
+    params = [path, path, _like(value)]
+    if "." not in field:
+        sql += " OR (lower(json_extract(data, ?)) LIKE lower(?) ESCAPE '\\')"
+        params += [path + ".name", _like(value)]
+    return sql, params
+
+
+def _compare(field: str, operator: str, values: list[str]) -> tuple[str, list]:
+    """Comparisons and between: numbers numerically, datetimes in UTC, dates as 'YYYY-MM-DD' text"""
+    if operator == "between" and len(values) != 2:
+        raise UnsupportedCriteria("between needs two comma-separated values")
+    kinds = {_kind(value) for value in values}
+    kind = kinds.pop() if len(kinds) == 1 else None
+    path = "$." + field
+    if field == "id" and kind == "number":
+        target, params, values = "CAST(id AS INTEGER)", [], [int(_number(value)) for value in values]
+    elif field in INDEXED_FIELDS or field == "id":
+        raise UnsupportedCriteria(f"{operator} on {field} is not evaluated locally")
+    elif kind == "number":
+        target, params = "json_type(data, ?) IN ('integer', 'real') AND json_extract(data, ?)", [path, path]
+        values = [_number(value) for value in values]
+    elif kind == "datetime":
+        target, params, values = "utc_iso(json_extract(data, ?))", [path], [_utc(value) for value in values]
+    elif kind == "date":
+        target, params = "json_type(data, ?) = 'text' AND length(json_extract(data, ?)) = 10 AND json_extract(data, ?)", [path] * 3
+    else:
+        raise UnsupportedCriteria(f"{operator} on {field} needs numbers, dates or datetimes (not mixed)")
+    if operator == "between":
+        return f"{target} BETWEEN ? AND ?", params + values
+    return f"{target} {COMPARISONS[operator]} ?", params + values[:1]
+
+
+def to_sql(node) -> tuple[str, list]:
+    """
+    Translates a parsed criteria tree into a WHERE clause over the mirror's
+    records table (which provides the utc_iso() SQL function). Raises
+    UnsupportedCriteria for conditions it cannot evaluate exactly.
+    """
+    if node[0] in ("and", "or"):
+        parts = [to_sql(child) for child in node[1]]
+        sql = f" {node[0].upper()} ".join(f"({part_sql})" for part_sql, _ in parts)
+        return sql, [param for _, params in parts for param in params]
+
+    _, field, operator, raw_value = node
+    values = [value.strip() for value in split_unescaped(raw_value, ",")]
+    value = re.sub(r"\\(.)", r"\1", raw_value)
+    if operator in COMPARISONS or operator == "between":
+        return _compare(field, operator, values)
+    if operator == "not_equal":
+        values, operator = [value], "not_in"
+    elif operator == "equals":
+        values, operator = [value], "in"
+
+    if field in INDEXED_FIELDS:
+        column = INDEXED_FIELDS[field]
+        if operator == "starts_with":
+            # A range keeps the B-tree usable; LIKE would scan the module.
+            return f"{column} >= ? AND {column} < ?", [value.lower(), value.lower() + "\U0010ffff"]
+        marks = ", ".join("lower(?)" for _ in values)
+        if operator == "not_in":
+            return f"coalesce({column}, '') NOT IN ({marks})", values
+        return f"{column} IN ({marks})", values
+    if field == "id":
+        if operator == "starts_with":
+            return "id LIKE ? ESCAPE '\\'", [_like(value)]
+        marks = ", ".join("?" for _ in values)
+        negate = "NOT " if operator == "not_in" else ""
+        return f"id {negate}IN ({marks})", values
+    if operator == "starts_with":
+        return _starts_with(field, value)
+
+    parts = [_equals(field, item) for item in values]
+    sql = " OR ".join(f"({part_sql})" for part_sql, _ in parts)
+    params = [param for _, part_params in parts for param in part_params]
+    if operator == "not_in":
+        # Records without a value do not equal anything, so not_equal / not_in keep them.
+        return f"NOT coalesce({sql}, 0)", params
+    return sql, params
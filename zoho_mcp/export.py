@@ -0,0 +1,108 @@
+from typing import Awaitable, Callable
+import asyncio
+import csv
+import os
+import time
+import uuid
+
+from zoho_mcp.jsonlib import dumps, loads
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+class RecordWriter:
+    """
+    Appends records to an NDJSON or CSV file one page at a time.
+
+    CSV columns are fixed up front: either the requested `fields` or the keys
+    of the first page. Keys that first appear later are dropped, and nested
+    values (lookups, multi-selects) are written as JSON.
+    """
+
+    def __init__(self, file_path: str, fmt: str, fields: list[str] | None = None):
+        self.file_path = file_path
+        self.format = fmt
+        self.columns = list(fields) if fields else None
+        self.rows = 0
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        self._file = open(file_path, "w", encoding="utf-8", newline="")
+        self._csv = None
+
+    def write_page(self, records: list[dict]):
+        if self.format == "ndjson":
+            for record in records:
+                self._file.write(dumps(record).decode())
+                self._file.write("\n")
+        else:
+            if self._csv is None:
+                if self.columns is None:
+                    self.columns = list(dict.fromkeys(key for record in records for key in record))
+                self._csv = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+                self._csv.writeheader()
+            for record in records:
+                self._csv.writerow({
+                    key: dumps(value).decode() if isinstance(value, (dict, list)) else value
+                    for key, value in record.items()
+                })
+        self.rows += len(records)
+
+    def close(self):
+        self._file.close()
+
+
+def default_export_path(export_dir: str, module_name: str, fmt: str) -> str:
+    """Timestamped file name; the random suffix keeps concurrent exports in the same second apart"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(export_dir, f"{module_name}-{stamp}-{uuid.uuid4().hex[:8]}.{fmt}")
+
+
+async def export_pages(
+    fetch_page: Callable[[int], Awaitable],
+    writer: RecordWriter,
+    on_page: Callable[[int, int], Awaitable] | None = None,
+    max_records: int | None = None,
+) -> tuple[int, object | None]:
+    """
+    Walk pages 1..N and stream them into `writer`.
+
+    The request for page n+1 is in flight while page n is written (the write
+    runs in a worker thread so the event loop keeps driving the prefetch), so
+    at most two pages are held in memory.
+
+    Returns (pages_fetched, failed_response_or_exception).
+    """
+    pages = 0
+    page = 1
+    next_fetch = asyncio.create_task(fetch_page(page))
+    while next_fetch is not None:
+        try:
+            response = await next_fetch
+        except Exception as ex:
+            return pages, ex
+        next_fetch = None
+
+        if response.status_code == 204:
+            break
+        if response.status_code != 200:
+            return pages, response
+
+        body = loads(response.content)
+        records = body.get("data", []) or []
+        more = body.get("info", {}).get("more_records", False)
+        if max_records is not None:
+            records = records[:max(0, max_records - writer.rows)]
+            more = more and writer.rows + len(records) < max_records
+
+        if more:
+            next_fetch = asyncio.create_task(fetch_page(page + 1))
+        try:
+            await asyncio.to_thread(writer.write_page, records)
+        except BaseException:
+            if next_fetch is not None:
+                next_fetch.cancel()
+            raise
+        pages += 1
+        page += 1
+        if on_page is not None:
+            await on_page(pages, writer.rows)
+    return pages, None
@@ -0,0 +1,40 @@
+import json
+
+# orjson is optional (pip install orjson); it encodes and decodes several times
+# faster than the standard library, which matters for 200-record pages.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(value) -> bytes:
+    """Compact UTF-8 JSON for request bodies"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            # Values orjson rejects (e.g. integers above 64 bits) still go through json.
+            pass
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def loads(data: bytes | str):
+    """Parses a response body; errors are ValueError subclasses with either backend"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_body(response):
+    """
+    Parsed JSON body of an httpx response. The result is kept on the response,
+    so callers sharing one coalesced response decode it once; treat it as read-only.
+    """
+    try:
+        return response._parsed_body
+    except AttributeError:
+        response._parsed_body = loads(response.content)
+        return response._parsed_body
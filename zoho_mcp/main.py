@@ -1,60 +1,315 @@
-from mcp.server.fastmcp import FastMCP
-import requests
-import json
+from mcp.server.fastmcp import FastMCP, Context
+from contextlib import asynccontextmanager
+import asyncio
+import csv
+import logging
+import shutil
+import tempfile
+import time
 
-from zoho_mcp.config import get_zoho_config, get_access_token, update_access_token, is_token_expired
-
-from dotenv import load_dotenv
+from zoho_mcp.bulk import MAX_URL_LENGTH, ChunkedResult, chunk_ids, run_chunks
+from zoho_mcp.cache import get_metadata_cache, get_record_cache, reset_caches
+from zoho_mcp.client import get_client, replace_client
+from zoho_mcp.config import changed_fields, expire_access_token, get_zoho_config, reload_zoho_config
+from zoho_mcp.export import EXPORT_FORMATS, RecordWriter, default_export_path, export_pages
+from zoho_mcp.jsonlib import dumps, loads, parse_body
+from zoho_mcp.metrics import get_metrics, instrument_tool, render_openmetrics, serve_metrics
+from zoho_mcp.projection import shape_records
+from zoho_mcp.result_store import estimate_size, get_result_store, result_reference
+from zoho_mcp.scheduler import PRIORITY_BULK
+from typing import TYPE_CHECKING
 import os
-import traceback
 
-load_dotenv()
+# Bulk API, COQL, criteria, mirror and write queue modules (zipfile, sqlite3, ...)
+# are imported by the tools that use them, keeping server startup short.
+if TYPE_CHECKING:
+    from zoho_mcp.mirror import LocalMirror
+
+logger = logging.getLogger(__name__)
+
+
+def parse_modules(response) -> list[str]:
+    return [module["api_name"] for module in parse_body(response).get("modules", [])]
+
+def parse_fields(response) -> list[dict]:
+    # normalize output to essential info
+    result = []
+    for f in parse_body(response).get("fields", []):
+        entry = {
+            "api_name": f.get("api_name"),
+            "field_label": f.get("field_label"),
+            "data_type": f.get("data_type"),
+            "system_mandatory": f.get("system_mandatory"),
+        }
+        if f.get("pick_list_values"):
+            entry["pick_list_values"] = [v.get("actual_value") for v in f.get("pick_list_values", [])]
+        result.append(entry)
+    return result
 
-mcp = FastMCP("Demo")
 
+def created_ids(result: dict) -> list[str]:
+    """Достает id созданных записей из ответа Zoho на POST"""
+    return [
+        item["details"]["id"]
+        for item in result.get("data", []) or []
+        if isinstance(item, dict) and (item.get("details") or {}).get("id")
+    ]
 
-def refresh_token():
-    """Обновляет access token используя refresh token"""
-    zoho_config = get_zoho_config()
-    base_url_acc = 'https://accounts.zoho.eu'
-    path = '/oauth/v2/token'
-    params = {
-        'grant_type': 'refresh_token',
-        'client_id': zoho_config.client_id,
-        'client_secret': zoho_config.client_secret,
-        'refresh_token': zoho_config.refresh_token
+
+def bulk_input_error(module_name: str, records: list, require_id: bool = False) -> dict | None:
+    """Ошибка для records_data с элементами, которые не объекты (или без id, если он обязателен)"""
+    not_objects = [i for i, record in enumerate(records) if not isinstance(record, dict)]
+    if not_objects:
+        message = f"Every record must be an object; not an object at positions {not_objects[:20]}"
+    else:
+        missing_id = [i for i, record in enumerate(records) if require_id and not record.get("id")]
+        if not missing_id:
+            return None
+        message = f"Every record needs an 'id'; missing at positions {missing_id[:20]}"
+    return {"status": "error", "module": module_name, "message": message, "code": 400}
+
+
+def bulk_response(module_name: str, action: str, total: int, result: ChunkedResult) -> dict:
+    """
+    Собирает ответ bulk-инструментов из результатов по чанкам; успех считается по записям,
+    потому что 207 (и даже 200/201) может нести ошибки отдельных записей
+    """
+    succeeded = result.succeeded
+    if succeeded == total:
+        return {
+            "status": "success",
+            "module": module_name,
+            "message": f"{total} records {action} successfully",
+            "data": result.data
+        }
+    if result.chunks == 1 and result.errors:
+        return {
+            "status": "error",
+            "module": module_name,
+            "message": result.errors[0]["message"],
+            "code": result.errors[0]["code"]
+        }
+    failed = result.failed_records
+    message = f"{succeeded} of {total} records {action}; {len(failed)} failed"
+    if result.errors:
+        message += f" ({len(result.errors)} of {result.chunks} chunks failed)"
+    answer = {
+        "status": "partial_success" if succeeded else "error",
+        "module": module_name,
+        "message": message,
+        "data": result.data,
+        "record_errors": failed
     }
+    if result.errors:
+        answer["errors"] = result.errors
+    return answer
+
 
-    response = requests.post(base_url_acc + path, data=params)
+async def report_progress(ctx: Context | None, progress: float, total: float | None = None, message: str | None = None):
+    """Шлет progress-уведомление, если инструмент вызван в рамках MCP запроса"""
+    if ctx is None:
+        return
     try:
-        json_resp = response.json()
-        access_token = json_resp['access_token']
-        update_access_token(access_token)
-        return True
+        await ctx.report_progress(progress, total, message)
+    except ValueError:
+        # Called outside of a request (e.g. directly from a script)
+        pass
+
+
+READ_SOURCES = ("remote", "local")
+
+# Most records one result slice returns
+MAX_SLICE = 1000
+
+# Настройки, которые читаются только при старте сервера (фоновые задачи, журналы, endpoint метрик)
+RESTART_FIELDS = (
+    "warm_metadata", "mirror_db", "mirror_interval", "write_queue_db", "write_queue_interval", "metrics_port", "metrics_host",
+    "result_memory_mb", "result_disk_mb", "result_spill_dir", "result_ttl",
+)
+# При смене org или учетных данных токен и кеши относятся к старой org
+IDENTITY_FIELDS = ("base_url", "accounts_url", "refresh_token", "client_id", "client_secret", "org_id")
+CACHE_FIELDS = ("modules_cache_ttl", "fields_cache_ttl", "record_cache_size", "record_cache_ttl")
+
+
+async def local_mirror_for(module_name: str) -> tuple["LocalMirror | None", dict]:
+    """Зеркало и свежесть данных модуля для source="local"; при ошибке - (None, ответ с ошибкой)"""
+    from zoho_mcp.mirror import get_mirror
+    mirror = get_mirror()
+    if mirror is None:
+        message = "Local mirror is disabled; set ZOHO_MIRROR_DB to enable it"
+    else:
+        freshness = await asyncio.to_thread(mirror.staleness, module_name)
+        if freshness is not None:
+            return mirror, freshness
+        message = f"Module {module_name} has not been synced to the local mirror yet; run sync_local_mirror"
+    return None, {"status": "error", "module": module_name, "message": message, "code": None}
+
+
+async def local_module_page(mirror: "LocalMirror", module_name: str, limit: int, offset: int, fields: list[str] | None, slim: bool) -> dict:
+    """Страница записей модуля из локального зеркала в формате ответа get_module_data"""
+    records = await asyncio.to_thread(mirror.page, module_name, limit + 1, offset)
+    more_records = len(records) > limit
+    records = shape_records(records[:limit], fields, slim)
+    return {
+        "count": len(records),
+        "data": records,
+        "pagination": {
+            "offset": offset,
+            "per_page": limit,
+            "more_records": more_records,
+            "returned_count": len(records),
+            "next_offset": (offset + limit) if more_records else None
+        }
+    }
+
+
+async def search_mirror(module_name: str, criteria: str | None, word: str | None, limit: int, offset: int) -> tuple[list[dict] | None, dict]:
+    """Поиск по локальному зеркалу; (None, {"reason": ...}) если ответить локально нельзя"""
+    mirror, freshness = await local_mirror_for(module_name)
+    if mirror is None:
+        return None, {"reason": freshness["message"]}
+    if criteria:
+        from zoho_mcp.criteria import UnsupportedCriteria, parse_criteria, to_sql
+        try:
+            where, params = to_sql(parse_criteria(criteria))
+        except UnsupportedCriteria as ex:
+            return None, {"reason": str(ex)}
+        return await asyncio.to_thread(mirror.search, module_name, where, params, limit, offset), freshness
+    if not mirror.fts:
+        return None, {"reason": "Full-text index is not available (SQLite without FTS5)"}
+    return await asyncio.to_thread(mirror.search_words, module_name, word, limit, offset), freshness
+
+
+async def store_large_result(answer: dict, meta: dict, inline: bool | None, body_size: int | None = None) -> dict:
+    """
+    Заменяет answer["data"] сводкой и result_handle, если записи больше ZOHO_RESULT_INLINE_KB
+    (или inline=False); срезы отдает ресурс result://{handle}/{offset}/{limit} без запроса к Zoho.
+    Страницу целиком не кодируем: тело ответа Zoho (body_size) не меньше записей после проекции,
+    иначе размер оцениваем по первым записям
+    """
+    records = answer.get("data") or []
+    threshold = get_client().config.result_inline_kb * 1024
+    if inline or not records or (inline is None and not threshold):
+        return answer
+    if inline is None and (
+        (body_size is not None and body_size <= threshold) or estimate_size(records) <= threshold
+    ):
+        return answer
+    entry = await asyncio.to_thread(get_result_store().put, records, meta)
+    return {**answer, "data": None, **result_reference(entry, records)}
+
+
+async def read_result(handle: str, offset: int, limit: int, fields: list[str] | None = None) -> dict:
+    """Срез сохраненного результата в формате ответа инструмента"""
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), MAX_SLICE)
+    sliced = await asyncio.to_thread(get_result_store().slice, handle, offset, limit)
+    if sliced is None:
+        return {"status": "error", "message": f"Unknown or expired result handle: {handle}; run the tool again", "code": None}
+    entry, data = sliced
+    data = shape_records(data, fields)
+    end = offset + len(data)
+    return {
+        "status": "success",
+        **entry.meta,
+        "result_handle": handle,
+        "total": entry.count,
+        "offset": offset,
+        "count": len(data),
+        "data": data,
+        "next_offset": end if end < entry.count else None,
+    }
+
+
+def cache_stats() -> dict[str, dict]:
+    """Счетчики всех кешей: metadata:<endpoint> и records"""
+    caches = {f"metadata:{endpoint}": stats for endpoint, stats in get_metadata_cache().stats_dict().items()}
+    caches["records"] = get_record_cache().stats_dict()
+    return caches
+
+
+def metrics_text() -> str:
+    """Метрики в текстовом формате OpenMetrics"""
+    return render_openmetrics(get_metrics(), cache_stats(), get_client().scheduler.status())
+
+
+async def warm_metadata_cache():
+    """Загружает список модулей и поля настроенных модулей в кеш"""
+    client = get_client()
+    cache = get_metadata_cache()
+    try:
+        await cache.fetch(client, "modules", "/settings/modules", parse_modules)
+        await asyncio.gather(*(
+            cache.fetch(client, "fields", "/settings/fields", parse_fields, params={"module": module})
+            for module in client.config.modules
+        ))
     except Exception as ex:
-        print(f"Ошибка обновления токена: {ex}")
-        return False
+        logger.warning(f"Не удалось прогреть кеш метаданных: {ex}")
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    config = get_zoho_config()
+    tasks = []
+    if config.warm_metadata:
+        # Warm up in the background so the server answers initialize right away.
+        tasks.append(asyncio.create_task(warm_metadata_cache()))
+    if config.mirror_db and config.mirror_interval > 0:
+        from zoho_mcp.mirror import sync_loop
+        tasks.append(asyncio.create_task(sync_loop(config.modules, config.mirror_interval)))
+    if config.write_queue_db:
+        from zoho_mcp.write_queue import get_write_queue
+        # Sends whatever a previous run left in the journal.
+        tasks.append(get_write_queue().start())
+    metrics_server = None
+    if config.metrics_port:
+        metrics_server = await serve_metrics(config.metrics_host, config.metrics_port, metrics_text)
+    try:
+        yield {}
+    finally:
+        for task in tasks:
+            task.cancel()
+        if metrics_server is not None:
+            metrics_server.close()
+        get_result_store().clear()
+
+
+mcp = FastMCP("Demo", lifespan=server_lifespan)
 
-def ensure_valid_token():
-    """Проверяет валидность токена и обновляет его при необходимости"""
-    if is_token_expired():
-        if not refresh_token():
-            raise RuntimeError("Не удалось обновить токен доступа")
 
 @mcp.tool()
-def get_module_data(ctx, module_name: str = None, limit: int = 10, offset: int = 0):
+@instrument_tool
+async def get_module_data(
+    ctx: Context,
+    module_name: str = None,
+    limit: int = 10,
+    offset: int = 0,
+    fields: list[str] | None = None,
+    slim: bool = False,
+    source: str = "remote",
+    inline: bool | None = None,
+):
     """
     Fetch data from Zoho CRM modules
     
     Args:
         module_name: Specific module name (e.g., 'Contacts', 'Leads'). 
-                    If None, fetches from all modules.
+                    If None, fetches from all configured modules concurrently
+                    and reports wall-clock vs summed per-module time in `timing`.
         limit: Maximum number of records to return per module (default: 10, max: 200)
         offset: Number of records to skip (default: 0)
+        fields: Optional list of field API names to return (sent as Zoho's `fields` parameter)
+        slim: Drop null values and internal `$`-prefixed keys from records (default: False)
+        source: "remote" (default) asks Zoho; "local" reads the SQLite mirror (see sync_local_mirror)
+                without spending API credits and reports `synced_at` / `staleness_seconds`
+        inline: By default records larger than ZOHO_RESULT_INLINE_KB are kept on the server and
+                `data` is replaced by `result_handle`, `fields` and a `preview`; read them in slices
+                from the result://{handle}/{offset}/{limit} resource or get_result_slice.
+                True always returns records inline, False always returns a handle.
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
+    if source not in READ_SOURCES:
+        return {"status": "error", "module": module_name, "message": f"source must be one of {READ_SOURCES}", "code": None}
     
     # Ограничиваем limit максимальным значением 200 (первая страница Zoho per_page)
     limit = min(limit, 200) if limit and isinstance(limit, int) else 10
@@ -65,24 +320,52 @@ def get_module_data(ctx, module_name: str = None, limit: int = 10, offset: int =
     # per_page соответствует нашему limit
     page = (offset // limit) + 1 if offset and isinstance(offset, int) else 1
     
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    
     # Используем серверную пагинацию Zoho CRM v2: page + per_page
     params = {"page": page, "per_page": limit}
+    if fields:
+        params["fields"] = ",".join(fields)
     
+    if source == "local":
+        offset = offset if offset and isinstance(offset, int) and offset > 0 else 0
+        if module_name:
+            mirror, freshness = await local_mirror_for(module_name)
+            if mirror is None:
+                return freshness
+            return await store_large_result({
+                "status": "success",
+                "module": module_name,
+                "source": "local",
+                **freshness,
+                **await local_module_page(mirror, module_name, limit, offset, fields, slim)
+            }, {"module": module_name}, inline)
+        all_data = {}
+        errors = []
+        for module in client.config.modules:
+            mirror, freshness = await local_mirror_for(module)
+            if mirror is None:
+                errors.append({"module": module, "code": None, "message": freshness["message"]})
+            else:
+                all_data[module] = await store_large_result(
+                    {**freshness, **await local_module_page(mirror, module, limit, offset, fields, slim)}, {"module": module}, inline
+                )
+        return {
+            "status": "success",
+            "source": "local",
+            "modules_fetched": len(all_data),
+            "data": all_data,
+            "errors": errors if errors else None
+        }
+
     if module_name:
-        url = f"{zoho_config.base_url}/{module_name}"
-        response = requests.get(url, headers=headers, params=params)
+        path = f"/{module_name}"
+        response = await client.get(path, params=params)
         
         if response.status_code == 200:
-            response_data = response.json()
-            records = response_data.get("data", [])
+            response_data = parse_body(response)
+            records = shape_records(response_data.get("data", []), fields, slim)
             info = response_data.get("info", {})
             
-            return {
+            return await store_large_result({
                 "status": "success",
                 "module": module_name,
                 "count": len(records),
@@ -94,7 +377,7 @@ def get_module_data(ctx, module_name: str = None, limit: int = 10, offset: int =
                     "returned_count": len(records),
                     "next_offset": (offset + limit) if info.get("more_records", False) else None
                 }
-            }
+            }, {"module": module_name}, inline, len(response.content))
         else:
             return {
                 "status": "error",
@@ -105,17 +388,38 @@ def get_module_data(ctx, module_name: str = None, limit: int = 10, offset: int =
     else:
         all_data = {}
         errors = []
-        
-        for module in zoho_config.modules:
-            url = f"{zoho_config.base_url}/{module}"
-            response = requests.get(url, headers=headers, params=params)
-            
-            if response.status_code == 200:
-                response_data = response.json()
-                records = response_data.get("data", [])
+        module_times = {}
+
+        # Модули запрашиваем параллельно, но не больше module_concurrency одновременно
+        semaphore = asyncio.Semaphore(max(1, client.config.module_concurrency))
+
+        async def fetch_module(module: str):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(f"/{module}", params=params)
+                except Exception as ex:
+                    response = ex
+                return module, response, round((time.perf_counter() - started) * 1000, 1)
+
+        wall_started = time.perf_counter()
+        results = await asyncio.gather(*(fetch_module(module) for module in client.config.modules))
+        wall_clock_ms = round((time.perf_counter() - wall_started) * 1000, 1)
+
+        for module, response, elapsed_ms in results:
+            module_times[module] = elapsed_ms
+            if isinstance(response, Exception):
+                errors.append({
+                    "module": module,
+                    "code": None,
+                    "message": f"{type(response).__name__}: {response}"
+                })
+            elif response.status_code == 200:
+                response_data = parse_body(response)
+                records = shape_records(response_data.get("data", []), fields, slim)
                 info = response_data.get("info", {})
 
-                all_data[module] = {
+                all_data[module] = await store_large_result({
                     "count": len(records),
                     "data": records,
                     "pagination": {
@@ -124,7 +428,7 @@ def get_module_data(ctx, module_name: str = None, limit: int = 10, offset: int =
                         "more_records": info.get("more_records", False),
                         "returned_count": len(records)
                     }
-                }
+                }, {"module": module}, inline, len(response.content))
             else:
                 errors.append({
                     "module": module,
@@ -141,29 +445,27 @@ def get_module_data(ctx, module_name: str = None, limit: int = 10, offset: int =
                 "page": page,
                 "note": "Server-side pagination via Zoho CRM API (page/per_page)"
             },
+            "timing": {
+                "wall_clock_ms": wall_clock_ms,
+                "sum_module_ms": round(sum(module_times.values()), 1),
+                "per_module_ms": module_times
+            },
             "errors": errors if errors else None
         }
 
 @mcp.tool()
-def get_available_modules(ctx):
+@instrument_tool
+async def get_available_modules(ctx: Context):
     """Get list of all available modules in Zoho CRM"""
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
+    client = get_client()
     
-    url = f"{zoho_config.base_url}/settings/modules"
-    response = requests.get(url, headers=headers)
+    modules, response = await get_metadata_cache().fetch(client, "modules", "/settings/modules", parse_modules)
     
-    if response.status_code == 200:
-        modules = response.json().get("modules", [])
+    if modules is not None:
         return {
             "status": "success",
             "count": len(modules),
-            "modules": [module["api_name"] for module in modules]
+            "modules": modules
         }
     else:
         return {
@@ -173,39 +475,82 @@ def get_available_modules(ctx):
         }
 
 @mcp.tool()
-def search_records(ctx, module_name: str, search_criteria: str, limit: int = 50, page: int = 1):
+@instrument_tool
+async def search_records(
+    ctx: Context,
+    module_name: str,
+    search_criteria: str | None = None,
+    limit: int = 50,
+    page: int = 1,
+    fields: list[str] | None = None,
+    slim: bool = False,
+    word: str | None = None,
+    source: str = "remote",
+    inline: bool | None = None,
+):
     """
     Search for records in a specific module
     
     Args:
         module_name: Module to search in (e.g., 'Contacts', 'Leads')
-        search_criteria: Search query (e.g., 'Email:john@example.com')
+        search_criteria: Zoho criteria (e.g., '(Email:equals:john@example.com)', combine with and/or)
+        fields: Optional list of field API names to return (sent as Zoho's `fields` parameter)
+        slim: Drop null values and internal `$`-prefixed keys from records (default: False)
+        word: Full-text search term, used instead of search_criteria
+        source: "remote" (default) or "local" to answer from the SQLite mirror. Criteria with
+                operators the mirror cannot evaluate fall back to Zoho (see `fallback_reason`).
+        inline: None (default) returns a `result_handle` with a summary instead of records larger
+                than ZOHO_RESULT_INLINE_KB (see get_module_data); True / False force either form.
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
+    if source not in READ_SOURCES:
+        return {"status": "error", "module": module_name, "message": f"source must be one of {READ_SOURCES}", "code": None}
+    search_criteria = (search_criteria or "").strip() or None
+    word = (word or "").strip() or None
+    if not search_criteria and not word:
+        return {"status": "error", "module": module_name, "message": "Either search_criteria or word is required", "code": None}
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    
     # Параметры серверной пагинации
     limit = min(limit, 200) if limit and isinstance(limit, int) else 50
     if limit <= 0:
         limit = 50
     page = page if page and isinstance(page, int) and page > 0 else 1
 
-    url = f"{zoho_config.base_url}/{module_name}/search"
-    params = {"criteria": search_criteria, "page": page, "per_page": limit}
+    fallback_reason = None
+    if source == "local":
+        records, local_info = await search_mirror(module_name, search_criteria, word, limit + 1, (page - 1) * limit)
+        if records is not None:
+            data = shape_records(records[:limit], fields, slim)
+            return await store_large_result({
+                "status": "success",
+                "module": module_name,
+                "source": "local",
+                **local_info,
+                "count": len(data),
+                "data": data,
+                "pagination": {
+                    "page": page,
+                    "per_page": limit,
+                    "more_records": len(records) > limit,
+                    "returned_count": len(data)
+                }
+            }, {"module": module_name}, inline)
+        fallback_reason = local_info["reason"]
+
+    path = f"/{module_name}/search"
+    params = {"criteria": search_criteria} if search_criteria else {"word": word}
+    params.update({"page": page, "per_page": limit})
+    if fields:
+        params["fields"] = ",".join(fields)
     
-    response = requests.get(url, headers=headers, params=params)
+    response = await client.get(path, params=params, hedge=True)
     
-    if response.status_code == 200:
-        body = response.json()
-        data = body.get("data", [])
+    # 204 - Zoho found nothing
+    if response.status_code in (200, 204):
+        body = parse_body(response) if response.status_code == 200 else {}
+        data = shape_records(body.get("data", []), fields, slim)
         info = body.get("info", {})
-        return {
+        result = {
             "status": "success",
             "module": module_name,
             "count": len(data),
@@ -217,6 +562,9 @@ def search_records(ctx, module_name: str, search_criteria: str, limit: int = 50,
                 "returned_count": len(data)
             }
         }
+        if fallback_reason:
+            result.update({"source": "remote", "fallback_reason": fallback_reason})
+        return await store_large_result(result, {"module": module_name}, inline, len(response.content))
     else:
         return {
             "status": "error",
@@ -226,7 +574,98 @@ def search_records(ctx, module_name: str, search_criteria: str, limit: int = 50,
         }
 
 @mcp.tool()
-def create_record(ctx, module_name: str, record_data: dict):
+@instrument_tool
+async def query_records(
+    ctx: Context,
+    module_name: str,
+    select: list[str],
+    where: str | None = None,
+    order_by: list[str] | None = None,
+    group_by: list[str] | None = None,
+    limit: int = 200,
+    offset: int = 0,
+    slim: bool = False,
+):
+    """
+    Run a COQL query so Zoho filters, sorts and aggregates server-side
+    instead of paging whole modules through get_module_data.
+
+    Args:
+        module_name: Module to query (e.g., 'Deals')
+        select: Field API names, lookups like 'Owner.name' or aggregates like 'COUNT(id)', 'SUM(Amount)'
+        where: COQL condition, e.g. "Stage = 'Closed Won' and Amount > 1000" (default: all records)
+        order_by: e.g. ['Amount desc', 'Deal_Name']
+        group_by: Fields to group aggregates by, e.g. ['Stage']
+        limit: Maximum rows to return; pages of 200 are fetched automatically (default: 200)
+        offset: Rows to skip (COQL serves up to 10,000 rows deep)
+        slim: Drop null values and internal `$`-prefixed keys from rows (default: False)
+    """
+    from zoho_mcp.coql import COQL_MAX_LIMIT, COQL_MAX_OFFSET, InvalidQuery, plan_query, unknown_fields
+    client = get_client()
+    try:
+        plan = plan_query(module_name, tuple(select or ()), where, tuple(order_by or ()), tuple(group_by or ()))
+    except InvalidQuery as ex:
+        return {"status": "error", "module": module_name, "message": str(ex), "code": None}
+
+    # Field names are checked against the cached layout before any credit is spent.
+    module_fields, _ = await get_metadata_cache().fetch(
+        client, "fields", "/settings/fields", parse_fields, params={"module": module_name}
+    )
+    if module_fields:
+        unknown = unknown_fields(plan, module_fields)
+        if unknown:
+            return {"status": "error", "module": module_name, "message": f"Unknown fields: {', '.join(unknown)}", "code": None}
+
+    limit = limit if limit and isinstance(limit, int) and limit > 0 else COQL_MAX_LIMIT
+    offset = offset if offset and isinstance(offset, int) and offset > 0 else 0
+
+    rows = []
+    pages = 0
+    position = offset
+    more_records = False
+    while len(rows) < limit:
+        if position >= COQL_MAX_OFFSET:
+            break
+        page_size = min(COQL_MAX_LIMIT, limit - len(rows), COQL_MAX_OFFSET - position)
+        response = await client.post("/coql", json={"select_query": plan.page_query(position, page_size)})
+        if response.status_code == 204:
+            more_records = False
+            break
+        if response.status_code != 200:
+            error = {"status": "error", "module": module_name, "query": plan.text, "message": response.text, "code": response.status_code}
+            if rows:
+                error.update({"status": "partial_success", "count": len(rows), "data": shape_records(rows, None, slim)})
+            return error
+
+        body = loads(response.content)
+        page_rows = body.get("data", []) or []
+        rows.extend(page_rows)
+        pages += 1
+        position += len(page_rows)
+        more_records = body.get("info", {}).get("more_records", False)
+        await report_progress(ctx, len(rows), limit, f"{len(rows)} rows")
+        if not more_records or not page_rows:
+            break
+
+    data = shape_records(rows, None, slim)
+    return {
+        "status": "success",
+        "module": module_name,
+        "query": plan.text,
+        "count": len(data),
+        "data": data,
+        "pagination": {
+            "offset": offset,
+            "returned_count": len(data),
+            "pages": pages,
+            "more_records": more_records,
+            "next_offset": position if more_records and position < COQL_MAX_OFFSET else None
+        }
+    }
+
+@mcp.tool()
+@instrument_tool
+async def create_record(ctx: Context, module_name: str, record_data: dict):
     """
     Create a new record in a specific module
     
@@ -235,26 +674,20 @@ def create_record(ctx, module_name: str, record_data: dict):
         record_data: Dictionary containing the record fields and values
                     Example: {"First_Name": "John", "Last_Name": "Doe", "Email": "john@example.com"}
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    
-    url = f"{zoho_config.base_url}/{module_name}"
+    path = f"/{module_name}"
     
     # Wrap the record data in the required format
     payload = {
         "data": [record_data]
     }
     
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
+    response = await client.post(path, json=payload)
     
     if response.status_code == 201:
-        result = response.json()
+        result = loads(response.content)
+        get_record_cache().invalidate(module_name, created_ids(result))
         return {
             "status": "success",
             "module": module_name,
@@ -270,7 +703,8 @@ def create_record(ctx, module_name: str, record_data: dict):
         }
 
 @mcp.tool()
-def update_record(ctx, module_name: str, record_id: str, record_data: dict):
+@instrument_tool
+async def update_record(ctx: Context, module_name: str, record_id: str, record_data: dict):
     """
     Update an existing record in a specific module
     
@@ -280,16 +714,9 @@ def update_record(ctx, module_name: str, record_id: str, record_data: dict):
         record_data: Dictionary containing the fields to update and their new values
                     Example: {"First_Name": "Jane", "Email": "jane@example.com"}
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    
-    url = f"{zoho_config.base_url}/{module_name}/{record_id}"
+    path = f"/{module_name}/{record_id}"
     
     # Add the record ID to the data
     record_data["id"] = record_id
@@ -299,10 +726,12 @@ def update_record(ctx, module_name: str, record_id: str, record_data: dict):
         "data": [record_data]
     }
     
-    response = requests.put(url, headers=headers, data=json.dumps(payload))
+    response = await client.put(path, json=payload)
+    # Даже при ошибке запись могла частично измениться - сбрасываем кеш
+    get_record_cache().invalidate(module_name, [record_id])
     
     if response.status_code == 200:
-        result = response.json()
+        result = loads(response.content)
         return {
             "status": "success",
             "module": module_name,
@@ -320,8 +749,9 @@ def update_record(ctx, module_name: str, record_id: str, record_data: dict):
         }
 
 @mcp.tool()
-def create_lead_from_form(
-    ctx,
+@instrument_tool
+async def create_lead_from_form(
+    ctx: Context,
     first_name: str | None = None,
     last_name: str = "",
     mobile: str | None = None,
@@ -339,15 +769,12 @@ def create_lead_from_form(
         possible_funds_to_invest: Possible funds for investing (will be stored in a Note).
         client_status: Client status (maps to Lead_Status field).
         client_description: Client description (will be stored in a Note).
-    """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json",
-    }
+    With ZOHO_WRITE_QUEUE_DB set the submission is journaled and sent later in a
+    batch of up to 100 Leads; the response is then status "pending" with a
+    ticket_id for get_lead_ticket.
+    """
+    client = get_client()
 
     # Validate last name
     if not last_name:
@@ -370,13 +797,31 @@ def create_lead_from_form(
     if client_status:
         record["Lead_Status"] = client_status
 
-    url = f"{zoho_config.base_url}/Leads"
+    from zoho_mcp.write_queue import get_write_queue
+    queue = get_write_queue()
+    if queue is not None:
+        note_lines = []
+        if possible_funds_to_invest:
+            note_lines.append(f"Possible funds to invest: {possible_funds_to_invest}")
+        if client_description:
+            note_lines.append(f"Description: {client_description}")
+        queue.start()
+        ticket_id = await queue.submit(record, "\n".join(note_lines) or None)
+        return {
+            "status": "pending",
+            "module": "Leads",
+            "message": "Lead queued; poll get_lead_ticket for the Zoho ID",
+            "ticket_id": ticket_id,
+        }
+
+    path = "/Leads"
     payload = {"data": [record]}
 
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
+    response = await client.post(path, json=payload)
 
     if response.status_code == 201:
-        result = response.json()
+        result = loads(response.content)
+        get_record_cache().invalidate("Leads", created_ids(result))
         note_result = None
 
         # Try to add a Note with invest/description if provided
@@ -396,7 +841,7 @@ def create_lead_from_form(
 
             if lead_id and note_lines:
                 note_content = "\n".join(note_lines)
-                notes_url = f"{zoho_config.base_url}/Notes"
+                notes_path = "/Notes"
                 note_payload = {
                     "data": [
                         {
@@ -407,7 +852,7 @@ def create_lead_from_form(
                         }
                     ]
                 }
-                note_resp = requests.post(notes_url, headers=headers, data=json.dumps(note_payload))
+                note_resp = await client.post(notes_path, json=note_payload)
                 if note_resp.status_code == 201:
                     note_result = {"status": "created"}
                 else:
@@ -433,7 +878,30 @@ def create_lead_from_form(
         }
 
 @mcp.tool()
-def delete_record(ctx, module_name: str, record_id: str):
+@instrument_tool
+async def get_lead_ticket(ctx: Context, ticket_id: str):
+    """
+    Report the outcome of a create_lead_from_form submission queued in write-behind mode.
+
+    Args:
+        ticket_id: The ticket_id returned by create_lead_from_form
+
+    Returns:
+        state: "queued", "lead_created" (Note still pending), "done" or "failed",
+        plus lead_id once the Lead exists and the Note status.
+    """
+    from zoho_mcp.write_queue import get_write_queue
+    queue = get_write_queue()
+    if queue is None:
+        return {"status": "error", "module": "Leads", "message": "Write-behind mode is disabled; set ZOHO_WRITE_QUEUE_DB to enable it", "code": None}
+    ticket = await asyncio.to_thread(queue.status, ticket_id)
+    if ticket is None:
+        return {"status": "error", "module": "Leads", "message": f"Unknown ticket: {ticket_id}", "code": None}
+    return {"status": "success", "module": "Leads", **ticket, "queue": await asyncio.to_thread(queue.stats)}
+
+@mcp.tool()
+@instrument_tool
+async def delete_record(ctx: Context, module_name: str, record_id: str):
     """
     Delete a record from a specific module
     
@@ -441,21 +909,15 @@ def delete_record(ctx, module_name: str, record_id: str):
         module_name: Module containing the record (e.g., 'Contacts', 'Leads')
         record_id: ID of the record to delete
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    
-    url = f"{zoho_config.base_url}/{module_name}/{record_id}"
+    path = f"/{module_name}/{record_id}"
     
-    response = requests.delete(url, headers=headers)
+    response = await client.delete(path)
+    get_record_cache().invalidate(module_name, [record_id])
     
     if response.status_code == 200:
-        result = response.json()
+        result = loads(response.content)
         return {
             "status": "success",
             "module": module_name,
@@ -473,85 +935,576 @@ def delete_record(ctx, module_name: str, record_id: str):
         }
 
 @mcp.tool()
-def bulk_create_records(ctx, module_name: str, records_data: list):
+@instrument_tool
+async def bulk_create_records(ctx: Context, module_name: str, records_data: list):
     """
     Create multiple records in a specific module
     
+    Inputs larger than 100 records are split into 100-record chunks that are
+    sent concurrently; per-record results are returned in input order.
+    
     Args:
         module_name: Module to create records in (e.g., 'Contacts', 'Leads')
         records_data: List of dictionaries containing record data
                      Example: [{"First_Name": "John", "Last_Name": "Doe"}, {"First_Name": "Jane", "Last_Name": "Smith"}]
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
+    error = bulk_input_error(module_name, records_data)
+    if error:
+        return error
+
+    path = f"/{module_name}"
+
+    async def send(chunk: list):
+        return await client.post(path, json={"data": chunk}, priority=PRIORITY_BULK)
+
+    result = await run_chunks(records_data, send, (201, 207), client.config.bulk_concurrency)
+    get_record_cache().invalidate(module_name, created_ids({"data": result.data}))
+    return bulk_response(module_name, "created", len(records_data), result)
+
+@mcp.tool()
+@instrument_tool
+async def bulk_update_records(ctx: Context, module_name: str, records_data: list):
+    """
+    Update multiple existing records in a specific module
     
-    url = f"{zoho_config.base_url}/{module_name}"
+    Records are sent 100 per request (PUT /{module}), chunks in parallel;
+    per-record results are returned in input order.
     
-    # Zoho CRM allows up to 100 records per API call
-    if len(records_data) > 100:
-        return {
-            "status": "error",
-            "message": "Maximum 100 records allowed per bulk operation"
-        }
+    Args:
+        module_name: Module containing the records (e.g., 'Contacts', 'Leads')
+        records_data: List of dictionaries, each with the record "id" and the fields to update
+                     Example: [{"id": "4876876000000123001", "Lead_Status": "Contacted"}]
+    """
+    client = get_client()
+
+    error = bulk_input_error(module_name, records_data, require_id=True)
+    if error:
+        return error
+
+    path = f"/{module_name}"
+
+    async def send(chunk: list):
+        return await client.put(path, json={"data": chunk}, priority=PRIORITY_BULK)
+
+    result = await run_chunks(records_data, send, (200, 207), client.config.bulk_concurrency)
+    get_record_cache().invalidate(module_name, [str(record["id"]) for record in records_data])
+    return bulk_response(module_name, "updated", len(records_data), result)
+
+@mcp.tool()
+@instrument_tool
+async def bulk_upsert_records(ctx: Context, module_name: str, records_data: list, duplicate_check_fields: list[str] | None = None):
+    """
+    Insert or update records in one call (POST /{module}/upsert)
     
-    payload = {
-        "data": records_data
-    }
+    Zoho matches each record against existing ones using duplicate_check_fields
+    and updates the match or creates a new record, so no search is needed first.
+    Records are sent 100 per request, chunks in parallel.
+    
+    Args:
+        module_name: Module to upsert into (e.g., 'Contacts', 'Leads')
+        records_data: List of dictionaries containing record data
+        duplicate_check_fields: Fields used to find an existing record (e.g., ["Email"]).
+                               If omitted, Zoho uses the module's unique fields.
+    """
+    client = get_client()
+
+    error = bulk_input_error(module_name, records_data)
+    if error:
+        return error
+
+    path = f"/{module_name}/upsert"
+
+    async def send(chunk: list):
+        payload = {"data": chunk}
+        if duplicate_check_fields:
+            payload["duplicate_check_fields"] = duplicate_check_fields
+        return await client.post(path, json=payload, priority=PRIORITY_BULK)
+
+    result = await run_chunks(records_data, send, (200, 201, 207), client.config.bulk_concurrency)
+    get_record_cache().invalidate(module_name, created_ids({"data": result.data}))
+    return bulk_response(module_name, "upserted", len(records_data), result)
+
+@mcp.tool()
+@instrument_tool
+async def bulk_delete_records(ctx: Context, module_name: str, record_ids: list[str]):
+    """
+    Delete multiple records from a specific module
     
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
+    IDs are sent 100 per request (DELETE /{module}?ids=...), chunks in parallel;
+    per-record results are returned in input order.
     
-    if response.status_code == 201:
-        result = response.json()
+    Args:
+        module_name: Module containing the records (e.g., 'Contacts', 'Leads')
+        record_ids: IDs of the records to delete
+    """
+    client = get_client()
+
+    invalid = [i for i, record_id in enumerate(record_ids) if isinstance(record_id, bool) or not isinstance(record_id, (str, int)) or record_id == ""]
+    if invalid:
         return {
-            "status": "success",
+            "status": "error",
             "module": module_name,
-            "message": f"{len(records_data)} records created successfully",
-            "data": result.get("data", [])
+            "message": f"Every record id must be a non-empty string; invalid at positions {invalid[:20]}",
+            "code": 400
         }
-    else:
+
+    path = f"/{module_name}"
+    record_ids = [str(record_id) for record_id in record_ids]
+
+    async def send(chunk: list):
+        return await client.delete(path, params={"ids": ",".join(chunk)}, priority=PRIORITY_BULK)
+
+    result = await run_chunks(record_ids, send, (200, 207), client.config.bulk_concurrency)
+    get_record_cache().invalidate(module_name, record_ids)
+    return bulk_response(module_name, "deleted", len(record_ids), result)
+
+@mcp.tool()
+@instrument_tool
+async def export_records(
+    ctx: Context,
+    module_name: str,
+    format: str = "ndjson",
+    search_criteria: str | None = None,
+    fields: list[str] | None = None,
+    file_path: str | None = None,
+    max_records: int | None = None,
+):
+    """
+    Export every record of a module (or of a search) to a local file
+    
+    Walks all pages by itself, prefetching the next page while the current one
+    is written, and streams records to disk so memory stays constant.
+    Progress notifications are sent after each page.
+    
+    Args:
+        module_name: Module to export (e.g., 'Contacts', 'Leads')
+        format: 'ndjson' (default) or 'csv'
+        search_criteria: Optional search criteria; exports only matching records
+        fields: Optional list of field API names to fetch (and CSV columns)
+        file_path: Output file path (default: ZOHO_EXPORT_DIR/<module>-<timestamp>.<format>)
+        max_records: Optional cap on exported rows
+    """
+    client = get_client()
+
+    if format not in EXPORT_FORMATS:
         return {
             "status": "error",
             "module": module_name,
-            "message": response.text,
-            "code": response.status_code
+            "message": f"format must be one of {EXPORT_FORMATS}",
+            "code": 400
         }
 
+    path = f"/{module_name}/search" if search_criteria else f"/{module_name}"
+    base_params = {"per_page": 200}
+    if search_criteria:
+        base_params["criteria"] = search_criteria
+    if fields:
+        base_params["fields"] = ",".join(fields)
+
+    async def fetch_page(page: int):
+        return await client.get(path, params={**base_params, "page": page}, priority=PRIORITY_BULK)
+
+    async def on_page(pages: int, rows: int):
+        await report_progress(ctx, rows, message=f"{module_name}: {rows} records, {pages} pages")
+
+    file_path = file_path or default_export_path(client.config.export_dir, module_name, format)
+    writer = RecordWriter(file_path, format, fields)
+    started = time.perf_counter()
+    try:
+        pages, failure = await export_pages(fetch_page, writer, on_page, max_records)
+    finally:
+        writer.close()
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    result = {
+        "module": module_name,
+        "file_path": os.path.abspath(file_path),
+        "format": format,
+        "row_count": writer.rows,
+        "pages": pages,
+        "elapsed_ms": elapsed_ms
+    }
+    if failure is None:
+        return {"status": "success", **result}
+    if isinstance(failure, Exception):
+        return {"status": "error", **result, "message": f"{type(failure).__name__}: {failure}", "code": None}
+    return {"status": "error", **result, "message": failure.text, "code": failure.status_code}
+
+async def bulk_read_pages(
+    ctx: Context | None,
+    module_name: str,
+    fields: list[str] | None,
+    criteria: dict | None,
+    format: str,
+    file_path: str,
+    timeout_seconds: float,
+    page: int = 1,
+    job_id: str | None = None,
+) -> dict:
+    """
+    Выполняет Bulk Read задачи начиная со страницы `page` и дописывает результат в file_path;
+    с job_id задача для первой страницы уже создана (продолжение после таймаута)
+    """
+    from zoho_mcp.bulk_read import bulk_api_url, download_result, submit_read_job, wait_for_job
+    client = get_client()
+    jobs = []
+    records = 0
+    while True:
+        if job_id is None:
+            job_id, response = await submit_read_job(client, module_name, fields, criteria, page)
+            if job_id is None:
+                return {"status": "error", "module": module_name, "message": response.text, "code": response.status_code}
+
+        async def on_poll(job: dict, elapsed: float):
+            await report_progress(ctx, records, None, f"Bulk read page {page}: {job.get('state')} after {elapsed:.0f}s")
+
+        job, failure = await wait_for_job(
+            client, f"{bulk_api_url(client.config)}/read/{job_id}", client.config.bulk_poll_interval, timeout_seconds, on_poll
+        )
+        if failure == "timeout":
+            return {
+                "status": "pending",
+                "module": module_name,
+                "job_id": job_id,
+                "state": job.get("state"),
+                "message": f"Job still running; call get_bulk_read_job with download=true, file_path and page={page} "
+                           "later to continue into the same file",
+                "file_path": os.path.abspath(file_path),
+                "page": page,
+                "row_count": records,
+                "jobs": jobs,
+            }
+        if failure is not None:
+            return {"status": "error", "module": module_name, "job_id": job_id, "message": failure.text, "code": failure.status_code}
+        if job.get("state") != "COMPLETED":
+            return {"status": "error", "module": module_name, "job_id": job_id, "message": dumps(job).decode(), "code": None}
+
+        result = job.get("result") or {}
+        # Later pages (and a resumed export) append to the file without a second CSV header.
+        append = page > 1 and os.path.exists(file_path)
+        rows, failure = await download_result(client, result["download_url"], file_path, format, append=append)
+        if failure is not None:
+            return {"status": "error", "module": module_name, "job_id": job_id, "message": failure.text, "code": failure.status_code}
+        records += rows
+        jobs.append({"job_id": job_id, "page": page, "row_count": rows})
+        if not result.get("more_records"):
+            break
+        page += 1
+        job_id = None
+
+    return {
+        "status": "success",
+        "module": module_name,
+        "file_path": os.path.abspath(file_path),
+        "format": format,
+        "row_count": records,
+        "bytes": os.path.getsize(file_path) if os.path.exists(file_path) else 0,
+        "jobs": jobs,
+    }
+
+@mcp.tool()
+@instrument_tool
+async def bulk_read_records(
+    ctx: Context,
+    module_name: str,
+    fields: list[str] | None = None,
+    criteria: dict | None = None,
+    format: str = "csv",
+    file_path: str | None = None,
+    timeout_seconds: float = 900,
+):
+    """
+    Export a large module (100k+ records) with the Zoho Bulk Read API.
+
+    Submits a bulk read job, polls it with growing intervals, downloads the
+    result ZIP and streams its CSV to a local file; jobs for further pages
+    (200,000 records each) are submitted automatically. Nothing is held in
+    memory. Returns the file path and row count, not the data.
+    If a job outlives timeout_seconds the answer is "pending" with its
+    job_id, file_path and page: pass them to get_bulk_read_job to continue.
+
+    Args:
+        module_name: Module to export (e.g., 'Leads')
+        fields: Optional list of field API names (default: all fields)
+        criteria: Optional Bulk Read criteria, e.g.
+                  {"api_name": "Lead_Status", "comparator": "equal", "value": "New"}
+        format: "csv" (default) or "ndjson"
+        file_path: Output file (default: ZOHO_EXPORT_DIR/<module>-<timestamp>.<format>)
+        timeout_seconds: How long to wait for each job before returning its job_id (default: 900)
+    """
+    if format not in EXPORT_FORMATS:
+        return {"status": "error", "module": module_name, "message": f"format must be one of {EXPORT_FORMATS}", "code": None}
+    file_path = file_path or default_export_path(get_client().config.export_dir, module_name, format)
+    return await bulk_read_pages(ctx, module_name, fields, criteria, format, file_path, timeout_seconds)
+
+
 @mcp.tool()
-def get_record_by_id(ctx, module_name: str, record_id: str):
+@instrument_tool
+async def get_bulk_read_job(
+    ctx: Context,
+    job_id: str,
+    download: bool = False,
+    format: str = "csv",
+    file_path: str | None = None,
+    page: int | None = None,
+    timeout_seconds: float = 900,
+):
+    """
+    Get the state of a Bulk Read job, and optionally download its result.
+
+    With download=true and a COMPLETED job the result is written to
+    file_path, and jobs for the following pages are run until the export
+    is complete. To resume a bulk_read_records call that returned
+    "pending", pass its file_path and page: the rows are appended to that
+    file.
+
+    Args:
+        job_id: ID returned by bulk_read_records
+        download: Download the result if the job is COMPLETED (default: False)
+        format: "csv" (default) or "ndjson"
+        file_path: Output file (default: ZOHO_EXPORT_DIR/<module>-<timestamp>.<format>)
+        page: Page of the export this job reads (default: from the job)
+        timeout_seconds: How long to wait for each job of a following page (default: 900)
+    """
+    from zoho_mcp.bulk_read import bulk_api_url
+    client = get_client()
+    response = await client.get(f"{bulk_api_url(client.config)}/read/{job_id}", priority=PRIORITY_BULK)
+    if response.status_code != 200:
+        return {"status": "error", "job_id": job_id, "message": response.text, "code": response.status_code}
+    job = (parse_body(response).get("data") or [{}])[0]
+    answer = {"status": "success", "job_id": job_id, "state": job.get("state"), "job": job}
+    if not download or job.get("state") != "COMPLETED":
+        return answer
+
+    if format not in EXPORT_FORMATS:
+        return {"status": "error", "job_id": job_id, "message": f"format must be one of {EXPORT_FORMATS}", "code": None}
+    query = job.get("query") or {}
+    module_name = query.get("module") or "bulk_read"
+    if isinstance(module_name, dict):
+        module_name = module_name.get("api_name") or "bulk_read"
+    file_path = file_path or default_export_path(client.config.export_dir, module_name, format)
+    result = await bulk_read_pages(
+        ctx, module_name, query.get("fields"), query.get("criteria"), format, file_path, timeout_seconds,
+        page=page or query.get("page") or 1, job_id=job_id,
+    )
+    # A pending answer carries the job of the page that is still running.
+    return {"job_id": job_id, **result}
+
+
+@mcp.tool()
+@instrument_tool
+async def import_records(
+    ctx: Context,
+    module_name: str,
+    file_path: str,
+    format: str | None = None,
+    operation: str = "insert",
+    find_by: str | None = None,
+    timeout_seconds: float = 1800,
+):
+    """
+    Import a large CSV or NDJSON file (e.g. 50k leads) with the Zoho Bulk Write API.
+
+    The file is streamed into zipped CSV parts of up to 25,000 rows, each part
+    is uploaded and imported as a Bulk Write job, and the per-row results are
+    streamed into a results CSV (row, status, record_id, errors). Memory use
+    does not depend on the file size. Columns must be field API names.
+
+    Args:
+        module_name: Target module (e.g., 'Leads')
+        file_path: Local .csv or .ndjson file
+        format: "csv" or "ndjson" (default: from the file extension)
+        operation: "insert" (default), "update" or "upsert"
+        find_by: Field used to match existing records (required for update, e.g. 'id' or 'Email')
+        timeout_seconds: How long to wait for the jobs (default: 1800)
+    """
+    from zoho_mcp.bulk_read import absolute_url, bulk_api_url, download_path, remove_quietly, wait_for_job
+    from zoho_mcp.bulk_write import (
+        IMPORT_FORMATS, WRITE_OPERATIONS, ImportFileError, ImportSummary, create_write_job, read_columns, summarize_results,
+        upload_part, write_parts,
+    )
+    fmt = format or ("ndjson" if file_path.lower().endswith((".ndjson", ".jsonl")) else "csv")
+    if fmt not in IMPORT_FORMATS:
+        return {"status": "error", "module": module_name, "message": f"format must be one of {IMPORT_FORMATS}", "code": None}
+    if operation not in WRITE_OPERATIONS:
+        return {"status": "error", "module": module_name, "message": f"operation must be one of {WRITE_OPERATIONS}", "code": None}
+    if operation == "update" and not find_by:
+        return {"status": "error", "module": module_name, "message": "find_by is required for update", "code": None}
+    if not os.path.isfile(file_path):
+        return {"status": "error", "module": module_name, "message": f"File not found: {file_path}", "code": None}
+
+    client = get_client()
+    config = client.config
+    if not config.org_id:
+        return {"status": "error", "module": module_name, "message": "ZOHO_ORG_ID is required: Bulk Write uploads are sent with X-CRM-ORG", "code": None}
+    try:
+        columns = await asyncio.to_thread(read_columns, file_path, fmt)
+    except ImportFileError as ex:
+        return {"status": "error", "module": module_name, "message": str(ex), "code": None}
+    if not columns:
+        return {"status": "error", "module": module_name, "message": "The file has no columns", "code": None}
+
+    os.makedirs(config.export_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="zoho_import_", dir=config.export_dir)
+    results_path = default_export_path(config.export_dir, f"{module_name}-import", "csv")
+    summary = ImportSummary()
+    jobs = []
+    read_jobs = set()
+    errors = []
+    try:
+        try:
+            parts = await asyncio.to_thread(write_parts, file_path, fmt, columns, work_dir)
+        except ImportFileError as ex:
+            return {"status": "error", "module": module_name, "message": str(ex), "code": None}
+        total_rows = sum(part.rows for part in parts)
+
+        for index, part in enumerate(parts):
+            file_id, response = await upload_part(client, part)
+            if file_id is not None:
+                job_id, response = await create_write_job(client, module_name, file_id, columns, operation, find_by)
+                if job_id is not None:
+                    jobs.append({"job_id": job_id, "first_row": part.first_row, "rows": part.rows})
+                    await report_progress(ctx, index + 1, len(parts), f"Submitted part {index + 1} of {len(parts)}")
+                    continue
+            errors.append({"first_row": part.first_row, "rows": part.rows, "code": response.status_code, "message": response.text})
+
+        outcomes = await asyncio.gather(*(
+            wait_for_job(client, f"{bulk_api_url(config)}/write/{job['job_id']}", config.bulk_poll_interval,
+                         timeout_seconds, state_key="status")
+            for job in jobs
+        ))
+
+        with open(results_path, "w", encoding="utf-8", newline="") as results_file:
+            out = csv.writer(results_file)
+            out.writerow(["row", "status", "record_id", "errors"])
+            for job, (details, failure) in zip(jobs, outcomes):
+                job["state"] = (details or {}).get("status")
+                error = {"job_id": job["job_id"], "first_row": job["first_row"], "rows": job["rows"]}
+                if failure == "timeout":
+                    errors.append({**error, "code": None, "message": "Job did not finish within timeout_seconds"})
+                    continue
+                if failure is not None:
+                    errors.append({**error, "code": failure.status_code, "message": failure.text})
+                    continue
+                download_url = (details.get("result") or {}).get("download_url")
+                if job["state"] != "COMPLETED" or not download_url:
+                    errors.append({**error, "code": None, "message": dumps(details).decode()})
+                    continue
+
+                zip_path = download_path(os.path.join(work_dir, job["job_id"]))
+                response = await client.get(absolute_url(config, download_url), stream_to=zip_path, priority=PRIORITY_BULK)
+                if response.status_code != 200:
+                    errors.append({**error, "code": response.status_code, "message": response.text})
+                    continue
+                updated = await asyncio.to_thread(summarize_results, zip_path, job["first_row"], summary, out)
+                get_record_cache().invalidate(module_name, updated)
+                read_jobs.add(job["job_id"])
+                remove_quietly(zip_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if operation != "insert" and any(job["job_id"] not in read_jobs for job in jobs):
+            # A job whose result file was not read (failed, timed out, still running)
+            # may have changed any record of the module.
+            get_record_cache().invalidate_module(module_name)
+
+    # Rows Zoho rejected count as failures, like failed parts and jobs.
+    if not errors and not summary.failed:
+        status = "success"
+    else:
+        status = "partial_success" if summary.rows > summary.failed else "error"
+    return {
+        "status": status,
+        "module": module_name,
+        "operation": operation,
+        "row_count": total_rows,
+        "processed": summary.rows,
+        **summary.counts,
+        "failed": summary.failed,
+        "failures": summary.failures,
+        "results_file": os.path.abspath(results_path),
+        "jobs": jobs,
+        "errors": errors if errors else None,
+    }
+
+
+@mcp.tool()
+@instrument_tool
+async def get_record_by_id(
+    ctx: Context,
+    module_name: str,
+    record_id: str,
+    bypass_cache: bool = False,
+    fields: list[str] | None = None,
+    slim: bool = False,
+    source: str = "remote",
+):
     """
     Get a specific record by its ID
     
     Args:
         module_name: Module containing the record (e.g., 'Contacts', 'Leads')
         record_id: ID of the record to retrieve
+        bypass_cache: Skip the local record cache and read straight from Zoho (default: False)
+        fields: Optional list of field API names to return
+        slim: Drop null values and internal `$`-prefixed keys from the record (default: False)
+        source: "remote" (default) or "local" to read the SQLite mirror, reporting its staleness
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
+    client = get_client()
+    record_cache = get_record_cache()
+    if source not in READ_SOURCES:
+        return {"status": "error", "module": module_name, "message": f"source must be one of {READ_SOURCES}", "code": None}
 
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json"
-    }
-    
-    url = f"{zoho_config.base_url}/{module_name}/{record_id}"
-    
-    response = requests.get(url, headers=headers)
+    if source == "local":
+        mirror, freshness = await local_mirror_for(module_name)
+        if mirror is None:
+            return freshness
+        record = await asyncio.to_thread(mirror.get, module_name, record_id)
+        if record is None:
+            return {
+                "status": "error",
+                "module": module_name,
+                "record_id": record_id,
+                "message": "Record not found in the local mirror",
+                "code": 404,
+                **freshness
+            }
+        return {
+            "status": "success",
+            "module": module_name,
+            "record_id": record_id,
+            "source": "local",
+            **freshness,
+            "data": shape_records([record], fields, slim)[0]
+        }
+
+    if not bypass_cache:
+        cached = record_cache.get(module_name, record_id)
+        if cached is not None:
+            return {
+                "status": "success",
+                "module": module_name,
+                "record_id": record_id,
+                "data": shape_records([cached], fields, slim)[0]
+            }
+
+    path = f"/{module_name}/{record_id}"
+    generation = record_cache.generation(module_name, record_id)
+
+    response = await client.get(path, hedge=True)
     
     if response.status_code == 200:
-        result = response.json()
+        result = parse_body(response)
         data = result.get("data", [])
+        if data:
+            # The full record is cached; projection is applied per call.
+            record_cache.put(module_name, record_id, data[0], generation)
         return {
             "status": "success",
             "module": module_name,
             "record_id": record_id,
-            "data": data[0] if data else None
+            "data": shape_records(data[:1], fields, slim)[0] if data else None
         }
     else:
         return {
@@ -562,6 +1515,135 @@ def get_record_by_id(ctx, module_name: str, record_id: str):
             "code": response.status_code
         }
 
+@mcp.tool()
+@instrument_tool
+async def get_records_by_ids(
+    ctx: Context,
+    module_name: str,
+    record_ids: list[str],
+    bypass_cache: bool = False,
+    fields: list[str] | None = None,
+    slim: bool = False,
+):
+    """
+    Get many records of one module by ID (e.g. the lookups behind a list of deals)
+
+    IDs are deduplicated and read with Zoho's multi-ID GET (/{module}?ids=...),
+    up to 100 per request and below the URL length limit, chunks in parallel.
+    IDs found in the record cache are not requested again.
+
+    Args:
+        module_name: Module containing the records (e.g., 'Contacts', 'Accounts')
+        record_ids: IDs of the records to retrieve
+        bypass_cache: Skip the local record cache and read straight from Zoho (default: False)
+        fields: Optional list of field API names to return
+        slim: Drop null values and internal `$`-prefixed keys from the records (default: False)
+
+    Returns:
+        data: records keyed by ID, in input order; not_found lists IDs Zoho did not return
+    """
+    client = get_client()
+    record_cache = get_record_cache()
+    record_ids = list(dict.fromkeys(str(record_id).strip() for record_id in record_ids if str(record_id).strip()))
+    if not record_ids:
+        return {"status": "error", "module": module_name, "message": "record_ids must not be empty", "code": None}
+
+    records = {}
+    if not bypass_cache:
+        for record_id in record_ids:
+            cached = record_cache.get(module_name, record_id)
+            if cached is not None:
+                records[record_id] = cached
+    cached_count = len(records)
+
+    path = f"/{module_name}"
+    budget = MAX_URL_LENGTH - len(client.config.base_url) - len(path) - len("?ids=")
+    chunks = chunk_ids([record_id for record_id in record_ids if record_id not in records], budget)
+    semaphore = asyncio.Semaphore(max(1, client.config.bulk_concurrency))
+    generations = {
+        record_id: record_cache.generation(module_name, record_id) for chunk in chunks for record_id in chunk
+    }
+
+    async def fetch(chunk: list[str]):
+        async with semaphore:
+            return await client.get(path, params={"ids": ",".join(chunk)})
+
+    responses = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+
+    errors, failed_ids = [], set()
+    for index, (chunk, response) in enumerate(zip(chunks, responses)):
+        if response.status_code == 204:
+            continue
+        if response.status_code != 200:
+            errors.append({"chunk": index, "count": len(chunk), "code": response.status_code, "message": response.text})
+            failed_ids.update(chunk)
+            continue
+        for record in parse_body(response).get("data", []) or []:
+            if record["id"] in generations:
+                record_cache.put(module_name, record["id"], record, generations[record["id"]])
+            records[record["id"]] = record
+
+    if errors and not records:
+        return {
+            "status": "error",
+            "module": module_name,
+            "message": errors[0]["message"],
+            "code": errors[0]["code"],
+            "errors": errors
+        }
+
+    found = [record_id for record_id in record_ids if record_id in records]
+    result = {
+        "status": "partial_success" if errors else "success",
+        "module": module_name,
+        "count": len(found),
+        "requests": len(chunks),
+        "cached": cached_count,
+        "data": dict(zip(found, shape_records([records[record_id] for record_id in found], fields, slim))),
+        "not_found": [record_id for record_id in record_ids if record_id not in records and record_id not in failed_ids],
+    }
+    if errors:
+        result["errors"] = errors
+    return result
+
+@mcp.resource("metrics://zoho-mcp", mime_type="application/json")
+def get_server_metrics() -> dict:
+    """Tool and Zoho call latency histograms, in-flight counts, status codes, token refreshes, cache hit rates and API credits"""
+    client = get_client()
+    return {
+        **get_metrics().snapshot(),
+        "caches": cache_stats(),
+        "scheduler": client.scheduler.status(),
+        **client.resilience_status(),
+    }
+
+@mcp.resource("result://{handle}/{offset}/{limit}", mime_type="application/json")
+async def get_result_resource(handle: str, offset: int, limit: int) -> dict:
+    """Records [offset, offset + limit) of a result stored by get_module_data or search_records, without calling Zoho"""
+    result = await read_result(handle, offset, limit)
+    if result["status"] == "error":
+        raise ValueError(result["message"])
+    return result
+
+
+@mcp.tool()
+@instrument_tool
+async def get_result_slice(ctx: Context, result_handle: str, offset: int = 0, limit: int = 50, fields: list[str] | None = None):
+    """
+    Read part of a large result that get_module_data or search_records kept on the server.
+
+    Same as the result://{handle}/{offset}/{limit} resource, for clients that only call tools.
+    Served from memory or the server's spill file; Zoho is not called again.
+
+    Args:
+        result_handle: The result_handle returned by the tool
+        offset: First record to return (default: 0)
+        limit: Number of records (default: 50, max: 1000)
+        fields: Optional list of field names to keep
+    """
+    return await read_result(result_handle, offset, limit, fields)
+
+
 @mcp.resource("greeting://{name}")
 def get_greeting(name: str) -> str:
     """Get a personalized greeting"""
@@ -569,37 +1651,18 @@ def get_greeting(name: str) -> str:
 
 
 @mcp.tool()
-def get_module_fields(ctx, module_name: str):
+@instrument_tool
+async def get_module_fields(ctx: Context, module_name: str):
     """
     Get Zoho CRM module fields metadata including API names and picklist values.
     """
-    ensure_valid_token()
-    access_token = get_access_token()
-    zoho_config = get_zoho_config()
-
-    headers = {
-        "Authorization": f"Zoho-oauthtoken {access_token}",
-        "Content-Type": "application/json",
-    }
+    client = get_client()
 
-    url = f"{zoho_config.base_url}/settings/fields?module={module_name}"
-    response = requests.get(url, headers=headers)
+    result, response = await get_metadata_cache().fetch(
+        client, "fields", "/settings/fields", parse_fields, params={"module": module_name}
+    )
 
-    if response.status_code == 200:
-        body = response.json()
-        fields = body.get("fields", [])
-        # normalize output to essential info
-        result = []
-        for f in fields:
-            entry = {
-                "api_name": f.get("api_name"),
-                "field_label": f.get("field_label"),
-                "data_type": f.get("data_type"),
-                "system_mandatory": f.get("system_mandatory"),
-            }
-            if f.get("pick_list_values"):
-                entry["pick_list_values"] = [v.get("actual_value") for v in f.get("pick_list_values", [])]
-            result.append(entry)
+    if result is not None:
         return {"status": "success", "module": module_name, "count": len(result), "fields": result}
     else:
         return {
@@ -610,7 +1673,95 @@ def get_module_fields(ctx, module_name: str):
         }
 
 
+@mcp.tool()
+@instrument_tool
+async def sync_local_mirror(ctx: Context, module_name: str | None = None):
+    """
+    Pull changes from Zoho into the local SQLite mirror used by source="local".
+
+    The first run copies every record; later runs only fetch records modified
+    since the previous sync (If-Modified-Since) and drop deleted ones.
+
+    Args:
+        module_name: Module to sync; if None, all configured modules
+    """
+    from zoho_mcp.mirror import get_mirror
+    mirror = get_mirror()
+    if mirror is None:
+        return {"status": "error", "message": "Local mirror is disabled; set ZOHO_MIRROR_DB to enable it", "code": None}
+    client = get_client()
+    modules = [module_name] if module_name else client.config.modules
+    results = await mirror.sync(client, modules)
+    failed = [result for result in results if "error" in result]
+    return {
+        "status": "success" if not failed else ("partial_success" if len(failed) < len(results) else "error"),
+        "modules": results,
+    }
+
+
+@mcp.tool()
+@instrument_tool
+async def get_rate_limit_status(ctx: Context):
+    """
+    Get the state of the request scheduler: in-flight and queued calls,
+    rate-limit tokens, 429 retries and API credit usage, plus the circuit
+    breaker state and hedged request count.
+    """
+    client = get_client()
+    return {"status": "success", "scheduler": client.scheduler.status(), **client.resilience_status()}
+
+
+@mcp.tool()
+@instrument_tool
+async def get_cache_stats(ctx: Context):
+    """
+    Get hit/miss counters of the server-side caches (metadata TTL cache
+    and get_record_by_id LRU cache) and the usage of the result store.
+    """
+    return {
+        "status": "success",
+        "metadata": get_metadata_cache().stats_dict(),
+        "records": get_record_cache().stats_dict(),
+        "results": get_result_store().stats_dict(),
+    }
+
+
+@mcp.tool()
+@instrument_tool
+async def reload_config(ctx: Context):
+    """
+    Re-read .env and the ZOHO_* environment and apply the new settings without a restart.
+
+    The configuration is otherwise loaded and validated once at startup. An
+    invalid value leaves the running configuration untouched. A new HTTP client
+    (pool, timeouts, scheduler, breaker) takes over for new calls; calls in
+    progress finish on the old one. Only the names of changed settings are
+    returned, never their values.
+    """
+    try:
+        old, new = reload_zoho_config()
+    except ValueError as ex:
+        return {"status": "error", "message": str(ex), "code": None}
+    changed = changed_fields(old, new)
+    applied = [name for name in changed if name not in RESTART_FIELDS]
+    identity_changed = any(name in IDENTITY_FIELDS for name in changed)
+    if identity_changed:
+        expire_access_token()
+    if applied:
+        replace_client(identity_changed)
+    if any(name in IDENTITY_FIELDS or name in CACHE_FIELDS for name in changed):
+        reset_caches()
+    return {
+        "status": "success",
+        "changed": changed,
+        "applied": applied,
+        "restart_required": [name for name in changed if name in RESTART_FIELDS],
+    }
+
+
 def run():
+    # Fail fast on a bad configuration instead of on the first tool call.
+    get_zoho_config()
     mcp.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+from bisect import bisect_left
+from typing import Callable
+import asyncio
+import functools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# API credit headers Zoho sends with CRM responses -> snapshot key
+CREDIT_HEADERS = {
+    "X-RATELIMIT-DAY-LIMIT": "day_limit",
+    "X-RATELIMIT-DAY-REMAINING": "day_remaining",
+    "X-RATELIMIT-LIMIT": "window_limit",
+    "X-RATELIMIT-REMAINING": "window_remaining",
+    "X-RATELIMIT-RESET": "window_reset",
+}
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total, result = 0, []
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "sum_seconds": round(self.sum, 6), "buckets": dict(self.cumulative())}
+
+
+class Metrics:
+    """
+    In-process metrics of tool calls and upstream Zoho calls.
+
+    Tool calls: latency histogram, calls by result status, in-flight gauge
+    per tool. Zoho calls: latency histogram per endpoint kind and method
+    (the whole client.request, including scheduling and retries), responses
+    by status code, requests on the wire, and the API credit headers of the
+    latest response, and GETs answered by another caller's identical call
+    (coalesced). Everything is updated on the event loop thread.
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.tool_latency: dict[str, Histogram] = {}
+        self.tool_calls: dict[tuple[str, str], int] = {}
+        self.tool_in_flight: dict[str, int] = {}
+        self.upstream_latency: dict[tuple[str, str], Histogram] = {}
+        self.upstream_responses: dict[tuple[str, str], int] = {}
+        self.upstream_in_flight = 0
+        self.upstream_coalesced: dict[str, int] = {}
+        self.token_refreshes: dict[str, int] = {"success": 0, "failure": 0}
+        self.credits: dict[str, float] = {}
+        self.credits_consumed = 0
+
+    def tool_started(self, tool: str):
+        self.tool_in_flight[tool] = self.tool_in_flight.get(tool, 0) + 1
+
+    def tool_finished(self, tool: str, status: str, seconds: float):
+        self.tool_in_flight[tool] -= 1
+        self.tool_latency.setdefault(tool, Histogram()).observe(seconds)
+        self.tool_calls[(tool, status)] = self.tool_calls.get((tool, status), 0) + 1
+
+    def observe_upstream(self, kind: str, method: str, status_code: int, seconds: float):
+        self.upstream_latency.setdefault((kind, method), Histogram()).observe(seconds)
+        key = (kind, str(status_code))
+        self.upstream_responses[key] = self.upstream_responses.get(key, 0) + 1
+
+    def observe_coalesced(self, kind: str):
+        self.upstream_coalesced[kind] = self.upstream_coalesced.get(kind, 0) + 1
+
+    def observe_credits(self, headers):
+        """Keeps the latest credit headers; a drop in the daily remainder counts as consumption"""
+        for header, key in CREDIT_HEADERS.items():
+            value = headers.get(header)
+            if value is None:
+                continue
+            try:
+                value = float(value)
+            except ValueError:
+                continue
+            if key == "day_remaining" and value < self.credits.get(key, value):
+                self.credits_consumed += int(self.credits[key] - value)
+            self.credits[key] = value
+
+    def token_refreshed(self, ok: bool):
+        self.token_refreshes["success" if ok else "failure"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "tools": {
+                tool: {
+                    "in_flight": self.tool_in_flight.get(tool, 0),
+                    "calls": {status: count for (name, status), count in self.tool_calls.items() if name == tool},
+                    "latency": histogram.as_dict(),
+                }
+                for tool, histogram in sorted(self.tool_latency.items())
+            },
+            "upstream": {
+                "in_flight": self.upstream_in_flight,
+                "latency": {f"{kind} {method}": histogram.as_dict() for (kind, method), histogram in sorted(self.upstream_latency.items())},
+                "responses": {f"{kind} {code}": count for (kind, code), count in sorted(self.upstream_responses.items())},
+                "coalesced": dict(sorted(self.upstream_coalesced.items())),
+            },
+            "token_refreshes": dict(self.token_refreshes),
+            "api_credits": {**self.credits, "consumed": self.credits_consumed},
+        }
+
+
+def tool_status(result) -> str:
+    """The `status` of a tool's dict result (success, error, partial_success, pending)"""
+    if isinstance(result, dict):
+        return str(result.get("status") or "success")
+    return "success"
+
+
+def instrument_tool(fn: Callable) -> Callable:
+    """Records latency, in-flight count and result status of an async tool"""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        metrics = get_metrics()
+        metrics.tool_started(name)
+        started = time.perf_counter()
+        status = "exception"
+        try:
+            result = await fn(*args, **kwargs)
+            status = tool_status(result)
+            return result
+        finally:
+            metrics.tool_finished(name, status, time.perf_counter() - started)
+
+    return wrapper
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _histogram_lines(name: str, help_text: str, histograms: dict[tuple, Histogram], label_names: tuple[str, ...]) -> list[str]:
+    lines = [f"# TYPE {name} histogram", f"# UNIT {name} seconds", f"# HELP {name} {help_text}"]
+    for key, histogram in sorted(histograms.items()):
+        labels = dict(zip(label_names, key))
+        for bound, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+        lines.append(f"{name}_sum{_labels(**labels)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
+
+
+def _family(name: str, kind: str, help_text: str, samples: list[tuple[dict, float]]) -> list[str]:
+    suffix = "_total" if kind == "counter" else ""
+    lines = [f"# TYPE {name} {kind}", f"# HELP {name} {help_text}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        lines.append(f"{name}{suffix}{_labels(**labels) if labels else ''} {_number(value)}")
+    return lines
+
+
+def render_openmetrics(metrics: Metrics, caches: dict[str, dict], scheduler: dict) -> str:
+    """
+    OpenMetrics text exposition of `metrics`, plus cache counters
+    (name -> CacheStats.as_dict()) and scheduler counters.
+    """
+    lines = []
+    lines += _histogram_lines(
+        "zoho_mcp_tool_duration_seconds", "Tool call latency.",
+        {(tool,): histogram for tool, histogram in metrics.tool_latency.items()}, ("tool",),
+    )
+    lines += _family("zoho_mcp_tool_calls", "counter", "Tool calls by result status.",
+                     [({"tool": tool, "status": status}, count) for (tool, status), count in sorted(metrics.tool_calls.items())])
+    lines += _family("zoho_mcp_tool_in_flight", "gauge", "Tool calls in progress.",
+                     [({"tool": tool}, count) for tool, count in sorted(metrics.tool_in_flight.items())])
+    lines += _histogram_lines(
+        "zoho_mcp_upstream_duration_seconds", "Zoho call latency including scheduling and retries.",
+        metrics.upstream_latency, ("endpoint", "method"),
+    )
+    lines += _family("zoho_mcp_upstream_responses", "counter", "Zoho responses by status code (synthetic 5xx/429 included).",
+                     [({"endpoint": kind, "code": code}, count) for (kind, code), count in sorted(metrics.upstream_responses.items())])
+    lines += _family("zoho_mcp_upstream_coalesced", "counter", "GETs answered by a concurrent identical call instead of their own request.",
+                     [({"endpoint": kind}, count) for kind, count in sorted(metrics.upstream_coalesced.items())])
+    lines += _family("zoho_mcp_upstream_in_flight", "gauge", "Requests to Zoho on the wire.", [({}, metrics.upstream_in_flight)])
+    lines += _family("zoho_mcp_token_refreshes", "counter", "OAuth access token refreshes.",
+                     [({"result": result}, count) for result, count in metrics.token_refreshes.items()])
+    lines += _family("zoho_mcp_api_credits", "gauge", "API credit headers of the latest Zoho response.",
+                     [({"header": key}, value) for key, value in sorted(metrics.credits.items())])
+    lines += _family("zoho_mcp_api_credits_consumed", "counter", "API credits consumed, from the daily remaining header.",
+                     [({}, metrics.credits_consumed)])
+    for field in ("hits", "misses", "revalidated"):
+        lines += _family(f"zoho_mcp_cache_{field}", "counter", f"Cache {field}.",
+                         [({"cache": name}, stats.get(field)) for name, stats in sorted(caches.items())])
+    lines += _family("zoho_mcp_cache_hit_ratio", "gauge", "Cache hits (and 304 revalidations) per lookup.",
+                     [({"cache": name}, stats.get("hit_rate")) for name, stats in sorted(caches.items())])
+    for field in ("throttled", "retries"):
+        lines += _family(f"zoho_mcp_scheduler_{field}", "counter", f"Scheduler {field} (HTTP 429).", [({}, scheduler.get(field))])
+    lines += _family("zoho_mcp_scheduler_queued", "gauge", "Zoho calls waiting for the scheduler.", [({}, scheduler.get("queued"))])
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+async def serve_metrics(host: str, port: int, render: Callable[[], str]) -> asyncio.Server:
+    """Minimal HTTP endpoint answering GET /metrics with render() for scrapers"""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, content_type, body = "200 OK", OPENMETRICS_CONTENT_TYPE, render().encode()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except Exception as ex:
+            logger.warning(f"Metrics request failed: {ex}")
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+_metrics: Metrics | None = None
+
+def get_metrics() -> Metrics:
+    global _metrics
+    if _metrics is None:
+        _metrics = Metrics()
+    return _metrics
@@ -0,0 +1,388 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from zoho_mcp.client import get_client
+from zoho_mcp.config import get_zoho_config
+from zoho_mcp.jsonlib import dumps, loads
+from zoho_mcp.scheduler import PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    module TEXT NOT NULL,
+    id TEXT NOT NULL,
+    modified_time TEXT,
+    data TEXT NOT NULL,
+    email TEXT,
+    phone TEXT,
+    mobile TEXT,
+    PRIMARY KEY (module, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    module TEXT PRIMARY KEY,
+    modified_since TEXT,
+    deleted_since TEXT,
+    synced_at REAL
+);
+"""
+
+# Lower-cased copies of these fields live in their own indexed columns.
+KEY_COLUMNS = {"email": "Email", "phone": "Phone", "mobile": "Mobile"}
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS records_email ON records (module, email);
+CREATE INDEX IF NOT EXISTS records_phone ON records (module, phone);
+CREATE INDEX IF NOT EXISTS records_mobile ON records (module, mobile);
+"""
+
+
+def key_values(record: dict) -> tuple:
+    return tuple(
+        str(record[field]).lower() if record.get(field) is not None else None
+        for field in KEY_COLUMNS.values()
+    )
+
+
+def index_text(record: dict) -> str:
+    """Text that the full-text index sees: scalar values and lookup names, without ids and `$` keys"""
+    words = []
+    for key, value in record.items():
+        if key == "id" or key.startswith("$") or value is None:
+            continue
+        if isinstance(value, dict):
+            value = value.get("name")
+        elif isinstance(value, list):
+            value = " ".join(str(item.get("name", "")) if isinstance(item, dict) else str(item) for item in value)
+        if value is not None and not isinstance(value, bool):
+            words.append(str(value))
+    return " ".join(words)
+
+
+def fts_query(word: str) -> str:
+    """Every whitespace-separated term must appear; terms are quoted so FTS5 syntax is not interpreted"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in word.split())
+
+
+def to_utc_iso(value: str) -> str:
+    """Normalizes a Zoho timestamp ('2024-05-01T10:00:00+02:00') to UTC, so values compare as strings"""
+    return datetime.fromisoformat(value).astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def sql_utc_iso(value):
+    """utc_iso() in the mirror's SQL: to_utc_iso for timestamps, NULL for anything else (dates included)"""
+    if not isinstance(value, str) or "T" not in value:
+        return None
+    try:
+        return to_utc_iso(value)
+    except ValueError:
+        return None
+
+
+def server_time(response: httpx.Response) -> str:
+    """Zoho's own clock from the Date header (falls back to ours), as UTC ISO 8601"""
+    date = response.headers.get("Date")
+    moment = parsedate_to_datetime(date) if date else datetime.now(timezone.utc)
+    return moment.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+class LocalMirror:
+    """
+    SQLite copy of the configured CRM modules for credit-free local reads.
+
+    The first sync of a module pulls every record. Later syncs send
+    If-Modified-Since with the newest Modified_Time already stored, so
+    only changed records come back (or a bare 304), and remove records
+    reported by the /{module}/deleted endpoint since the previous sync.
+    Pages are requested in Modified_Time order and the watermark is saved
+    with each page, so an interrupted sync resumes where it stopped.
+
+    Email, Phone and Mobile are copied into B-tree indexed columns and all
+    text values into an FTS5 table (when SQLite is built with it), so
+    search_records can be answered locally.
+
+    The synchronous methods block on SQLite behind one lock (held by a
+    sync while it stores a page), so async code calls them through
+    asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, per_page: int = 200):
+        self.path = path
+        self.per_page = per_page
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.create_function("utc_iso", 1, sql_utc_iso, deterministic=True)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            self._migrate()
+            self._db.executescript(INDEXES)
+            self.fts = self._create_fts()
+            self._db.commit()
+        self._sync_locks: dict[str, asyncio.Lock] = {}
+
+    def _migrate(self):
+        """Mirrors created before the search index existed get the key columns backfilled"""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(records)")}
+        for column, field in KEY_COLUMNS.items():
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE records ADD COLUMN {column} TEXT")
+                self._db.execute(f"UPDATE records SET {column} = lower(json_extract(data, '$.{field}'))")
+
+    def _create_fts(self) -> bool:
+        exists = self._db.execute("SELECT 1 FROM sqlite_master WHERE name = 'records_fts'").fetchone()
+        if exists:
+            return True
+        try:
+            self._db.execute("CREATE VIRTUAL TABLE records_fts USING fts5(body)")
+        except sqlite3.OperationalError:
+            logger.warning("SQLite is built without FTS5; word search will go to Zoho")
+            return False
+        self._db.executemany(
+            "INSERT INTO records_fts (rowid, body) VALUES (?, ?)",
+            ((rowid, index_text(loads(data))) for rowid, data in self._db.execute("SELECT rowid, data FROM records").fetchall()),
+        )
+        return True
+
+    async def sync(self, client, modules: list[str]) -> list[dict]:
+        return list(await asyncio.gather(*(self.sync_module(client, module) for module in modules)))
+
+    async def sync_module(self, client, module: str) -> dict:
+        """Pulls changes of one module; returns counters or an `error` entry"""
+        lock = self._sync_locks.setdefault(module, asyncio.Lock())
+        async with lock:
+            started = time.time()
+            state = await asyncio.to_thread(self.state, module) or {}
+            summary = {"module": module, "full": not state.get("modified_since"),
+                       "upserted": 0, "deleted": 0, "pages": 0}
+
+            modified_since = state.get("modified_since")
+            deleted_since = state.get("deleted_since")
+            page = 1
+            while True:
+                headers = {"If-Modified-Since": modified_since} if modified_since else {}
+                response = await client.get(
+                    f"/{module}",
+                    params={"page": page, "per_page": self.per_page, "sort_by": "Modified_Time", "sort_order": "asc"},
+                    headers=headers,
+                    priority=PRIORITY_BULK,
+                )
+                if deleted_since is None:
+                    # First sync: earlier deletions never reached the mirror.
+                    deleted_since = server_time(response)
+                    await asyncio.to_thread(self._start_deleted_watermark, module, deleted_since)
+                if response.status_code in (204, 304):
+                    break
+                if response.status_code != 200:
+                    return {**summary, "error": {"code": response.status_code, "message": response.text}}
+
+                body = loads(response.content)
+                records = body.get("data", []) or []
+                summary["upserted"] += await asyncio.to_thread(self._store_page, module, records)
+                summary["pages"] += 1
+                if not body.get("info", {}).get("more_records", False):
+                    break
+                page += 1
+
+            deleted, deleted_since, error = await self._pull_deleted(client, module, state.get("deleted_since"), deleted_since)
+            summary["deleted"] = deleted
+            if error is not None:
+                return {**summary, "error": error}
+            await asyncio.to_thread(self._finish_sync, module, deleted_since, started)
+            summary["record_count"] = await asyncio.to_thread(self.count, module)
+            return summary
+
+    async def _pull_deleted(self, client, module: str, since: str | None, watermark: str) -> tuple[int, str, dict | None]:
+        if since is None:
+            return 0, watermark, None
+        deleted = 0
+        page = 1
+        while True:
+            response = await client.get(
+                f"/{module}/deleted",
+                params={"type": "all", "page": page, "per_page": self.per_page},
+                headers={"If-Modified-Since": since},
+                priority=PRIORITY_BULK,
+            )
+            if response.status_code in (204, 304):
+                break
+            if response.status_code != 200:
+                return deleted, since, {"code": response.status_code, "message": response.text}
+            body = loads(response.content)
+            entries = body.get("data", []) or []
+            deleted += await asyncio.to_thread(self._delete_ids, module, [entry["id"] for entry in entries])
+            for entry in entries:
+                if entry.get("deleted_time"):
+                    watermark = max(watermark, to_utc_iso(entry["deleted_time"]))
+            if not body.get("info", {}).get("more_records", False):
+                break
+            page += 1
+        return deleted, max(watermark, since), None
+
+    def _store_page(self, module: str, records: list[dict]) -> int:
+        rows = [
+            (module, record["id"], to_utc_iso(record["Modified_Time"]) if record.get("Modified_Time") else None,
+             dumps(record).decode(), *key_values(record))
+            for record in records
+        ]
+        newest = max((row[2] for row in rows if row[2]), default=None)
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO records (module, id, modified_time, data, email, phone, mobile) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (module, id) DO UPDATE SET modified_time = excluded.modified_time, data = excluded.data, "
+                "email = excluded.email, phone = excluded.phone, mobile = excluded.mobile",
+                rows,
+            )
+            if self.fts:
+                rowids = self._rowids(module, [record["id"] for record in records])
+                self._db.executemany("DELETE FROM records_fts WHERE rowid = ?", [(rowid,) for rowid in rowids.values()])
+                self._db.executemany(
+                    "INSERT INTO records_fts (rowid, body) VALUES (?, ?)",
+                    [(rowids[record["id"]], index_text(record)) for record in records],
+                )
+            if newest is not None:
+                self._db.execute(
+                    "INSERT INTO sync_state (module, modified_since) VALUES (?, ?) "
+                    "ON CONFLICT (module) DO UPDATE SET modified_since = max(coalesce(modified_since, ''), excluded.modified_since)",
+                    (module, newest),
+                )
+            self._db.commit()
+        return len(rows)
+
+    def _rowids(self, module: str, ids: list[str]) -> dict[str, int]:
+        rowids = {}
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            marks = ", ".join("?" for _ in batch)
+            rowids.update(self._db.execute(
+                f"SELECT id, rowid FROM records WHERE module = ? AND id IN ({marks})", (module, *batch)
+            ).fetchall())
+        return rowids
+
+    def _delete_ids(self, module: str, ids: list[str]) -> int:
+        with self._lock:
+            if self.fts:
+                rowids = self._rowids(module, ids)
+                self._db.executemany("DELETE FROM records_fts WHERE rowid = ?", [(rowid,) for rowid in rowids.values()])
+            cursor = self._db.executemany("DELETE FROM records WHERE module = ? AND id = ?", [(module, i) for i in ids])
+            self._db.commit()
+            return cursor.rowcount
+
+    def _start_deleted_watermark(self, module: str, deleted_since: str):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sync_state (module, deleted_since) VALUES (?, ?) "
+                "ON CONFLICT (module) DO UPDATE SET deleted_since = coalesce(deleted_since, excluded.deleted_since)",
+                (module, deleted_since),
+            )
+            self._db.commit()
+
+    def _finish_sync(self, module: str, deleted_since: str, synced_at: float):
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sync_state (module, deleted_since, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (module) DO UPDATE SET deleted_since = excluded.deleted_since, synced_at = excluded.synced_at",
+                (module, deleted_since, synced_at),
+            )
+            self._db.commit()
+
+    def state(self, module: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT modified_since, deleted_since, synced_at FROM sync_state WHERE module = ?", (module,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"modified_since": row[0], "deleted_since": row[1], "synced_at": row[2]}
+
+    def staleness(self, module: str) -> dict | None:
+        """When the module was last fully synced; None if it never was"""
+        state = self.state(module)
+        if not state or not state["synced_at"]:
+            return None
+        return {
+            "synced_at": datetime.fromtimestamp(state["synced_at"], timezone.utc).isoformat(timespec="seconds"),
+            "staleness_seconds": round(time.time() - state["synced_at"], 1),
+        }
+
+    def count(self, module: str) -> int:
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM records WHERE module = ?", (module,)).fetchone()[0]
+
+    def page(self, module: str, limit: int, offset: int = 0) -> list[dict]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT data FROM records WHERE module = ? ORDER BY modified_time DESC, id LIMIT ? OFFSET ?",
+                (module, limit, offset),
+            ).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def get(self, module: str, record_id: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM records WHERE module = ? AND id = ?", (module, record_id)
+            ).fetchone()
+        return loads(row[0]) if row else None
+
+    def search(self, module: str, where: str, params: list, limit: int, offset: int = 0) -> list[dict]:
+        """Records of `module` matching a WHERE clause built by criteria.to_sql"""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT data FROM records WHERE module = ? AND ({where}) ORDER BY modified_time DESC, id LIMIT ? OFFSET ?",
+                (module, *params, limit, offset),
+            ).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def search_words(self, module: str, word: str, limit: int, offset: int = 0) -> list[dict]:
+        """Full-text search over the indexed text values, best matches first"""
+        query = fts_query(word)
+        if not query:
+            # An empty MATCH is an FTS5 syntax error; no terms match nothing.
+            return []
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT records.data FROM records_fts JOIN records ON records.rowid = records_fts.rowid "
+                "WHERE records_fts MATCH ? AND records.module = ? ORDER BY records_fts.rank LIMIT ? OFFSET ?",
+                (query, module, limit, offset),
+            ).fetchall()
+        return [loads(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_mirror: LocalMirror | None = None
+
+def get_mirror() -> LocalMirror | None:
+    """Returns the local mirror, or None when ZOHO_MIRROR_DB is not set"""
+    global _mirror
+    if _mirror is None:
+        path = get_zoho_config().mirror_db
+        if path:
+            _mirror = LocalMirror(path)
+    return _mirror
+
+
+async def sync_loop(modules: list[str], interval: float):
+    """Background sync of all modules every `interval` seconds"""
+    mirror = get_mirror()
+    while True:
+        try:
+            # Looked up every round so a client replaced by reload_config is picked up.
+            for result in await mirror.sync(get_client(), modules):
+                if "error" in result:
+                    logger.warning(f"Mirror sync of {result['module']} failed: {result['error']}")
+        except Exception as ex:
+            logger.warning(f"Mirror sync failed: {ex}")
+        await asyncio.sleep(interval)
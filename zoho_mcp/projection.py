@@ -0,0 +1,24 @@
+def slim_value(value):
+    """Drops None values and Zoho internal `$`-prefixed keys, recursing into lookups and lists"""
+    if isinstance(value, dict):
+        return {
+            key: slim_value(item)
+            for key, item in value.items()
+            if item is not None and not key.startswith("$")
+        }
+    if isinstance(value, list):
+        return [slim_value(item) for item in value]
+    return value
+
+
+def project_record(record: dict, fields: list[str]) -> dict:
+    """Keeps only the requested fields (plus id, which Zoho always returns)"""
+    return {key: record[key] for key in ("id", *fields) if key in record}
+
+
+def shape_records(records: list[dict], fields: list[str] | None = None, slim: bool = False) -> list[dict]:
+    if fields:
+        records = [project_record(record, fields) for record in records]
+    if slim:
+        records = [slim_value(record) for record in records]
+    return records
@@ -0,0 +1,125 @@
+from typing import Awaitable, Callable, TypeVar
+import asyncio
+import time
+
+import httpx
+
+T = TypeVar("T")
+
+
+def endpoint_kind(method: str, path: str) -> str:
+    """Groups CRM calls for per-endpoint timeouts: metadata, search, coql, read or write"""
+    if path.startswith("/settings/"):
+        return "metadata"
+    if path.startswith("/coql"):
+        return "coql"
+    if method != "GET":
+        return "write"
+    if path.rstrip("/").endswith("/search"):
+        return "search"
+    return "read"
+
+
+def error_response(method: str, url: str, status_code: int, code: str, message: str, **details) -> httpx.Response:
+    """
+    Builds a Zoho-style JSON error response for failures that never reached
+    Zoho, so tools report them through their normal error path.
+    """
+    return httpx.Response(
+        status_code,
+        json={"code": code, "status": "error", "message": message, "details": details},
+        request=httpx.Request(method, url),
+    )
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, retry_after: float):
+        super().__init__(f"Zoho API circuit is open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Fails fast while Zoho is degraded.
+
+    After `failure_threshold` consecutive failures (5xx, timeouts, transport
+    errors) the circuit opens and calls are rejected without touching the
+    network for `cooldown` seconds. Then one trial call is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def check(self):
+        """Raises CircuitOpenError if the call must not be sent"""
+        if self.failure_threshold <= 0 or self.state == "closed":
+            return
+        remaining = self.opened_at + self.cooldown - time.monotonic()
+        if self.state == "open" and remaining <= 0:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        self.rejected += 1
+        raise CircuitOpenError(max(remaining, 0.0))
+
+    def record(self, ok: bool):
+        self._trial_in_flight = False
+        if ok:
+            self.state = "closed"
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == "half_open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def release(self):
+        """The admitted call ended without telling anything about Zoho health"""
+        self._trial_in_flight = False
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after_seconds": round(max(0.0, self.opened_at + self.cooldown - time.monotonic()), 2)
+            if self.state == "open" else None,
+        }
+
+
+async def hedged(send: Callable[[], Awaitable[T]], delay: float) -> tuple[T, bool]:
+    """
+    Runs `send()`; if it has not finished after `delay` seconds, starts a
+    second identical call and returns whichever finishes first successfully
+    (the other is cancelled). Only for idempotent requests.
+
+    Returns (result, hedge_was_sent).
+    """
+    first = asyncio.create_task(send())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result(), False
+
+    second = asyncio.create_task(send())
+    pending = {first, second}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None or not pending:
+                    return task.result(), True
+    finally:
+        for task in pending:
+            task.cancel()
+    raise RuntimeError("unreachable")
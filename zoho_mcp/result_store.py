@@ -0,0 +1,233 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from zoho_mcp.config import get_zoho_config
+from zoho_mcp.jsonlib import dumps, loads
+from zoho_mcp.projection import slim_value
+
+logger = logging.getLogger(__name__)
+
+# Records shown in the summary of a stored result
+PREVIEW_RECORDS = 3
+# Field names listed in the summary
+SUMMARY_FIELDS = 50
+# Records encoded to estimate the JSON size of a page
+SIZE_SAMPLE = 20
+
+
+@dataclass
+class StoredResult:
+    handle: str
+    meta: dict
+    count: int
+    size: int  # bytes of the records as JSON
+    created_at: float
+    records: list[dict] | None = None  # None once spilled to disk
+    path: str | None = None
+
+
+@dataclass
+class StoreStats:
+    stored: int = 0
+    served: int = 0
+    spilled: int = 0
+    evicted: int = 0
+    expired: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "stored": self.stored,
+            "served": self.served,
+            "spilled": self.spilled,
+            "evicted": self.evicted,
+            "expired": self.expired,
+        }
+
+
+def summarize(records: list[dict]) -> dict:
+    """Field names (first-seen order) and the first few records without empty values"""
+    fields = dict.fromkeys(key for record in records for key in record)
+    return {"fields": list(fields)[:SUMMARY_FIELDS], "preview": slim_value(records[:PREVIEW_RECORDS])}
+
+
+def estimate_size(records: list[dict]) -> int:
+    """JSON size of `records`, extrapolated from the first SIZE_SAMPLE of them"""
+    if not records:
+        return 0
+    sample = records[:SIZE_SAMPLE]
+    return len(dumps(sample)) * len(records) // len(sample)
+
+
+def result_reference(entry: "StoredResult", records: list[dict]) -> dict:
+    """What a tool returns instead of the records: handle, size, summary and the slice URI"""
+    return {
+        "result_handle": entry.handle,
+        "result_bytes": entry.size,
+        **summarize(records),
+        "slice_uri": f"result://{entry.handle}/{{offset}}/{{limit}}",
+    }
+
+
+@dataclass
+class ResultStore:
+    """
+    Holds large tool results so the model can read them in slices.
+
+    Results live in memory up to `memory_bytes` (sizes are measured as
+    encoded JSON). When a new result does not fit, the least recently used
+    ones are spilled to NDJSON files in a per-process folder under
+    `spill_dir`, up to `disk_bytes`; beyond that the least recently used
+    files are deleted and their handles expire. Handles also expire `ttl`
+    seconds after they were stored.
+    Methods do blocking file I/O: call them through asyncio.to_thread.
+    """
+
+    memory_bytes: int
+    disk_bytes: int
+    spill_dir: str
+    ttl: float = 3600.0
+    memory: OrderedDict = field(default_factory=OrderedDict)
+    disk: OrderedDict = field(default_factory=OrderedDict)
+    stats: StoreStats = field(default_factory=StoreStats)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+    _spill_path: str | None = None
+
+    def put(self, records: list[dict], meta: dict, encoded: bytes | None = None) -> StoredResult:
+        """Stores `records` (with descriptive `meta`, e.g. module) and returns the entry with its handle"""
+        size = len(encoded if encoded is not None else dumps(records))
+        entry = StoredResult(uuid.uuid4().hex[:16], meta, len(records), size, time.time(), records)
+        with self._lock:
+            self._expire()
+            self.memory[entry.handle] = entry
+            self.stats.stored += 1
+            self._fit()
+        return entry
+
+    def get(self, handle: str) -> StoredResult | None:
+        with self._lock:
+            self._expire()
+            for tier in (self.memory, self.disk):
+                entry = tier.get(handle)
+                if entry is not None:
+                    tier.move_to_end(handle)
+                    return entry
+        return None
+
+    def slice(self, handle: str, offset: int, limit: int) -> tuple[StoredResult, list[dict]] | None:
+        """Records [offset, offset + limit) of a stored result, from memory or its spill file"""
+        entry = self.get(handle)
+        if entry is None:
+            return None
+        offset, limit = max(offset, 0), max(limit, 0)
+        records = entry.records
+        if records is not None:
+            data = records[offset:offset + limit]
+        else:
+            data = []
+            try:
+                with open(entry.path, "rb") as file:
+                    for index, line in enumerate(file):
+                        if index >= offset + limit:
+                            break
+                        if index >= offset:
+                            data.append(loads(line))
+            except FileNotFoundError:
+                # Deleted by a concurrent eviction between get() and the read.
+                return None
+        with self._lock:
+            self.stats.served += 1
+        return entry, data
+
+    def _fit(self):
+        used = sum(entry.size for entry in self.memory.values())
+        # The newest result always stays in memory, even if it alone exceeds the budget.
+        while used > self.memory_bytes and len(self.memory) > 1:
+            _, entry = self.memory.popitem(last=False)
+            used -= entry.size
+            self._spill(entry)
+        on_disk = sum(entry.size for entry in self.disk.values())
+        while on_disk > self.disk_bytes and self.disk:
+            _, entry = self.disk.popitem(last=False)
+            on_disk -= entry.size
+            self._remove(entry)
+            self.stats.evicted += 1
+
+    def _spill(self, entry: StoredResult):
+        if self.disk_bytes <= 0 or entry.size > self.disk_bytes:
+            self.stats.evicted += 1
+            return
+        try:
+            if self._spill_path is None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._spill_path = tempfile.mkdtemp(prefix="results_", dir=self.spill_dir)
+            path = os.path.join(self._spill_path, f"{entry.handle}.ndjson")
+            with open(path, "wb") as file:
+                for record in entry.records:
+                    file.write(dumps(record) + b"\n")
+        except OSError as ex:
+            logger.warning(f"Result spill to {self.spill_dir} failed: {ex}")
+            self.stats.evicted += 1
+            return
+        entry.records, entry.path = None, path
+        self.disk[entry.handle] = entry
+        self.stats.spilled += 1
+
+    def _remove(self, entry: StoredResult):
+        if entry.path is not None:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _expire(self):
+        if self.ttl <= 0:
+            return
+        cutoff = time.time() - self.ttl
+        for tier in (self.memory, self.disk):
+            for handle in [handle for handle, entry in tier.items() if entry.created_at < cutoff]:
+                self._remove(tier.pop(handle))
+                self.stats.expired += 1
+
+    def clear(self):
+        """Drops every result and the spill folder of this process"""
+        with self._lock:
+            self.memory.clear()
+            self.disk.clear()
+            if self._spill_path is not None:
+                shutil.rmtree(self._spill_path, ignore_errors=True)
+                self._spill_path = None
+
+    def stats_dict(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats.as_dict(),
+                "in_memory": len(self.memory),
+                "memory_bytes": sum(entry.size for entry in self.memory.values()),
+                "on_disk": len(self.disk),
+                "disk_bytes": sum(entry.size for entry in self.disk.values()),
+                "memory_budget_bytes": self.memory_bytes,
+                "disk_budget_bytes": self.disk_bytes,
+                "ttl_seconds": self.ttl,
+            }
+
+
+_result_store: ResultStore | None = None
+
+def get_result_store() -> ResultStore:
+    global _result_store
+    if _result_store is None:
+        config = get_zoho_config()
+        _result_store = ResultStore(
+            memory_bytes=config.result_memory_mb * 1024 * 1024,
+            disk_bytes=config.result_disk_mb * 1024 * 1024,
+            spill_dir=config.result_spill_dir,
+            ttl=config.result_ttl,
+        )
+    return _result_store
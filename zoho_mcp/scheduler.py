@@ -0,0 +1,175 @@
+from typing import Awaitable, Callable
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+import httpx
+
+# Lower value = served first. Interactive tool reads jump ahead of bulk jobs.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+
+
+class CreditBudgetExceeded(RuntimeError):
+    """Raised when the daily API credit budget configured for this server is spent"""
+
+
+def retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RequestScheduler:
+    """
+    Gatekeeper in front of every Zoho CRM call of one org.
+
+    - Token bucket: at most `rate` requests per second with bursts up to `burst`.
+    - Concurrency cap: at most `max_concurrency` requests in flight, which is
+      how Zoho limits concurrent calls per org.
+    - Priority: waiting requests are admitted lowest priority value first,
+      FIFO within a priority, so interactive reads overtake queued bulk chunks.
+    - 429 handling: the request is retried up to `max_retries` times. It waits
+      for Retry-After when Zoho sends it, otherwise for a fully jittered
+      exponential backoff. While waiting, the whole scheduler is paused so the
+      other callers do not keep hammering the limit.
+    - Credit budget: with `credit_budget` > 0 the calls of a rolling 24 h window
+      are counted. Bulk work stops at `budget * (1 - interactive_reserve)`, so
+      the remaining credits are kept for interactive calls.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        burst: int = 1,
+        max_concurrency: int = 10,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        credit_budget: int = 0,
+        interactive_reserve: float = 0.1,
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.credit_budget = credit_budget
+        self.interactive_reserve = interactive_reserve
+
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._slot_freed = asyncio.Event()
+        self._dispatcher: asyncio.Task | None = None
+        self._credit_log: list[float] = []
+        self.stats = {"requests": 0, "throttled": 0, "retries": 0, "queued_max": 0}
+
+    async def run(self, send: Callable[[], Awaitable[httpx.Response]], priority: int = PRIORITY_INTERACTIVE) -> httpx.Response:
+        """Send via `send()` once admitted, retrying on 429"""
+        attempt = 0
+        while True:
+            await self.acquire(priority)
+            try:
+                response = await send()
+            finally:
+                self.release()
+
+            if response.status_code != 429:
+                return response
+            self.stats["throttled"] += 1
+            if attempt >= self.max_retries:
+                return response
+
+            delay = retry_after_seconds(response)
+            if delay is None:
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE):
+        self._spend_credit(priority)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        self.stats["queued_max"] = max(self.stats["queued_max"], len(self._waiters))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted right as we were cancelled: give the slot back.
+                self.release()
+            raise
+
+    def release(self):
+        self._in_flight -= 1
+        self._slot_freed.set()
+
+    async def _dispatch(self):
+        while self._waiters:
+            if self._in_flight >= self.max_concurrency:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+            delay = max(self._paused_until - time.monotonic(), self._bucket_delay())
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue  # the caller was cancelled while queued
+            if self.rate > 0:
+                self._tokens -= 1
+            self._in_flight += 1
+            self.stats["requests"] += 1
+            future.set_result(None)
+
+    def _bucket_delay(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+        return 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def _spend_credit(self, priority: int):
+        if self.credit_budget <= 0:
+            return
+        now = time.time()
+        self._credit_log = [t for t in self._credit_log if t > now - 86400]
+        limit = self.credit_budget
+        if priority > PRIORITY_INTERACTIVE:
+            limit = int(self.credit_budget * (1 - self.interactive_reserve))
+        if len(self._credit_log) >= limit:
+            raise CreditBudgetExceeded(
+                f"API credit budget exhausted: {len(self._credit_log)} of {self.credit_budget} credits used in the last 24h"
+            )
+        self._credit_log.append(now)
+
+    def status(self) -> dict:
+        self._bucket_delay()
+        return {
+            **self.stats,
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "rate_per_second": self.rate or None,
+            "tokens_available": round(self._tokens, 2) if self.rate > 0 else None,
+            "paused_for_seconds": round(max(0.0, self._paused_until - time.monotonic()), 2),
+            "credits_used_24h": len(self._credit_log) if self.credit_budget > 0 else None,
+            "credit_budget": self.credit_budget or None,
+        }
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import time
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileTokenStore:
+    """
+    On-disk access token cache shared by every local server process.
+
+    The token is written atomically (temp file + os.replace) so readers never
+    see a half-written file, and refreshes are serialized across processes
+    with an exclusive lock on a sibling `.lock` file. Entries are tagged with
+    the client id, so one file cannot leak a token between Zoho apps.
+    """
+
+    def __init__(self, path: str, client_id: str | None):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.lock_path = self.path + ".lock"
+        self.client_id = client_id
+        self._lock_fd = None
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def load(self) -> tuple[str, float] | None:
+        """Returns (access_token, expires_at) if the file holds a still valid token"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("client_id") != self.client_id:
+            return None
+        access_token = data.get("access_token")
+        expires_at = float(data.get("expires_at") or 0)
+        if not access_token or expires_at <= time.time():
+            return None
+        return access_token, expires_at
+
+    def save(self, access_token: str, expires_at: float):
+        data = {"client_id": self.client_id, "access_token": access_token, "expires_at": expires_at}
+        # mkstemp creates the file with 0600 permissions, which is what we want for a secret.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".zoho-token-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def acquire(self):
+        """Blocks until this process holds the cross-process refresh lock"""
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.name == "nt":
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after ~10 s; keep waiting like flock does.
+                        continue
+            else:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._lock_fd = fd
+
+    def release(self):
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is None:
+            return
+        try:
+            if os.name == "nt":
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
@@ -0,0 +1,272 @@
+from datetime import datetime, timezone
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from zoho_mcp.bulk import ZOHO_MAX_RECORDS, run_chunks
+from zoho_mcp.cache import get_record_cache
+from zoho_mcp.client import get_client
+from zoho_mcp.config import get_zoho_config
+from zoho_mcp.jsonlib import dumps, loads
+from zoho_mcp.scheduler import PRIORITY_BULK
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    ticket TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    lead TEXT NOT NULL,
+    note TEXT,
+    lead_id TEXT,
+    note_status TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    queued_at REAL NOT NULL,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS submissions_state ON submissions (state);
+"""
+
+# queued -> lead_created (waiting for its Note) -> done, or failed
+QUEUED, LEAD_CREATED, DONE, FAILED = "queued", "lead_created", "done", "failed"
+
+NOTE_TITLE = "Lead Form Details"
+
+# A chunk that fails as a whole (5xx, timeout, open breaker) is retried on
+# later flushes; after this many attempts its submissions are marked failed.
+MAX_ATTEMPTS = 5
+
+
+def _iso(timestamp: float | None) -> str | None:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="seconds") if timestamp else None
+
+
+class WriteQueue:
+    """
+    Durable write-behind queue for create_lead_from_form.
+
+    Submissions are committed to a SQLite journal (WAL mode) before the
+    caller gets its ticket, so a restart loses nothing: whatever is still
+    queued is sent by the next flush. A flush posts up to 100 Leads per
+    call, then up to 100 Notes per call for the Leads that were created.
+    It runs when `batch_size` submissions are waiting or `interval`
+    seconds after the previous one, whichever comes first.
+
+    A crash between Zoho's answer and the journal update resends that
+    batch on restart, so the queue gives at-least-once delivery.
+    `status` and `stats` block on SQLite: call them through asyncio.to_thread.
+    """
+
+    def __init__(self, path: str, interval: float = 2.0, batch_size: int = ZOHO_MAX_RECORDS, concurrency: int = 4):
+        self.path = path
+        self.interval = interval
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            # A ticket is only handed out once its submission is on disk.
+            self._db.execute("PRAGMA synchronous=FULL")
+            self._db.executescript(SCHEMA)
+            self._db.commit()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._flush_lock: asyncio.Lock | None = None
+
+    def start(self) -> asyncio.Task:
+        """Starts the background flusher once per event loop"""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._flush_lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                # Looked up every round so a client replaced by reload_config is picked up.
+                await self.flush(get_client())
+            except Exception as ex:
+                logger.warning(f"Write queue flush failed: {ex}")
+
+    async def submit(self, lead: dict, note: str | None = None) -> str:
+        """Journals one submission and returns its ticket ID"""
+        ticket = uuid.uuid4().hex
+        pending = await asyncio.to_thread(self._insert, ticket, lead, note)
+        if pending >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return ticket
+
+    def _insert(self, ticket: str, lead: dict, note: str | None) -> int:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO submissions (ticket, state, lead, note, queued_at) VALUES (?, ?, ?, ?, ?)",
+                (ticket, QUEUED, dumps(lead).decode(), note, time.time()),
+            )
+            self._db.commit()
+            return self._db.execute("SELECT count(*) FROM submissions WHERE state = ?", (QUEUED,)).fetchone()[0]
+
+    async def flush(self, client) -> dict:
+        """Sends everything waiting in the journal; returns counters of this flush"""
+        lock = self._flush_lock or asyncio.Lock()
+        async with lock:
+            summary = {"leads": 0, "notes": 0, "failed": 0, "retry": 0}
+            # Leads first: their ids are the Parent_Id of the Notes.
+            while await self._flush_leads(client, summary):
+                pass
+            while await self._flush_notes(client, summary):
+                pass
+            return summary
+
+    def _take(self, state: str) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT ticket, lead, note, lead_id, attempts FROM submissions WHERE state = ? ORDER BY queued_at LIMIT ?",
+                (state, self.batch_size * self.concurrency),
+            ).fetchall()
+
+    async def _flush_leads(self, client, summary: dict) -> bool:
+        """One round of Lead inserts; returns True when another round may be needed"""
+        rows = await asyncio.to_thread(self._take, QUEUED)
+        if not rows:
+            return False
+        result = await run_chunks(
+            rows,
+            lambda chunk: client.post("/Leads", json={"data": [loads(row[1]) for row in chunk]}, priority=PRIORITY_BULK),
+            ok_statuses=(200, 201, 202, 207),
+            concurrency=self.concurrency,
+            chunk_size=self.batch_size,
+        )
+        failed_chunks = {error["chunk"]: error for error in result.errors}
+        updates, retries = [], []
+        for index, (row, entry) in enumerate(zip(rows, result.data)):
+            ticket, _, note, _, attempts = row
+            if index // self.batch_size in failed_chunks:
+                retries.append((ticket, attempts + 1, dumps(failed_chunks[index // self.batch_size]).decode() if attempts + 1 >= MAX_ATTEMPTS else None))
+            elif entry.get("status") == "success":
+                lead_id = (entry.get("details") or {}).get("id")
+                updates.append((LEAD_CREATED if note else DONE, lead_id, None if note else "skipped", None, ticket))
+                summary["leads"] += 1
+            else:
+                updates.append((FAILED, None, None, dumps(entry).decode(), ticket))
+                summary["failed"] += 1
+        await asyncio.to_thread(self._apply, updates, retries, summary)
+        get_record_cache().invalidate("Leads", [update[1] for update in updates if update[1]])
+        return not failed_chunks and len(rows) == self.batch_size * self.concurrency
+
+    async def _flush_notes(self, client, summary: dict) -> bool:
+        rows = await asyncio.to_thread(self._take, LEAD_CREATED)
+        if not rows:
+            return False
+
+        def note(row: tuple) -> dict:
+            return {"Note_Title": NOTE_TITLE, "Note_Content": row[2], "Parent_Id": row[3], "se_module": "Leads"}
+
+        result = await run_chunks(
+            rows,
+            lambda chunk: client.post("/Notes", json={"data": [note(row) for row in chunk]}, priority=PRIORITY_BULK),
+            ok_statuses=(200, 201, 202, 207),
+            concurrency=self.concurrency,
+            chunk_size=self.batch_size,
+        )
+        failed_chunks = {error["chunk"]: error for error in result.errors}
+        updates, retries = [], []
+        for index, (row, entry) in enumerate(zip(rows, result.data)):
+            ticket, _, _, lead_id, attempts = row
+            if index // self.batch_size in failed_chunks:
+                retries.append((ticket, attempts + 1, dumps(failed_chunks[index // self.batch_size]).decode() if attempts + 1 >= MAX_ATTEMPTS else None))
+                continue
+            # The Lead exists either way; a failed Note does not fail the submission.
+            created = entry.get("status") == "success"
+            error = None if created else dumps(entry).decode()
+            updates.append((DONE, lead_id, "created" if created else "failed", error, ticket))
+            summary["notes"] += created
+        await asyncio.to_thread(self._apply, updates, retries, summary)
+        return not failed_chunks and len(rows) == self.batch_size * self.concurrency
+
+    def _apply(self, updates: list[tuple], retries: list[tuple], summary: dict):
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "UPDATE submissions SET state = ?, lead_id = coalesce(?, lead_id), note_status = ?, error = ?, attempts = 0, "
+                "completed_at = ? WHERE ticket = ?",
+                [(state, lead_id, note_status, error, now if state in (DONE, FAILED) else None, ticket)
+                 for state, lead_id, note_status, error, ticket in updates],
+            )
+            for ticket, attempts, error in retries:
+                if error is None:
+                    self._db.execute("UPDATE submissions SET attempts = ? WHERE ticket = ?", (attempts, ticket))
+                    summary["retry"] += 1
+                else:
+                    # Note submissions keep their Lead: they finish as done with a failed note.
+                    self._db.execute(
+                        "UPDATE submissions SET state = CASE state WHEN ? THEN ? ELSE ? END, "
+                        "note_status = CASE state WHEN ? THEN 'failed' ELSE note_status END, "
+                        "error = ?, attempts = ?, completed_at = ? WHERE ticket = ?",
+                        (LEAD_CREATED, DONE, FAILED, LEAD_CREATED, error, attempts, now, ticket),
+                    )
+                    summary["failed"] += 1
+            self._db.commit()
+
+    def status(self, ticket: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT state, lead_id, note_status, error, attempts, queued_at, completed_at FROM submissions WHERE ticket = ?",
+                (ticket,),
+            ).fetchone()
+        if row is None:
+            return None
+        state, lead_id, note_status, error, attempts, queued_at, completed_at = row
+        return {
+            "ticket_id": ticket,
+            "state": state,
+            "lead_id": lead_id,
+            "note": {"status": note_status} if note_status else None,
+            "error": loads(error) if error else None,
+            "attempts": attempts,
+            "queued_at": _iso(queued_at),
+            "completed_at": _iso(completed_at),
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, count(*) FROM submissions GROUP BY state").fetchall())
+        return {state: counts.get(state, 0) for state in (QUEUED, LEAD_CREATED, DONE, FAILED)}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_write_queue: WriteQueue | None = None
+
+def get_write_queue() -> WriteQueue | None:
+    """Returns the write-behind queue, or None when ZOHO_WRITE_QUEUE_DB is not set"""
+    global _write_queue
+    if _write_queue is None:
+        config = get_zoho_config()
+        if config.write_queue_db:
+            _write_queue = WriteQueue(config.write_queue_db, config.write_queue_interval, concurrency=config.bulk_concurrency)
+    return _write_queue